@@ -0,0 +1,32 @@
+"""unique profile user_id
+
+Revision ID: 5b8e0c4a7f21
+Revises: 3f1c2b7d9e4a
+Create Date: 2026-10-16 22:00:41.903512
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b8e0c4a7f21"
+down_revision: Union[str, None] = "3f1c2b7d9e4a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # keep the oldest profile of every user, the check-then-insert could race
+    op.execute("DELETE FROM profiles AS p USING profiles AS older WHERE p.user_id = older.user_id AND p.id > older.id")
+    op.create_index(
+        op.f("ix_profiles_user_id"),
+        "profiles",
+        ["user_id"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_profiles_user_id"), table_name="profiles")
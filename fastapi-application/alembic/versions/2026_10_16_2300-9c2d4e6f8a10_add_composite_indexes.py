@@ -0,0 +1,52 @@
+"""add composite indexes
+
+Revision ID: 9c2d4e6f8a10
+Revises: 5b8e0c4a7f21
+Create Date: 2026-10-16 23:00:27.551904
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9c2d4e6f8a10"
+down_revision: Union[str, None] = "5b8e0c4a7f21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns) of the new indexes
+INDEXES = (
+    ("ix_cleanings_owner_created_at_id", "cleanings", ["owner", "created_at", "id"]),
+    ("ix_user_offers_for_cleanings_offerer_id_status", "user_offers_for_cleanings", ["offerer_id", "status"]),
+    (
+        "ix_user_offers_for_cleanings_cleaning_id_offerer_id",
+        "user_offers_for_cleanings",
+        ["cleaning_id", "offerer_id"],
+    ),
+    ("ix_cleaner_evaluations_cleaner_id_created_at_id", "cleaner_evaluations", ["cleaner_id", "created_at", "id"]),
+)
+# single-column indexes that are prefixes of the new ones
+REPLACED_INDEXES = (
+    ("ix_user_offers_for_cleanings_offerer_id", "user_offers_for_cleanings", ["offerer_id"]),
+    ("ix_user_offers_for_cleanings_cleaning_id", "user_offers_for_cleanings", ["cleaning_id"]),
+    ("ix_cleaner_evaluations_cleaner_id", "cleaner_evaluations", ["cleaner_id"]),
+)
+
+
+def upgrade() -> None:
+    # CREATE/DROP INDEX CONCURRENTLY do not lock out writes but cannot run in a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+        for name, table, _ in REPLACED_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in REPLACED_INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
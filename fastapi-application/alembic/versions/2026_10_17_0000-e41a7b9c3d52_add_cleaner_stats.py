@@ -0,0 +1,168 @@
+"""add cleaner stats
+
+Revision ID: e41a7b9c3d52
+Revises: 9c2d4e6f8a10
+Create Date: 2026-10-17 00:00:18.730264
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e41a7b9c3d52"
+down_revision: Union[str, None] = "9c2d4e6f8a10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = (
+    "total_evaluations",
+    "total_no_show",
+    "sum_professionalism",
+    "count_professionalism",
+    "sum_completeness",
+    "count_completeness",
+    "sum_efficiency",
+    "count_efficiency",
+    "sum_overall_rating",
+    "one_stars",
+    "two_stars",
+    "three_stars",
+    "four_stars",
+    "five_stars",
+)
+
+# the contribution of one evaluation row (NEW or OLD) to every counter, in COUNTERS order
+CONTRIBUTION = """
+    1,
+    {row}.no_show::int,
+    coalesce({row}.professionalism, 0),
+    ({row}.professionalism IS NOT NULL)::int,
+    coalesce({row}.completeness, 0),
+    ({row}.completeness IS NOT NULL)::int,
+    coalesce({row}.efficiency, 0),
+    ({row}.efficiency IS NOT NULL)::int,
+    {row}.overall_rating,
+    ({row}.overall_rating = 1)::int,
+    ({row}.overall_rating = 2)::int,
+    ({row}.overall_rating = 3)::int,
+    ({row}.overall_rating = 4)::int,
+    ({row}.overall_rating = 5)::int
+"""
+
+# AFTER row triggers fire at the end of the statement, so the min/max
+# recomputation below already sees every row the statement changed
+CREATE_FUNCTION = f"""
+CREATE FUNCTION cleaner_stats_on_evaluation_change() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE cleaner_stats
+        SET ({", ".join(COUNTERS)}) = ({", ".join(f"cleaner_stats.{name} - removed.{name}" for name in COUNTERS)}),
+            updated_at = now()
+        FROM (SELECT {CONTRIBUTION.format(row="OLD")}) AS removed({", ".join(COUNTERS)})
+        WHERE cleaner_stats.cleaner_id = OLD.cleaner_id;
+
+        DELETE FROM cleaner_stats WHERE cleaner_id = OLD.cleaner_id AND total_evaluations = 0;
+
+        -- a minimum or maximum cannot be subtracted, read it again from the index;
+        -- a statement deleting all the evaluations of a cleaner leaves nothing to read
+        -- until its last row is subtracted and the stats row is deleted
+        UPDATE cleaner_stats
+        SET (min_overall_rating, max_overall_rating) = (
+            SELECT min(overall_rating), max(overall_rating)
+            FROM cleaner_evaluations
+            WHERE cleaner_id = OLD.cleaner_id
+        )
+        WHERE cleaner_id = OLD.cleaner_id
+            AND OLD.overall_rating IN (min_overall_rating, max_overall_rating)
+            AND EXISTS (SELECT 1 FROM cleaner_evaluations WHERE cleaner_id = OLD.cleaner_id);
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO cleaner_stats AS stats (
+            cleaner_id, {", ".join(COUNTERS)}, min_overall_rating, max_overall_rating
+        )
+        VALUES (
+            NEW.cleaner_id, {CONTRIBUTION.format(row="NEW")}, NEW.overall_rating, NEW.overall_rating
+        )
+        ON CONFLICT (cleaner_id) DO UPDATE
+        SET ({", ".join(COUNTERS)}) = ({", ".join(f"stats.{name} + excluded.{name}" for name in COUNTERS)}),
+            min_overall_rating = least(stats.min_overall_rating, excluded.min_overall_rating),
+            max_overall_rating = greatest(stats.max_overall_rating, excluded.max_overall_rating),
+            updated_at = now();
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+BACKFILL = f"""
+INSERT INTO cleaner_stats (cleaner_id, {", ".join(COUNTERS)}, min_overall_rating, max_overall_rating)
+SELECT
+    cleaner_id,
+    count(*),
+    count(*) FILTER (WHERE no_show),
+    coalesce(sum(professionalism), 0),
+    count(professionalism),
+    coalesce(sum(completeness), 0),
+    count(completeness),
+    coalesce(sum(efficiency), 0),
+    count(efficiency),
+    sum(overall_rating),
+    count(*) FILTER (WHERE overall_rating = 1),
+    count(*) FILTER (WHERE overall_rating = 2),
+    count(*) FILTER (WHERE overall_rating = 3),
+    count(*) FILTER (WHERE overall_rating = 4),
+    count(*) FILTER (WHERE overall_rating = 5),
+    min(overall_rating),
+    max(overall_rating)
+FROM cleaner_evaluations
+GROUP BY cleaner_id
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "cleaner_stats",
+        sa.Column("cleaner_id", sa.UUID(), nullable=False),
+        *(sa.Column(name, sa.Integer(), server_default="0", nullable=False) for name in COUNTERS),
+        sa.Column("min_overall_rating", sa.Integer(), nullable=False),
+        sa.Column("max_overall_rating", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["cleaner_id"],
+            ["users.id"],
+            name=op.f("fk_cleaner_stats_cleaner_id_users"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("cleaner_id", name=op.f("pk_cleaner_stats")),
+    )
+    op.execute(CREATE_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER cleaner_stats_on_evaluation_change "
+        "AFTER INSERT OR UPDATE OR DELETE ON cleaner_evaluations "
+        "FOR EACH ROW EXECUTE FUNCTION cleaner_stats_on_evaluation_change()"
+    )
+    # CREATE TRIGGER holds off writes to cleaner_evaluations until the backfill commits
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER cleaner_stats_on_evaluation_change ON cleaner_evaluations")
+    op.execute("DROP FUNCTION cleaner_stats_on_evaluation_change()")
+    op.drop_table("cleaner_stats")
@@ -3,6 +3,7 @@ import uuid
 from sqlalchemy import (
     UUID,
     ForeignKey,
+    Index,
     Numeric,
     String,
     Text,
@@ -27,5 +28,8 @@ class Cleaning(IntIdPkMixin, Base):
         default=uuid.uuid4,
     )
 
+    # the owner's cleanings in keyset order
+    __table_args__ = (Index("ix_cleanings_owner_created_at_id", "owner", "created_at", "id"),)
+
     def __repr__(self) -> str:
         return f"Cleaning: (name={self.name}, owner={self.owner})"
@@ -1,9 +1,14 @@
-from typing import Annotated
+from typing import (
+    Annotated,
+    Any,
+)
 
 from fastapi import (
     APIRouter,
+    Body,
     Depends,
     HTTPException,
+    Query,
     Response,
     status,
 )
@@ -31,6 +36,7 @@ from auth.schemas import (
 )
 from core.models import db_helper
 from crud.cleanings import cleanings_crud
+from utils.pagination.schemas import PaginatedResponse
 
 router = APIRouter(
     tags=["Cleanings"],
@@ -68,6 +74,37 @@ async def create_new_cleaning(
     return created_cleaning
 
 
+@router.post(
+    "/batch",
+    response_model=list[CleaningPublic],
+    status_code=status.HTTP_201_CREATED,
+    name="cleanings:create-many-cleanings",
+    summary="creating many new cleanings for the user at once",
+)
+async def create_many_cleanings(
+    profile: Annotated[UserAuthProfile, Depends(get_user_profile_or_http_exception)],
+    new_cleanings: Annotated[list[CleaningCreate], Body(min_length=1, max_length=100)],
+    session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
+) -> list[CleaningPublic]:
+    """
+    Creates up to 100 cleanings in one transaction, all or none.
+
+    If the user does not have a profile, the user is redirected to create a profile.
+    """
+    if profile.register_as != "cleaner":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only users registered as a cleaner can create cleanings",
+        )
+    cleanings = [CleaningInDB(owner=profile.user_id, **new_cleaning.model_dump()) for new_cleaning in new_cleanings]
+    created_cleanings = await cleanings_crud.create_cleanings(
+        session=session,
+        cleanings=cleanings,
+    )
+
+    return created_cleanings
+
+
 @router.get(
     "/{cleaning_id}",
     response_model=CleaningPublic,
@@ -126,17 +163,21 @@ async def delete_cleaning(
 
 @router.get(
     "",
-    response_model=list[CleaningPublic],
+    response_model=PaginatedResponse[CleaningPublic],
     name="cleanings:get-all-cleanings",
     summary="getting user all self cleanings",
 )
 async def get_user_all_cleanings(
     user_auth: Annotated[UserAuthSchema, Depends(UserProfilePermissionGetter("cleaner"))],
     session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
-) -> list[CleaningPublic]:
-    all_cleanings = await cleanings_crud.get_all_cleanings(
+    max_results: int = Query(default=100, ge=1, le=100),
+    cursor: str = Query(None),
+) -> dict[str, Any]:
+    all_cleanings = await cleanings_crud.get_cleanings_page(
         session=session,
         user_id=user_auth.id,
+        max_results=max_results,
+        cursor=cursor,
     )
 
-    return [CleaningPublic(**cl.as_dict()) for cl in all_cleanings]
+    return all_cleanings
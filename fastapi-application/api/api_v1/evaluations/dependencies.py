@@ -9,7 +9,6 @@ from fastapi import (
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.api_v1.cleanings.schemas import CleaningPublic
 from api.api_v1.evaluations.schemas import CleanerInfo
 from core.models import db_helper
 from crud.cleanings import cleanings_crud
@@ -40,6 +39,6 @@ async def get_cleaner_info_with_cleanings(
         session=session,
         user_id=cleaner.user_id,
     )
-    cleaner.cleanings = [CleaningPublic(**cl.as_dict()) for cl in cleanings]
+    cleaner.cleanings = cleanings
 
     return cleaner
@@ -4,6 +4,7 @@ from sqlalchemy import (
     UUID,
     Boolean,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -28,7 +29,6 @@ class CleanerEvaluation(IntIdPkMixin, Base):
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="SET NULL"),
         nullable=False,
-        index=True,
     )
     no_show: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="False")
     headline: Mapped[str] = mapped_column(String(150), nullable=True)
@@ -38,7 +38,46 @@ class CleanerEvaluation(IntIdPkMixin, Base):
     efficiency: Mapped[int] = mapped_column(Integer, nullable=True)
     overall_rating: Mapped[int] = mapped_column(Integer, nullable=False)
 
-    __table_args__ = (UniqueConstraint("owner", "cleaner_id"),)
+    __table_args__ = (
+        UniqueConstraint("owner", "cleaner_id"),
+        # evaluations of a cleaner in keyset order, and their aggregates
+        Index("ix_cleaner_evaluations_cleaner_id_created_at_id", "cleaner_id", "created_at", "id"),
+    )
 
     def __repr__(self) -> str:
         return f"CleanerEvaluations: (owner={self.owner!r}, cleaner_id={self.cleaner_id!r})"
+
+
+class CleanerStats(Base):
+    """
+    Running totals of the evaluations of one cleaning specialist, kept up
+    to date by the cleaner_stats_on_evaluation_change trigger on
+    cleaner_evaluations in the transaction of every insert, update and delete.
+    """
+
+    __tablename__ = "cleaner_stats"
+
+    cleaner_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    total_evaluations: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    total_no_show: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    sum_professionalism: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    count_professionalism: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    sum_completeness: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    count_completeness: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    sum_efficiency: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    count_efficiency: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    sum_overall_rating: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    min_overall_rating: Mapped[int] = mapped_column(Integer, nullable=False)
+    max_overall_rating: Mapped[int] = mapped_column(Integer, nullable=False)
+    one_stars: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    two_stars: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    three_stars: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    four_stars: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    five_stars: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+
+    def __repr__(self) -> str:
+        return f"CleanerStats: (cleaner_id={self.cleaner_id!r}, total_evaluations={self.total_evaluations!r})"
@@ -29,6 +29,7 @@ from api.api_v1.evaluations.schemas import (
 from auth.dependencies import UserProfilePermissionGetter, get_current_active_auth_user
 from auth.schemas import UserAuthSchema
 from core.models import db_helper
+from core.models.query_deadline import StatementTimeout
 from crud.evaluations import evaluations_crud
 from utils.pagination.paginator import paginate
 from utils.pagination.schemas import PaginatedResponse
@@ -76,7 +77,7 @@ async def create_evaluation_for_cleaner(
     dependencies=[Depends(get_current_active_auth_user)],
 )
 async def show_all_cleaners_evaluations(
-    session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
+    session: Annotated[AsyncSession, Depends(db_helper.read_session_getter)],
     params: ItemParamsEvaluation = Depends(),
     max_results: int = Query(default=100, ge=1, le=100),
     cursor: str = Query(None),
@@ -94,7 +95,7 @@ async def show_all_cleaners_evaluations(
 
 @router.get(
     "/{cleaner_id}",
-    response_model=list[EvaluationPublic],
+    response_model=PaginatedResponse[EvaluationPublic],
     response_model_exclude_none=True,
     name="evaluations:show-all-evaluations-for-cleaner",
     summary="show all evaluations of one cleaning specialist",
@@ -102,15 +103,15 @@ async def show_all_cleaners_evaluations(
 )
 async def show_all_evaluations_for_cleaner(
     cleaner: Annotated[CleanerInfo, Depends(get_cleaner_by_id_from_path)],
-    session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
-    skip: int = Query(default=0, ge=0),
-    limit: int = Query(default=30, ge=1, le=30),
-) -> list[EvaluationPublic]:
+    session: Annotated[AsyncSession, Depends(db_helper.read_session_getter)],
+    max_results: int = Query(default=30, ge=1, le=30),
+    cursor: str = Query(None),
+) -> dict[str, Any]:
     evaluations = await evaluations_crud.get_all_cleaner_evaluations(
         session=session,
         cleaner=cleaner,
-        offset=skip,
-        limit=limit,
+        max_results=max_results,
+        cursor=cursor,
     )
 
     return evaluations
@@ -122,19 +123,26 @@ async def show_all_evaluations_for_cleaner(
     response_model_exclude_none=True,
     name="evaluations:show-stats-about-cleaner",
     summary="show stats about the cleaning specialist",
-    dependencies=[Depends(get_current_active_auth_user)],
+    dependencies=[
+        Depends(StatementTimeout(seconds=5.0)),
+        Depends(get_current_active_auth_user),
+    ],
 )
 async def show_stats_about_cleaner(
     cleaner: Annotated[CleanerInfo, Depends(get_cleaner_info_with_cleanings)],
-    session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
+    session: Annotated[AsyncSession, Depends(db_helper.read_session_getter)],
 ) -> EvaluationAggregate:
     """
     Gets general statistics about the cleaning specialist with information
     about him/her and his/her cleaning job.
     """
-    evaluation_aggregate = await evaluations_crud.get_cleaner_aggregates(
+    if evaluation_aggregate := await evaluations_crud.get_cleaner_aggregates(
         session=session,
         cleaner=cleaner,
-    )
+    ):
+        return evaluation_aggregate
 
-    return evaluation_aggregate
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="The cleaning specialist has no evaluations yet",
+    )
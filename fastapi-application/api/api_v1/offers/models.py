@@ -5,6 +5,7 @@ from sqlalchemy import (
     UUID,
     Date,
     ForeignKey,
+    Index,
     Integer,
     PrimaryKeyConstraint,
     String,
@@ -25,13 +26,11 @@ class UserOffer(Base):
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     cleaning_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("cleanings.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     status: Mapped[str] = mapped_column(
         String(120),
@@ -42,7 +41,13 @@ class UserOffer(Base):
     requested_date: Mapped[datetime.date] = mapped_column(Date, nullable=True)
     requested_time: Mapped[datetime.time] = mapped_column(Time, nullable=True)
 
-    __table_args__ = (PrimaryKeyConstraint("offerer_id", "cleaning_id"),)
+    __table_args__ = (
+        PrimaryKeyConstraint("offerer_id", "cleaning_id"),
+        # offers of an offerer by status
+        Index("ix_user_offers_for_cleanings_offerer_id_status", "offerer_id", "status"),
+        # offers of a cleaning in keyset order
+        Index("ix_user_offers_for_cleanings_cleaning_id_offerer_id", "cleaning_id", "offerer_id"),
+    )
 
     def __repr__(self) -> str:
         return (
@@ -7,6 +7,7 @@ from pydantic import (
     BaseModel,
     ConfigDict,
     EmailStr,
+    Field,
 )
 from pydantic.functional_serializers import PlainSerializer
 
@@ -56,6 +57,10 @@ class OfferUpdate(BaseModel):
     status: OfferStatus
 
 
+class OfferBatchUpdate(OfferUpdate):
+    offerer_ids: Annotated[list[UUID4], Field(min_length=1, max_length=100)]
+
+
 class OfferInDB(OfferBase, OfferCreate):
     offerer_id: UUID4
     cleaning_id: int
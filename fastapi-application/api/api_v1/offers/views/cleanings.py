@@ -1,4 +1,7 @@
-from typing import Annotated
+from typing import (
+    Annotated,
+    Any,
+)
 
 from fastapi import (
     APIRouter,
@@ -13,20 +16,28 @@ from api.api_v1.cleanings.dependencies import check_cleaning_job_owner
 from api.api_v1.cleanings.models import Cleaning
 from api.api_v1.offers.dependencies import get_offer_from_user_by_user_id
 from api.api_v1.offers.schemas import (
+    OfferBatchUpdate,
     OfferPublic,
     OfferUpdate,
 )
 from core.models import db_helper
 from crud.offers import offers_crud
+from utils.pagination.schemas import PaginatedResponse
 
 router = APIRouter(
     tags=["Offers for cleaning owners"],
 )
 
+# the statuses a cleaning owner may change an offer from, by the new status
+STATUS_TRANSITIONS: dict[str, tuple[str, ...]] = {
+    "accepted": ("pending",),
+    "rejected": ("pending", "accepted"),
+}
+
 
 @router.get(
     "",
-    response_model=list[OfferPublic],
+    response_model=PaginatedResponse[OfferPublic],
     response_model_exclude_none=True,
     name="offers-cleanings:show-offers-for-one-cleaning",
     summary="show all offers for a specific cleaning job",
@@ -34,16 +45,16 @@ router = APIRouter(
 async def show_offers_for_cleaning_owner_by_cleaning_id(
     cleaning: Annotated[Cleaning, Depends(check_cleaning_job_owner)],
     session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
-    skip: int = Query(default=0, ge=0),
-    limit: int = Query(default=30, ge=1, le=30),
-) -> list[OfferPublic]:
+    max_results: int = Query(default=30, ge=1, le=30),
+    cursor: str = Query(None),
+) -> dict[str, Any]:
     offers = await offers_crud.get_offers_for_cleaning_owner(
         session=session,
         cleaning_id=cleaning.id,
-        offset=skip,
-        limit=limit,
+        max_results=max_results,
+        cursor=cursor,
     )
-    return [OfferPublic(**offer.as_dict()) for offer in offers]
+    return offers
 
 
 @router.get(
@@ -136,3 +147,37 @@ async def cleaning_owner_reject_offer(
     )
 
     return OfferPublic(offerer=offer.offerer, **rejected_offer.as_dict())
+
+
+@router.put(
+    "/batch",
+    response_model=list[OfferPublic],
+    response_model_exclude_none=True,
+    name="offers-cleanings:cleaning-owner-update-many-offers",
+    summary="cleaning owner accepts or rejects many offers at once",
+)
+async def cleaning_owner_update_many_offers(
+    cleaning: Annotated[Cleaning, Depends(check_cleaning_job_owner)],
+    offers_update: OfferBatchUpdate,
+    session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
+) -> list[OfferPublic]:
+    """
+    Changes the status of the offers of the given offerers in one statement.
+
+    Pending offers can be accepted or rejected, accepted offers can be rejected (cancelled).
+    Offers in any other status are left unchanged and are not returned.
+    """
+    if (from_statuses := STATUS_TRANSITIONS.get(offers_update.status)) is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Offers can only be accepted or rejected",
+        )
+
+    updated_offers = await offers_crud.update_offers_for_cleaning_owner(
+        session=session,
+        cleaning_id=cleaning.id,
+        offer_update=offers_update,
+        from_statuses=from_statuses,
+    )
+
+    return updated_offers
@@ -109,7 +109,7 @@ async def create_offer_for_cleaning_owner(
     dependencies=[Depends(UserProfilePermissionGetter("customer"))],
 )
 async def show_all_cleanings(
-    session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
+    session: Annotated[AsyncSession, Depends(db_helper.read_session_getter)],
     params: ItemParamsCleaning = Depends(),
     max_results: int = Query(default=100, ge=1, le=100),
     cursor: str = Query(None),
@@ -188,7 +188,7 @@ async def show_offer_by_cleaning_id(
 
 @router.get(
     "",
-    response_model=list[OfferPublic],
+    response_model=PaginatedResponse[OfferPublic],
     response_model_exclude_none=True,
     name="offers:show-all-self-offers",
     summary="show all offers created by the offerer",
@@ -196,13 +196,17 @@ async def show_offer_by_cleaning_id(
 async def show_all_self_offers(
     user_auth: Annotated[UserAuthSchema, Depends(UserProfilePermissionGetter("customer"))],
     session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
-) -> list[OfferPublic]:
+    max_results: int = Query(default=100, ge=1, le=100),
+    cursor: str = Query(None),
+) -> dict[str, Any]:
     offers = await offers_crud.get_all_offers_for_offerer(
         session=session,
         user_id=user_auth.id,
+        max_results=max_results,
+        cursor=cursor,
     )
 
-    return [OfferPublic(**offer.as_dict()) for offer in offers]
+    return offers
 
 
 @router.put(
@@ -26,6 +26,8 @@ class Profile(IntIdPkMixin, Base):
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
+        unique=True,
+        index=True,
     )
 
     def __repr__(self) -> str:
@@ -1,3 +1,4 @@
+from contextlib import suppress
 from typing import Annotated
 
 from fastapi import (
@@ -9,8 +10,11 @@ from fastapi import (
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.schemas import UserAuthSchema
-from auth.utils.auth_utils import verify_password
+from auth.utils.password_hasher import password_hasher
+from auth.utils.password_rehash import password_rehash_queue
+from core.config import settings
 from core.models import db_helper
+from core.models.db_helper import release_connection
 from crud.users import users_crud
 
 
@@ -21,6 +25,9 @@ async def validate_user(
 ) -> UserAuthSchema:
     """
     User validation at login.
+
+    A password hash stored with an outdated cost factor is rehashed
+    once the password has been verified and queued for storage.
     Args:
         username: Mail is used instead of username.
         password: User password.
@@ -41,8 +48,9 @@ async def validate_user(
         )
     ):
         raise unauthorized_exc
+    await release_connection(session)
 
-    if not verify_password(
+    if not await password_hasher.verify(
         plaintext_password=password,
         hashed_password=user.password,
     ):
@@ -54,11 +62,14 @@ async def validate_user(
             detail="User inactive",
         )
 
-    return UserAuthSchema(
-        id=user.id,
-        email=user.email,
-        email_verified=user.email_verified,
-        is_active=user.is_active,
-        profile_exists=user.profile_exists,
-        permissions=[perm.name for perm in user.role.permissions],
-    )
+    rehash = settings.pwd_hashing.rehash_on_login and not password_rehash_queue.full
+    if rehash and password_hasher.needs_rehash(user.password):
+        # a busy hasher answers 503, the hash is then upgraded on a later login
+        with suppress(HTTPException):
+            password_rehash_queue.submit(
+                user_id=user.id,
+                hashed_password=user.password,
+                new_hashed_password=await password_hasher.hash(plaintext_password=password),
+            )
+
+    return await users_crud.to_auth_schema(session=session, user=user)
@@ -39,6 +39,10 @@ def create_access_token(
         "sub": str(user.id),
         "email": user.email,
         "scopes": user.permissions,
+        "email_verified": user.email_verified,
+        "is_active": user.is_active,
+        "profile_exists": user.profile_exists,
+        "perm_mask": user.permission_mask,
     }
     if extra is not None:
         jwt_payload.update(**extra)
@@ -1,9 +1,11 @@
 import uuid
+from datetime import datetime
 
 from sqlalchemy import (
     UUID,
     Boolean,
     Column,
+    DateTime,
     ForeignKey,
     Integer,
     LargeBinary,
@@ -18,6 +20,7 @@ from sqlalchemy.orm import (
 )
 
 from core.models import Base
+from core.models.mixins import IntIdPkMixin
 
 role_permission = Table(
     "role_permission",
@@ -43,14 +46,12 @@ class User(Base):
         ForeignKey("roles.id"),
         server_default=text("1"),
     )
-    role = relationship("Role", back_populates="users", lazy="selectin")
-    profile = relationship("Profile", lazy="selectin")
+    # relationships are never loaded implicitly, every query declares the loader options it needs
+    role = relationship("Role", back_populates="users", lazy="raise")
+    profile = relationship("Profile", lazy="raise")
 
     def __repr__(self) -> str:
-        return (
-            f"User: (id={self.id!r}, email={self.email!r},"
-            f" is_active={self.is_active!r}, role_permissions={[perm.name for perm in self.role.permissions]!r})"
-        )
+        return f"User: (id={self.id!r}, email={self.email!r}, is_active={self.is_active!r}, role_id={self.role_id!r})"
 
 
 class Role(Base):
@@ -60,12 +61,28 @@ class Role(Base):
         "Permission",
         secondary=role_permission,
         back_populates="roles",
-        lazy="selectin",
+        lazy="raise",
     )
-    users = relationship("User", back_populates="role")
+    users = relationship("User", back_populates="role", lazy="raise")
 
 
 class Permission(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(100), unique=True, index=True)
-    roles = relationship("Role", secondary=role_permission, back_populates="permissions")
+    roles = relationship("Role", secondary=role_permission, back_populates="permissions", lazy="raise")
+
+
+class RevokedToken(IntIdPkMixin, Base):
+    """
+    Denylist entry for stateless authentication: either a single token (jti)
+    or every access token of a user issued before issued_before.
+    """
+
+    jti: Mapped[str | None] = mapped_column(String(36), nullable=True, unique=True)
+    user_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    issued_before: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
@@ -16,7 +16,7 @@ from api.api_v1.users.schemas import (
 )
 from auth.dependencies import get_current_active_auth_user
 from auth.schemas import UserAuthSchema
-from auth.utils.auth_utils import hash_password
+from auth.utils.password_hasher import password_hasher
 from core.models import db_helper
 from crud.users import users_crud
 
@@ -36,7 +36,7 @@ async def reset_user_password(
     session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
     update_pwd: UserUpdatePassword,
 ) -> UserPublic:
-    str_pwd_to_bytes: bytes = hash_password(
+    str_pwd_to_bytes: bytes = await password_hasher.hash(
         plaintext_password=update_pwd.password,
     )
     user = await users_crud.reset_password(
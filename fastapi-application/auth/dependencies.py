@@ -11,6 +11,7 @@ from uuid import UUID
 from fastapi import (
     Depends,
     HTTPException,
+    Request,
     Security,
     status,
 )
@@ -22,21 +23,89 @@ from auth.http_pwd_bearer import (
     access_token_bearer,
     refresh_token_bearer,
 )
+from auth.permissions import permission_table
+from auth.revocation import revocation_list
 from auth.schemas import (
     TokenData,
     TokenDataRefresh,
     UserAuthSchema,
 )
+from auth.user_cache import (
+    cache_user,
+    get_cached_user,
+)
+from core.config import settings
 from core.models import db_helper
+from core.models.db_helper import release_connection
 from crud.users import users_crud
 
+SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+
+def get_user_from_token_claims(token_data: TokenData) -> UserAuthSchema | None:
+    """
+    Builds the user from the access token claims in the stateless mode.
+    Args:
+        token_data: Validated access token payload.
+
+    Returns:
+        UserAuthSchema (pydantic model object) | None: The user object, or None
+        if the token was issued without the user state claims.
+    """
+    if token_data.email_verified is None or token_data.is_active is None:
+        return None
+    if token_data.profile_exists is None or token_data.perm_mask is None:
+        return None
+
+    return UserAuthSchema(
+        id=token_data.sub,
+        email=token_data.email,
+        email_verified=token_data.email_verified,
+        is_active=token_data.is_active,
+        profile_exists=token_data.profile_exists,
+        permissions=token_data.scopes,
+        permission_mask=token_data.perm_mask,
+    )
+
+
+def get_stateless_user(
+    request: Request,
+    token_data: TokenData,
+    credentials_exc: HTTPException,
+) -> UserAuthSchema | None:
+    """
+    Rejects revoked tokens and builds the user of read-only requests from
+    the token claims in the stateless mode.
+    Args:
+        request: The incoming request.
+        token_data: Validated access token payload.
+        credentials_exc: The exception raised for a revoked token.
+
+    Returns:
+        UserAuthSchema (pydantic model object) | None: The user object, or None
+        if it has to be read from the database.
+    """
+    if not settings.auth_jwt.stateless:
+        return None
+    if revocation_list.is_revoked(
+        jti=token_data.jti,
+        user_id=token_data.sub,
+        issued_at=token_data.iat.timestamp(),
+    ):
+        raise credentials_exc
+    if request.method not in SAFE_METHODS:
+        return None
+
+    return get_user_from_token_claims(token_data=token_data)
+
 
 async def get_user_by_token_sub(
     user_id: UUID,
     session: AsyncSession,
 ) -> UserAuthSchema:
     """
-    Retrieves a user from the database.
+    Retrieves a user from the cache of authenticated users, falling back
+    to the database.
     Args:
         user_id: User ID from the sub payload field of the token.
         session: The database session.
@@ -44,7 +113,10 @@ async def get_user_by_token_sub(
     Returns:
         UserAuthSchema (pydantic model object): The user object.
     """
+    if user := get_cached_user(user_id=user_id):
+        return user
     if user := await users_crud.get_user_by_id(session=session, user_id=user_id):
+        cache_user(user=user)
         return user
 
     raise HTTPException(
@@ -77,11 +149,13 @@ async def get_current_auth_user_for_refresh(
         )
     user_sub = token_data.sub
     user = await get_user_by_token_sub(user_id=user_sub, session=session)
+    await release_connection(session)
 
     return user
 
 
 async def get_current_auth_user(
+    request: Request,
     security_scopes: SecurityScopes,
     session: Annotated[AsyncSession, Depends(db_helper.session_getter)],
     payload: Annotated[dict[str, Any], Depends(access_token_bearer)],
@@ -89,7 +163,12 @@ async def get_current_auth_user(
     """
     Restrict access to resources for unauthorised users and/or
     users without permission rights.
+
+    In the stateless mode revoked tokens are rejected and read-only
+    requests are authorised from the token claims without a database
+    round-trip.
     Args:
+        request: The incoming request.
         security_scopes:  The list of the scopes required by dependencies.
         session: The database session.
         payload: Payload from Bearer-token.
@@ -110,14 +189,20 @@ async def get_current_auth_user(
         token_data = TokenData(**payload)
     except ValidationError:
         raise credentials_exc
-    user = await get_user_by_token_sub(user_id=token_data.sub, session=session)
-    for scope in security_scopes.scopes:
-        if scope not in token_data.scopes:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Not enough permissions",
-                headers={"WWW-Authenticate": authenticate_value},
-            )
+    user = get_stateless_user(request=request, token_data=token_data, credentials_exc=credentials_exc)
+    if user is None:
+        user = await get_user_by_token_sub(user_id=token_data.sub, session=session)
+    snapshot = await permission_table.get(session=session)
+    if not snapshot.covers(
+        granted=snapshot.mask_of(token_data.scopes),
+        required=security_scopes.scopes,
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not enough permissions",
+            headers={"WWW-Authenticate": authenticate_value},
+        )
+    await release_connection(session)
     user.logged_in_at = token_data.iat
 
     return user
@@ -151,7 +236,10 @@ class UserProfilePermissionGetter:
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied. You do not have a registered profile",
             )
-        if self._register_as not in user_auth.permissions:
+        if not permission_table.snapshot.covers(
+            granted=user_auth.permission_mask,
+            required=(self._register_as,),
+        ):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Access is only allowed to users registered as a {self._register_as!r}",
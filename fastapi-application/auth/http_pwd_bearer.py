@@ -1,4 +1,5 @@
 import logging
+from hashlib import sha256
 from types import MappingProxyType
 from typing import (
     Any,
@@ -14,6 +15,8 @@ from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
 
 from auth.utils.auth_utils import decode_jwt
+from core.config import settings
+from utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +29,11 @@ SCOPES = MappingProxyType(
     }
 )
 
+verified_token_cache: TTLCache[bytes, dict[str, Any]] = TTLCache(
+    name="verified_jwt",
+    max_size=settings.auth_jwt.verified_token_cache_size,
+)
+
 
 class TokenBearer(OAuth2PasswordBearer):
     """
@@ -63,6 +71,14 @@ class TokenBearer(OAuth2PasswordBearer):
 
     @staticmethod
     def get_current_token_payload(token: str) -> dict[str, Any]:
+        """
+        Decodes the token, reusing the payload of a token that has already
+        been verified by this worker until the token expires.
+        """
+        token_digest = sha256(token.encode()).digest()
+        if (payload := verified_token_cache.get(token_digest)) is not None:
+            return payload.copy()
+
         try:
             payload = decode_jwt(token=token)
         except InvalidTokenError:
@@ -72,6 +88,8 @@ class TokenBearer(OAuth2PasswordBearer):
                 detail="Could not validate credentials. Invalid token error or expired token",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        if isinstance(expires_at := payload.get("exp"), int | float):
+            verified_token_cache.set(token_digest, payload.copy(), expires_at=expires_at)
 
         return payload
 
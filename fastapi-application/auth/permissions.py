@@ -0,0 +1,139 @@
+"""
+This module contains the in-process snapshot of roles and permissions.
+
+Roles and permissions are static rows, so they are read once per worker
+and kept as integer bitmasks instead of being loaded with every user.
+"""
+
+import logging
+from collections.abc import (
+    Iterable,
+    Mapping,
+)
+from dataclasses import dataclass
+from time import monotonic
+from types import MappingProxyType
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.api_v1.users.models import (
+    Permission,
+    Role,
+    role_permission,
+)
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class PermissionSnapshot:
+    """
+    Immutable role -> permission table.
+    Every permission name owns the bit of its primary key, every role is the
+    mask of its permissions. The masks outlive the snapshot in access tokens
+    and cached users, so a bit never moves to another permission on reload.
+    """
+
+    bits: Mapping[str, int]
+    role_masks: Mapping[int, int]
+
+    def mask_of(self, names: Iterable[str]) -> int:
+        """
+        Returns the mask of the given permission names, unknown names are ignored.
+        """
+        mask = 0
+        for name in names:
+            mask |= self.bits.get(name, 0)
+
+        return mask
+
+    def names_of(self, mask: int) -> list[str]:
+        return [name for name, bit in self.bits.items() if mask & bit]
+
+    def covers(self, granted: int, required: Iterable[str]) -> bool:
+        """
+        Checks that every required permission is set in the granted mask.
+        An unknown required permission is never covered.
+        """
+        for name in required:
+            if not granted & self.bits.get(name, 0):
+                return False
+
+        return True
+
+
+class PermissionTable:
+    """
+    Loads the permission snapshot lazily and swaps it atomically on reload.
+
+    The snapshot is refreshed after roles.permissions_snapshot_ttl_seconds,
+    when a user refers to a role that is not in it, or after invalidate()
+    is called by code that changes roles.
+    """
+
+    def __init__(self, ttl_seconds: int) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._snapshot: PermissionSnapshot | None = None
+        self._loaded_at: float = 0.0
+
+    @property
+    def snapshot(self) -> PermissionSnapshot:
+        if self._snapshot is None:
+            raise RuntimeError("Permission snapshot is not loaded")
+
+        return self._snapshot
+
+    async def load(self, session: AsyncSession) -> PermissionSnapshot:
+        permissions = await session.execute(select(Permission.id, Permission.name))
+        bits = {name: 1 << permission_id for permission_id, name in permissions.all()}
+        roles = await session.scalars(select(Role.id))
+        role_masks = dict.fromkeys(roles.all(), 0)
+        rows = await session.execute(
+            select(role_permission.c.role_id, Permission.name).join(
+                Permission,
+                Permission.id == role_permission.c.permission_id,
+            )
+        )
+        for role_id, name in rows.all():
+            role_masks[role_id] = role_masks.get(role_id, 0) | bits[name]
+
+        self._snapshot = PermissionSnapshot(
+            bits=MappingProxyType(bits),
+            role_masks=MappingProxyType(role_masks),
+        )
+        self._loaded_at = monotonic()
+        logger.info("loaded permission snapshot: permissions=%s, roles=%s", len(bits), len(role_masks))
+
+        return self._snapshot
+
+    async def get(
+        self,
+        session: AsyncSession,
+        role_id: int | None = None,
+    ) -> PermissionSnapshot:
+        """
+        Returns the current snapshot, reloading it if it is missing, stale
+        or does not know the given role.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or self._is_stale(snapshot=snapshot, role_id=role_id):
+            snapshot = await self.load(session=session)
+
+        return snapshot
+
+    def _is_stale(self, snapshot: PermissionSnapshot, role_id: int | None) -> bool:
+        if monotonic() - self._loaded_at > self._ttl_seconds:
+            return True
+
+        return role_id is not None and role_id not in snapshot.role_masks
+
+    def invalidate(self) -> None:
+        """
+        Forces a reload on the next get(); the old snapshot stays readable until then.
+        """
+        self._loaded_at = float("-inf")
+
+
+permission_table = PermissionTable(ttl_seconds=settings.roles.permissions_snapshot_ttl_seconds)
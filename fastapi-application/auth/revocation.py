@@ -0,0 +1,110 @@
+"""
+This module contains the in-process token denylist used by the stateless
+authentication mode.
+
+Every worker keeps the unexpired rows of the revoked_tokens table in
+memory and pulls new rows from Postgres every few seconds.
+"""
+
+import asyncio
+import logging
+from contextlib import suppress
+from datetime import (
+    datetime,
+    timezone,
+)
+from uuid import UUID
+
+from sqlalchemy import (
+    delete,
+    select,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.api_v1.users.models import RevokedToken
+from core.config import settings
+from core.models import db_helper
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationList:
+    """
+    Exact in-memory denylist of revoked token ids and per-user cutoffs.
+
+    Entries are dropped once the tokens they cover have expired, so the
+    list stays as small as the number of recent revocations.
+    """
+
+    def __init__(self, sync_interval_seconds: float) -> None:
+        self._sync_interval_seconds = sync_interval_seconds
+        # jti -> expires_at
+        self._jtis: dict[str, float] = {}
+        # user id -> (issued_before, expires_at)
+        self._users: dict[UUID, tuple[float, float]] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._jtis) + len(self._users)
+
+    def is_revoked(self, jti: str, user_id: UUID, issued_at: float) -> bool:
+        if jti in self._jtis:
+            return True
+        if (entry := self._users.get(user_id)) is not None:
+            return issued_at < entry[0]
+
+        return False
+
+    def add(self, entry: RevokedToken | None) -> None:
+        if entry is None:
+            return
+        expires_at = entry.expires_at.timestamp()
+        if entry.jti is not None:
+            self._jtis[entry.jti] = expires_at
+        if entry.user_id is not None and entry.issued_before is not None:
+            issued_before = entry.issued_before.timestamp()
+            current_cutoff, current_expiry = self._users.get(entry.user_id, (0.0, 0.0))
+            self._users[entry.user_id] = (
+                max(issued_before, current_cutoff),
+                max(expires_at, current_expiry),
+            )
+
+    async def sync(self, session: AsyncSession) -> None:
+        """
+        Replaces the denylist with the unexpired rows of the table and
+        deletes the expired ones. Reading the whole (small) table keeps
+        the workers correct even if rows are committed out of id order.
+        """
+        now = datetime.now(timezone.utc)
+        rows = await session.scalars(select(RevokedToken).where(RevokedToken.expires_at > now))
+        synced = RevocationList(sync_interval_seconds=self._sync_interval_seconds)
+        for entry in rows.all():
+            synced.add(entry=entry)
+        self._jtis, self._users = synced._jtis, synced._users
+        await session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+        await session.commit()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with db_helper.get_ctx_async_session() as session:
+                    await self.sync(session=session)
+            except Exception:
+                logger.exception("Failed to sync the token denylist", exc_info=True)
+            await asyncio.sleep(self._sync_interval_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="token-denylist-sync")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+
+revocation_list = RevocationList(
+    sync_interval_seconds=settings.auth_jwt.revocation_sync_interval_seconds,
+)
@@ -17,6 +17,7 @@ class UserAuthSchema(BaseModel):
     is_active: bool
     profile_exists: bool
     permissions: list[str]
+    permission_mask: int = 0
     logged_in_at: datetime | None = None
 
 
@@ -55,6 +56,12 @@ class TokenInfo(BaseModel):
 class TokenData(TokenMeta):
     email: EmailStr
     scopes: list[str] = []
+    email_verified: bool | None = None
+    is_active: bool | None = None
+    profile_exists: bool | None = None
+    # keyed by permission id; renamed from perms, whose bits were positions, so that
+    # tokens issued before that are read from the database until they expire
+    perm_mask: int | None = None
 
 
 class TokenDataRefresh(TokenMeta):
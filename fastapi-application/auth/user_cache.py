@@ -0,0 +1,42 @@
+"""
+This module contains the per-worker cache of authenticated users.
+"""
+
+from time import time
+from uuid import UUID
+
+from auth.schemas import UserAuthSchema
+from core.config import settings
+from utils.ttl_cache import TTLCache
+
+authenticated_user_cache: TTLCache[UUID, UserAuthSchema] = TTLCache(
+    name="authenticated_user",
+    max_size=settings.auth_jwt.user_cache_size,
+)
+
+
+def get_cached_user(user_id: UUID) -> UserAuthSchema | None:
+    """
+    Returns a copy of the cached user, so per-request fields
+    (e.g. logged_in_at) never leak into the cache.
+    """
+    if (user := authenticated_user_cache.get(user_id)) is not None:
+        return user.model_copy()
+
+    return None
+
+
+def cache_user(user: UserAuthSchema) -> None:
+    authenticated_user_cache.set(
+        user.id,
+        user.model_copy(),
+        expires_at=time() + settings.auth_jwt.user_cache_ttl_seconds,
+    )
+
+
+def invalidate_cached_user(user_id: UUID) -> None:
+    """
+    Drops the user from this worker's cache. Other workers pick up the
+    change when their entry expires, after at most user_cache_ttl_seconds.
+    """
+    authenticated_user_cache.pop(user_id)
@@ -12,14 +12,20 @@ from typing import Any
 
 import bcrypt
 import jwt
+from jwt.exceptions import InvalidTokenError
 
+from auth.utils.key_ring import (
+    PrivateKeyType,
+    PublicKeyType,
+    key_ring,
+)
 from core.config import settings
 
 
 def encode_jwt(
     payload: dict[str, Any],
-    private_key: str = settings.auth_jwt.private_key_path.read_text(),  # noqa: B008
-    algorithm: str = settings.auth_jwt.algorithm,
+    private_key: PrivateKeyType | None = None,
+    algorithm: str | None = None,
     expire_minutes: int = settings.auth_jwt.access_token_expire_minutes,
     expire_timedelta: timedelta | None = None,
 ) -> str:
@@ -27,8 +33,8 @@ def encode_jwt(
     Is used as a base function to issue json web tokens.
     Args:
         payload: User information.
-        private_key: Private key generated via openssl.
-        algorithm: The RS256 algorithm is used.
+        private_key: Parsed private key, the key ring signing key by default.
+        algorithm: RS256, ES256 or EdDSA, the configured algorithm by default.
         expire_minutes: Token lifetime.
         expire_timedelta: Refresh token lifetime by default None.
     """
@@ -41,47 +47,62 @@ def encode_jwt(
 
     to_encode.update(
         jti=str(uuid.uuid4()),
-        iat=time_now,
+        # a NumericDate may have a fraction; a whole-second iat would let a token issued
+        # earlier in the same second as a revocation cutoff pass the denylist
+        iat=time_now.timestamp(),
         exp=expire,
     )
+    headers = None
+    if private_key is None:
+        private_key = key_ring.signing_key
+        headers = {"kid": key_ring.signing_kid}
 
     return jwt.encode(
         payload=to_encode,
         key=private_key,
-        algorithm=algorithm,
+        algorithm=algorithm or key_ring.algorithm,
+        headers=headers,
     )
 
 
 def decode_jwt(
     token: str | bytes,
-    public_key: str = settings.auth_jwt.public_key_path.read_text(),  # noqa: B008
-    algorithm: str = settings.auth_jwt.algorithm,
+    public_key: PublicKeyType | None = None,
+    algorithm: str | None = None,
 ) -> dict[str, Any]:
     """
     Decodes JWT.
     Args:
         token: Json web token.
-        public_key: Public key generated via openssl.
-        algorithm: The RS256 algorithm is used.
+        public_key: Parsed public key, by default it is picked from the key ring
+            by the `kid` header of the token.
+        algorithm: Expected algorithm, by default the one of the picked key.
     """
+    if public_key is None:
+        kid = jwt.get_unverified_header(token).get("kid")
+        if (verification_key := key_ring.get_verification_key(kid=kid)) is None:
+            raise InvalidTokenError(f"Unknown key id {kid!r}")
+        public_key = verification_key.key
+        algorithm = algorithm or verification_key.algorithm
 
     return jwt.decode(
         jwt=token,
         key=public_key,
-        algorithms=[algorithm],
+        algorithms=[algorithm or key_ring.algorithm],
     )
 
 
-def hash_password(*, plaintext_password: str) -> bytes:
+def hash_password(*, plaintext_password: str, rounds: int = 12) -> bytes:
     """
     Generates a password hash value.
     Args:
         plaintext_password: The password to be hashed.
+        rounds: The bcrypt cost factor (log2 of the number of iterations).
 
     Returns:
       bytes: The hash value of the password.
     """
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds)
     pwd_bytes: bytes = plaintext_password.encode()
 
     return bcrypt.hashpw(
@@ -110,3 +131,10 @@ def verify_password(
         password=pwd_bytes,
         hashed_password=hashed_password,
     )
+
+
+def get_hash_rounds(hashed_password: bytes) -> int:
+    """
+    Reads the cost factor of a bcrypt hash, e.g. 12 for b"$2b$12$...".
+    """
+    return int(hashed_password.split(b"$")[2])
@@ -0,0 +1,173 @@
+"""
+This module contains the key ring used to sign and verify json web tokens.
+"""
+
+import logging
+from base64 import urlsafe_b64encode
+from dataclasses import dataclass
+from hashlib import sha256
+from pathlib import Path
+from typing import Any
+
+from cryptography.hazmat.primitives.asymmetric.ec import (
+    SECP256R1,
+    EllipticCurvePrivateKey,
+    EllipticCurvePublicKey,
+)
+from cryptography.hazmat.primitives.asymmetric.ed25519 import (
+    Ed25519PrivateKey,
+    Ed25519PublicKey,
+)
+from cryptography.hazmat.primitives.asymmetric.rsa import (
+    RSAPrivateKey,
+    RSAPublicKey,
+)
+from cryptography.hazmat.primitives.serialization import (
+    Encoding,
+    PublicFormat,
+    load_pem_private_key,
+    load_pem_public_key,
+)
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PrivateKeyType = RSAPrivateKey | EllipticCurvePrivateKey | Ed25519PrivateKey
+PublicKeyType = RSAPublicKey | EllipticCurvePublicKey | Ed25519PublicKey
+
+
+def key_algorithm(key: PrivateKeyType | PublicKeyType) -> str:
+    """
+    Returns the JWS algorithm that matches the key type.
+    """
+    if isinstance(key, RSAPrivateKey | RSAPublicKey):
+        return "RS256"
+    if isinstance(key, EllipticCurvePrivateKey | EllipticCurvePublicKey) and isinstance(key.curve, SECP256R1):
+        return "ES256"
+    if isinstance(key, Ed25519PrivateKey | Ed25519PublicKey):
+        return "EdDSA"
+
+    raise ValueError(f"Unsupported JWT key type {type(key).__name__!r}")
+
+
+def key_id(public_key: PublicKeyType) -> str:
+    """
+    Derives a stable key identifier from the public key, so every
+    worker computes the same `kid` without extra configuration.
+    """
+    der = public_key.public_bytes(
+        encoding=Encoding.DER,
+        format=PublicFormat.SubjectPublicKeyInfo,
+    )
+
+    return urlsafe_b64encode(sha256(der).digest()[:12]).decode()
+
+
+@dataclass(frozen=True, slots=True)
+class VerificationKey:
+    kid: str
+    algorithm: str
+    key: PublicKeyType
+
+
+class KeyRing:
+    """
+    Holds the parsed signing key and every key that is accepted for
+    verification.
+
+    PEM files are read and parsed once, on first use. Tokens are stamped
+    with the `kid` of the signing key; during a rotation the previous
+    public keys stay in the ring so tokens issued with them remain valid
+    until they expire.
+    """
+
+    def __init__(
+        self,
+        private_key_path: Path,
+        public_key_path: Path,
+        previous_public_key_paths: list[Path],
+        algorithm: str,
+    ) -> None:
+        self._private_key_path = private_key_path
+        self._public_key_paths = [public_key_path, *previous_public_key_paths]
+        self._algorithm = algorithm
+        self._signing_key: PrivateKeyType | None = None
+        self._signing_kid: str = ""
+        self._verification_keys: dict[str, VerificationKey] = {}
+
+    def _load(self) -> None:
+        signing_key: Any = load_pem_private_key(self._private_key_path.read_bytes(), password=None)
+        if (algorithm := key_algorithm(signing_key)) != self._algorithm:
+            raise ValueError(
+                f"Signing key {self._private_key_path.name!r} is a {algorithm} key, "
+                f"but auth_jwt.algorithm is {self._algorithm!r}"
+            )
+
+        verification_keys: dict[str, VerificationKey] = {}
+        for path in self._public_key_paths:
+            public_key: Any = load_pem_public_key(path.read_bytes())
+            kid = key_id(public_key)
+            verification_keys[kid] = VerificationKey(
+                kid=kid,
+                algorithm=key_algorithm(public_key),
+                key=public_key,
+            )
+        signing_kid = key_id(signing_key.public_key())
+        if signing_kid not in verification_keys:
+            raise ValueError(f"Public key {self._public_key_paths[0].name!r} does not match the signing key")
+
+        self._signing_key = signing_key
+        self._signing_kid = signing_kid
+        self._verification_keys = verification_keys
+        logger.info(
+            "loaded JWT key ring: algorithm=%s, kid=%s, verification keys=%s",
+            self._algorithm,
+            signing_kid,
+            len(verification_keys),
+        )
+
+    @property
+    def algorithm(self) -> str:
+        return self._algorithm
+
+    @property
+    def signing_key(self) -> PrivateKeyType:
+        if self._signing_key is None:
+            self._load()
+
+        return self._signing_key  # type: ignore
+
+    @property
+    def signing_kid(self) -> str:
+        if self._signing_key is None:
+            self._load()
+
+        return self._signing_kid
+
+    def get_verification_key(self, kid: str | None) -> VerificationKey | None:
+        """
+        Returns the verification key for the `kid` header. Tokens issued
+        before key ids were introduced carry no `kid` and are checked
+        against the current public key.
+        """
+        if self._signing_key is None:
+            self._load()
+        if kid is None:
+            kid = self._signing_kid
+
+        return self._verification_keys.get(kid)
+
+    def reload(self) -> None:
+        """
+        Re-reads the key files, e.g. after a rotation.
+        """
+        self._load()
+
+
+key_ring = KeyRing(
+    private_key_path=settings.auth_jwt.private_key_path,
+    public_key_path=settings.auth_jwt.public_key_path,
+    previous_public_key_paths=settings.auth_jwt.previous_public_key_paths,
+    algorithm=settings.auth_jwt.algorithm,
+)
@@ -0,0 +1,203 @@
+"""
+This module contains an asynchronous password hashing service.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from time import perf_counter
+from typing import (
+    Callable,
+    TypeVar,
+)
+
+from fastapi import (
+    HTTPException,
+    status,
+)
+
+from auth.utils.auth_utils import (
+    get_hash_rounds,
+    hash_password,
+    verify_password,
+)
+from core.config import settings
+from utils.metrics import metrics_registry
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+HASH_QUEUE_WAIT = metrics_registry.histogram(
+    name="password_hashing_queue_wait_seconds",
+    description="Time a bcrypt job waited for a free worker",
+)
+HASH_DURATION = metrics_registry.histogram(
+    name="password_hashing_duration_seconds",
+    description="Time spent running bcrypt",
+)
+HASH_REJECTED = metrics_registry.counter(
+    name="password_hashing_rejected_total",
+    description="Bcrypt jobs rejected because the queue was full",
+)
+
+
+def calibrate_rounds(
+    target_seconds: float,
+    min_rounds: int,
+    max_rounds: int,
+) -> int:
+    """
+    Picks the highest bcrypt cost factor whose hashing time on this
+    machine stays within the target. Every extra round doubles the time,
+    so the cost is extrapolated from a single measurement at min_rounds
+    and then checked once.
+    Args:
+        target_seconds: Latency budget of one hash.
+        min_rounds: Lowest cost factor to use, even if it is slower than the target.
+        max_rounds: Highest cost factor to use.
+
+    Returns:
+        int: The cost factor.
+    """
+    started_at = perf_counter()
+    hash_password(plaintext_password="calibration", rounds=min_rounds)
+    elapsed = perf_counter() - started_at
+    rounds = min_rounds
+    while rounds < max_rounds and elapsed * 2 ** (rounds + 1 - min_rounds) <= target_seconds:
+        rounds += 1
+    if rounds > min_rounds:
+        started_at = perf_counter()
+        hash_password(plaintext_password="calibration", rounds=rounds)
+        if perf_counter() - started_at > target_seconds:
+            rounds -= 1
+    logger.info("calibrated bcrypt cost factor: rounds=%s, target=%ss", rounds, target_seconds)
+
+    return rounds
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification in a bounded thread pool.
+
+    bcrypt releases the GIL while hashing, so a thread pool keeps the event
+    loop free without the cost of a process pool. The number of jobs that
+    are running or waiting is capped; above the cap the request is rejected
+    with 503 instead of queueing indefinitely.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue_size: int,
+        retry_after: int,
+        rounds: int,
+    ) -> None:
+        self.rounds = rounds
+        self._max_workers = max_workers
+        self._max_pending = max_workers + max_queue_size
+        self._retry_after = retry_after
+        self._pending: int = 0
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix="pwd-hasher",
+            )
+
+        return self._executor
+
+    async def _run(self, operation: str, func: Callable[[], T]) -> T:
+        if self._pending >= self._max_pending:
+            HASH_REJECTED.inc(operation=operation)
+            logger.warning("password hashing queue is full, pending=%s", self._pending)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Service is temporarily overloaded, try again later",
+                headers={"Retry-After": str(self._retry_after)},
+            )
+
+        queued_at = perf_counter()
+
+        def timed_job() -> T:
+            started_at = perf_counter()
+            HASH_QUEUE_WAIT.observe(started_at - queued_at, operation=operation)
+            try:
+                return func()
+            finally:
+                HASH_DURATION.observe(perf_counter() - started_at, operation=operation)
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), timed_job)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, *, plaintext_password: str) -> bytes:
+        """
+        Generates a password hash value without blocking the event loop.
+        Args:
+            plaintext_password: The password to be hashed.
+
+        Returns:
+          bytes: The hash value of the password.
+        """
+        return await self._run(
+            operation="hash",
+            func=partial(hash_password, plaintext_password=plaintext_password, rounds=self.rounds),
+        )
+
+    async def verify(
+        self,
+        *,
+        plaintext_password: str,
+        hashed_password: bytes,
+    ) -> bool:
+        """
+        Verify if a plain password matches a hashed password without
+        blocking the event loop.
+        Args:
+            plaintext_password: A plain password that needs to be verified.
+            hashed_password: A hashed password for comparison purposes.
+
+        Returns:
+                True if the plain password matches the hashed password, False otherwise.
+        """
+        return await self._run(
+            operation="verify",
+            func=partial(
+                verify_password,
+                plaintext_password=plaintext_password,
+                hashed_password=hashed_password,
+            ),
+        )
+
+    def needs_rehash(self, hashed_password: bytes) -> bool:
+        """
+        Checks whether the hash was made with a lower cost factor than the current one.
+        """
+        return get_hash_rounds(hashed_password) < self.rounds
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stops the worker threads. The pool is recreated on the next call.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.pwd_hashing.max_workers,
+    max_queue_size=settings.pwd_hashing.max_queue_size,
+    retry_after=settings.pwd_hashing.retry_after,
+    rounds=settings.pwd_hashing.rounds,
+)
@@ -0,0 +1,127 @@
+"""
+This module contains the queue that upgrades stored password hashes to
+the current bcrypt cost factor after a successful login.
+"""
+
+import asyncio
+import logging
+from contextlib import suppress
+from uuid import UUID
+
+from sqlalchemy import (
+    bindparam,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.api_v1.users.models import User
+from auth.utils.password_hasher import password_hasher
+from core.config import settings
+from core.models import db_helper
+from utils.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+PASSWORDS_REHASHED = metrics_registry.counter(
+    name="passwords_rehashed_total",
+    description="Stored password hashes upgraded to the current cost factor",
+)
+
+
+class PasswordRehashQueue:
+    """
+    Collects the new hashes of users whose hash has an outdated cost
+    factor and writes them in one statement per flush, off the request
+    path. The new hash is made by the login request, so no plaintext
+    password is ever kept here.
+
+    A hash is only replaced if it is still the one the login was checked
+    against, so a password changed in the meantime is never overwritten.
+    """
+
+    def __init__(self, flush_interval_seconds: float, max_pending: int = 1_000) -> None:
+        self._flush_interval_seconds = flush_interval_seconds
+        self._max_pending = max_pending
+        # user id -> (stored hash, new hash)
+        self._pending: dict[UUID, tuple[bytes, bytes]] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    @property
+    def full(self) -> bool:
+        return len(self._pending) >= self._max_pending
+
+    def submit(
+        self,
+        user_id: UUID,
+        hashed_password: bytes,
+        new_hashed_password: bytes,
+    ) -> None:
+        if not self.full:
+            self._pending[user_id] = (hashed_password, new_hashed_password)
+
+    async def flush(self, session: AsyncSession) -> int:
+        """
+        Stores the pending hashes.
+
+        Returns:
+            int: The number of updated users.
+        """
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        params = [
+            {"user_id": user_id, "old_password": hashed_password, "new_password": new_hashed_password}
+            for user_id, (hashed_password, new_hashed_password) in pending.items()
+        ]
+
+        # a Core executemany on the session's connection: an ORM update with a list of
+        # parameters would be a bulk update by primary key, and only Core reports the rowcount
+        connection = await session.connection()
+        result = await connection.execute(
+            update(User)
+            .where(
+                User.id == bindparam("user_id"),
+                User.password == bindparam("old_password"),
+            )
+            .values(password=bindparam("new_password")),
+            params,
+        )
+        await session.commit()
+        PASSWORDS_REHASHED.inc(result.rowcount)
+        logger.info("rehashed %s passwords with rounds=%s", result.rowcount, password_hasher.rounds)
+
+        return result.rowcount
+
+    async def _flush_with_new_session(self) -> None:
+        try:
+            async with db_helper.get_ctx_async_session() as session:
+                await self.flush(session=session)
+        except Exception:
+            logger.exception("Failed to store rehashed passwords", exc_info=True)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval_seconds)
+            if self._pending:
+                await self._flush_with_new_session()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="password-rehash")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._pending:
+            await self._flush_with_new_session()
+
+
+password_rehash_queue = PasswordRehashQueue(
+    flush_interval_seconds=settings.pwd_hashing.rehash_flush_interval_seconds,
+)
@@ -0,0 +1,62 @@
+"""
+Per-call Python overhead of the hot CRUDRepository statements: building
+the select() and generating its cache key (what SQLAlchemy does before
+it can look up the compiled form), rebuilt on every call vs cached.
+
+No database is needed:
+    python -m benchmarks.crud_statements
+"""
+
+from time import perf_counter
+from typing import (
+    Any,
+    Callable,
+)
+from uuid import uuid4
+
+from sqlalchemy import select
+
+from crud.base import CRUDRepository
+from crud.evaluations import evaluations_crud
+from crud.offers import offers_crud
+from crud.users import users_crud
+
+ROUNDS = 20_000
+
+
+def us_per_call(build: Callable[[], Any], rounds: int = ROUNDS) -> float:
+    started = perf_counter()
+    for _ in range(rounds):
+        build()._generate_cache_key()
+    return (perf_counter() - started) / rounds * 1_000_000
+
+
+def rebuilt(crud: CRUDRepository, kind: str, **kwargs: Any) -> Callable[[], Any]:
+    model = crud._model
+    if kind == "by_id":
+        return lambda: select(model).filter(model.id == kwargs["id"])
+    if kind == "one":
+        return lambda: select(model).filter().filter_by(**kwargs)
+    return lambda: select(model).filter().filter_by(**kwargs).offset(0).limit(100)
+
+
+def cached(crud: CRUDRepository, kind: str, **kwargs: Any) -> Callable[[], Any]:
+    return lambda: crud._get_statement(kind=kind, keys=tuple(sorted(kwargs)))
+
+
+def main() -> None:
+    cases = [
+        ("users_crud.get_user_by_email", users_crud, "one", {"email": "bench@example.com"}),
+        ("offers_crud.get_all_offers_for_offerer", offers_crud, "many", {"offerer_id": uuid4()}),
+        ("evaluations_crud.get_all_cleaner_evaluations", evaluations_crud, "many", {"cleaner_id": uuid4()}),
+        ("evaluations_crud.get_one_by_id", evaluations_crud, "by_id", {"id": 1}),
+    ]
+    print(f"{'call':<48}{'rebuilt us':>12}{'cached us':>12}")
+    for name, crud, kind, kwargs in cases:
+        before = us_per_call(rebuilt(crud, kind, **kwargs))
+        after = us_per_call(cached(crud, kind, **kwargs))
+        print(f"{name:<48}{before:>12.1f}{after:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Sign and verify throughput for each supported JWT algorithm, with the key
+passed as PEM text (parsed by PyJWT on every call) and as a pre-parsed
+key object (what the key ring does).
+
+Keys are generated in memory, no files are needed:
+    python -m benchmarks.jwt_algorithms
+"""
+
+from time import perf_counter
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import (
+    ec,
+    ed25519,
+    rsa,
+)
+from cryptography.hazmat.primitives.serialization import (
+    Encoding,
+    NoEncryption,
+    PrivateFormat,
+    PublicFormat,
+)
+
+ROUNDS = 500
+PAYLOAD = {"type": "access", "sub": "bench", "email": "bench@example.com", "scopes": ["read", "modify"]}
+
+KEY_FACTORIES = {
+    "RS256": lambda: rsa.generate_private_key(public_exponent=65537, key_size=2048),
+    "ES256": lambda: ec.generate_private_key(ec.SECP256R1()),
+    "EdDSA": ed25519.Ed25519PrivateKey.generate,
+}
+
+
+def ops_per_second(func, rounds: int = ROUNDS) -> float:
+    started = perf_counter()
+    for _ in range(rounds):
+        func()
+    return rounds / (perf_counter() - started)
+
+
+def main() -> None:
+    print(f"{'algorithm':<10}{'key':<8}{'sign/s':>12}{'verify/s':>12}")
+    for algorithm, factory in KEY_FACTORIES.items():
+        private_key = factory()
+        public_key = private_key.public_key()
+        keys = {
+            "pem": (
+                private_key.private_bytes(Encoding.PEM, PrivateFormat.PKCS8, NoEncryption()).decode(),
+                public_key.public_bytes(Encoding.PEM, PublicFormat.SubjectPublicKeyInfo).decode(),
+            ),
+            "parsed": (private_key, public_key),
+        }
+        for key_kind, (signing_key, verification_key) in keys.items():
+            token = jwt.encode(PAYLOAD, key=signing_key, algorithm=algorithm)
+            sign = ops_per_second(
+                lambda key=signing_key, alg=algorithm: jwt.encode(PAYLOAD, key=key, algorithm=alg),
+            )
+            verify = ops_per_second(
+                lambda token=token, key=verification_key, alg=algorithm: jwt.decode(token, key=key, algorithms=[alg]),
+            )
+            print(f"{algorithm:<10}{key_kind:<8}{sign:>12.0f}{verify:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
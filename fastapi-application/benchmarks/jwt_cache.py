@@ -0,0 +1,46 @@
+"""
+Per-request CPU cost of verifying an access token with and without
+the verified-token cache.
+
+Run from the fastapi-application directory (keys must exist, see `make keys`):
+    python -m benchmarks.jwt_cache
+"""
+
+from collections.abc import Callable
+from time import process_time
+from typing import Any
+
+from auth.http_pwd_bearer import (
+    TokenBearer,
+    verified_token_cache,
+)
+from auth.utils.auth_utils import (
+    decode_jwt,
+    encode_jwt,
+)
+
+ROUNDS = 2_000
+
+
+def cpu_per_call_us(func: Callable[[], Any], rounds: int = ROUNDS) -> float:
+    started = process_time()
+    for _ in range(rounds):
+        func()
+    return (process_time() - started) / rounds * 1_000_000
+
+
+def main() -> None:
+    token = encode_jwt(payload={"type": "access", "sub": "bench", "scopes": ["read"]})
+
+    uncached = cpu_per_call_us(lambda: decode_jwt(token=token))
+    verified_token_cache.clear()
+    TokenBearer.get_current_token_payload(token=token)
+    cached = cpu_per_call_us(lambda: TokenBearer.get_current_token_payload(token=token))
+
+    print(f"decode_jwt (signature check) : {uncached:9.1f} us CPU / request")
+    print(f"verified-token cache hit     : {cached:9.1f} us CPU / request")
+    print(f"CPU saved per request        : {uncached - cached:9.1f} us ({uncached / cached:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
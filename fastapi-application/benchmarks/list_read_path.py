@@ -0,0 +1,95 @@
+"""
+Per-row CPU time and peak memory of a 10k row list endpoint, loaded
+through the ORM (entities + as_dict() + Pydantic models) and through
+the Core read path (needed columns + pre-built TypeAdapter).
+
+The rows are inserted into the configured database inside a transaction
+that is rolled back at the end (roles must be seeded, see `make init_roles`):
+    python -m benchmarks.list_read_path
+"""
+
+import asyncio
+import tracemalloc
+from time import process_time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+)
+from uuid import uuid4
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    create_async_engine,
+)
+
+# core.models imports every model module, importing the api package before it is circular
+import core.models  # noqa: F401  # isort: skip
+from api.api_v1.cleanings.models import Cleaning
+from api.api_v1.cleanings.schemas import CleaningPublic
+from api.api_v1.users.models import User
+from core.config import settings
+from crud.cleanings import cleanings_crud
+
+ROWS = 10_000
+ROUNDS = 5
+
+
+async def measure(session: AsyncSession, load: Callable[[], Awaitable[list[Any]]]) -> tuple[float, float]:
+    await load()
+    cpu = 0.0
+    peak = 0
+    for _ in range(ROUNDS):
+        # timed without tracemalloc, its hook on every allocation would dominate the CPU time
+        session.expunge_all()
+        started = process_time()
+        items = await load()
+        cpu += process_time() - started
+        assert len(items) == ROWS
+
+        session.expunge_all()
+        tracemalloc.start()
+        items = await load()
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        del items
+
+    return cpu / ROUNDS / ROWS * 1_000_000, peak / ROWS
+
+
+async def main() -> None:
+    engine = create_async_engine(settings.db.postgres_connection_string)
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        owner = uuid4()
+        await connection.execute(insert(User).values(id=owner, email=f"{owner}@example.com", password=b"x"))
+        await connection.execute(
+            insert(Cleaning),
+            [
+                {"name": f"cleaning {i}", "description": "bench", "price": 10 + i % 100, "owner": owner}
+                for i in range(ROWS)
+            ],
+        )
+        session = AsyncSession(bind=connection, join_transaction_mode="create_savepoint")
+
+        async def orm_path() -> list[CleaningPublic]:
+            cleanings = await cleanings_crud.get_many_records(session=session, owner=owner, limit=ROWS)
+            return [CleaningPublic(**cleaning.as_dict()) for cleaning in cleanings]
+
+        async def core_path() -> list[CleaningPublic]:
+            return await cleanings_crud.read_many(session=session, schema=CleaningPublic, owner=owner, limit=ROWS)
+
+        print(f"{ROWS} rows, mean of {ROUNDS} rounds")
+        print(f"{'path':<8}{'CPU us/row':>12}{'peak bytes/row':>16}")
+        for name, load in (("orm", orm_path), ("core", core_path)):
+            cpu, memory = await measure(session=session, load=load)
+            print(f"{name:<8}{cpu:>12.2f}{memory:>16.0f}")
+
+        await session.close()
+        await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
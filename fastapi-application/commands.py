@@ -1,8 +1,18 @@
 from collections.abc import Awaitable
-from typing import Any
+from typing import (
+    Annotated,
+    Any,
+)
 
+import typer
 from async_typer import AsyncTyper
 
+from auth.utils.password_hasher import calibrate_rounds
+from core.config import settings
+from scripts.cleaner_stats import (
+    rebuild_cleaner_stats,
+    verify_cleaner_stats,
+)
 from scripts.init_roles_and_admin import (
     create_admin_and_editor,
     seed_roles_and_permissions,
@@ -23,5 +33,42 @@ async def seed() -> None:
     )
 
 
+@async_typer.command()  # type: ignore
+def calibrate_hashing(
+    target_seconds: float = settings.pwd_hashing.target_hash_seconds,
+    min_rounds: int = settings.pwd_hashing.min_rounds,
+    max_rounds: int = settings.pwd_hashing.max_rounds,
+) -> None:
+    """
+    Prints the bcrypt cost factor that meets the latency target on this machine.
+    """
+    rounds = calibrate_rounds(
+        target_seconds=target_seconds,
+        min_rounds=min_rounds,
+        max_rounds=max_rounds,
+    )
+    msg = typer.style(
+        f"Use bcrypt rounds={rounds}: APP_CONFIG__PWD_HASHING__ROUNDS={rounds}",
+        fg=typer.colors.GREEN,
+        bold=True,
+    )
+    typer.echo(message=msg, color=True)
+
+
+@async_typer.async_command()  # type: ignore
+async def rebuild_stats(
+    verify_only: Annotated[
+        bool,
+        typer.Option("--verify-only", help="Only compare, do not rewrite the table."),
+    ] = False,
+) -> None:
+    """
+    Recomputes cleaner_stats from the raw evaluations and verifies it.
+    """
+    correct = await verify_cleaner_stats() if verify_only else await rebuild_cleaner_stats()
+    if not correct:
+        raise typer.Exit(code=1)
+
+
 if __name__ == "__main__":
     async_typer()
@@ -1,13 +1,14 @@
-from multiprocessing import cpu_count
 from typing import Any
 
 from gunicorn.app.base import BaseApplication
 from fastapi import FastAPI
 
+from core.models.connection_budget import connection_plan
+
 
 def get_number_of_workers() -> int:
 
-    return (cpu_count() * 2) + 1
+    return connection_plan.workers
 
 
 class StandaloneApplication(BaseApplication):
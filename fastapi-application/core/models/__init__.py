@@ -6,11 +6,15 @@ __all__ = (
 from core.models.base import Base
 from core.models.db_helper import db_helper
 from api.api_v1.cleanings.models import Cleaning
-from api.api_v1.evaluations.models import CleanerEvaluation
+from api.api_v1.evaluations.models import (
+    CleanerEvaluation,
+    CleanerStats,
+)
 from api.api_v1.offers.models import UserOffer
 from api.api_v1.profiles.models import Profile
 from api.api_v1.users.models import (
     Permission,
+    RevokedToken,
     Role,
     User,
 )
@@ -24,6 +24,9 @@ class Base(AsyncAttrs, DeclarativeBase):
     metadata = MetaData(
         naming_convention=settings.db.naming_convention,
     )
+    # fetch server-generated values (id, created_at, updated_at, server defaults) with
+    # INSERT/UPDATE ... RETURNING during the flush, so no refresh is needed afterwards
+    __mapper_args__ = {"eager_defaults": True}
     id: Any
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -0,0 +1,152 @@
+"""
+This module derives the number of gunicorn workers and the size of
+their connection pools, to the primary and to the replicas, from one
+cluster-wide connection budget, and checks the result against the
+connection limits of the databases.
+"""
+
+import logging
+from dataclasses import dataclass
+from multiprocessing import cpu_count
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CONNECTION_LIMITS_QUERY = text(
+    "SELECT current_setting('max_connections')::int"
+    " - current_setting('superuser_reserved_connections')::int"
+    " - COALESCE(current_setting('reserved_connections', true), '0')::int,"
+    " (SELECT rolconnlimit FROM pg_roles WHERE rolname = current_user),"
+    " (SELECT datconnlimit FROM pg_database WHERE datname = current_database())"
+)
+
+
+class ConnectionBudgetError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class ConnectionPlan:
+    workers: int
+    pool_size: int
+    max_overflow: int
+
+    @property
+    def connections_per_worker(self) -> int:
+        return self.pool_size + self.max_overflow
+
+    @property
+    def total_connections(self) -> int:
+        return self.workers * self.connections_per_worker
+
+
+def plan_connections(
+    budget: int | None,
+    max_workers: int,
+    pool_size: int,
+    max_overflow: int,
+    min_connections_per_worker: int = 4,
+    overflow_share: float = 0.2,
+) -> ConnectionPlan:
+    """
+    Splits the connection budget between the workers.
+
+    The number of workers is capped so that every worker gets at least
+    min_connections_per_worker connections; overflow_share of a worker's
+    connections are overflow, the rest stay open in the pool.
+
+    Args:
+        budget (int | None): Connections all workers together may open,
+                             None keeps pool_size and max_overflow.
+        max_workers (int): The number of workers without a budget.
+    Returns:
+            ConnectionPlan: Workers and per-worker pool settings.
+    """
+    if budget is None:
+        return ConnectionPlan(workers=max_workers, pool_size=pool_size, max_overflow=max_overflow)
+    if budget < min_connections_per_worker:
+        raise ConnectionBudgetError(
+            f"connection budget {budget} is below min_connections_per_worker={min_connections_per_worker}"
+        )
+
+    workers = max(1, min(max_workers, budget // min_connections_per_worker))
+    per_worker = budget // workers
+    overflow = int(per_worker * overflow_share)
+
+    return ConnectionPlan(workers=workers, pool_size=per_worker - overflow, max_overflow=overflow)
+
+
+def get_connection_plan() -> ConnectionPlan:
+    return plan_connections(
+        budget=settings.db.connection_budget,
+        max_workers=settings.gunicorn.workers or cpu_count() * 2 + 1,
+        pool_size=settings.db.pool_size,
+        max_overflow=settings.db.max_overflow,
+        min_connections_per_worker=settings.db.min_connections_per_worker,
+        overflow_share=settings.db.overflow_share,
+    )
+
+
+def get_replica_connection_plan(workers: int) -> ConnectionPlan:
+    """
+    Pool settings of the replica engines: with a budget every replica gets
+    the same share of it as the primary, each replica being a server with
+    its own connection limit.
+    """
+    return plan_connections(
+        budget=settings.db.connection_budget,
+        max_workers=workers,
+        pool_size=settings.db.replica_pool_size,
+        max_overflow=settings.db.replica_max_overflow,
+        min_connections_per_worker=settings.db.min_connections_per_worker,
+        overflow_share=settings.db.overflow_share,
+    )
+
+
+async def get_connection_limit(url: str) -> int:
+    """
+    Returns the number of connections the configured user may open to
+    the database: max_connections minus the reserved slots, lowered by
+    the role and database CONNECTION LIMIT if they are set.
+    """
+    engine = create_async_engine(url=url, poolclass=NullPool)
+    try:
+        async with engine.connect() as connection:
+            server_limit, role_limit, database_limit = (await connection.execute(CONNECTION_LIMITS_QUERY)).one()
+    finally:
+        await engine.dispose()
+
+    return min(limit for limit in (server_limit, role_limit, database_limit) if limit is not None and limit >= 0)
+
+
+async def check_connection_plan(plan: ConnectionPlan, url: str) -> None:
+    """
+    Refuses a plan whose workers could open more connections than the
+    database accepts.
+
+    Raises:
+        ConnectionBudgetError: The plan exceeds the connection limit.
+    """
+    limit = await get_connection_limit(url=url)
+    if plan.total_connections > limit:
+        raise ConnectionBudgetError(
+            f"{plan.workers} workers x {plan.connections_per_worker} connections = {plan.total_connections}"
+            f" exceed the {limit} connections the database accepts, lower db.connection_budget"
+        )
+    logger.info(
+        "connection plan: %s workers x (pool_size=%s + max_overflow=%s) = %s of %s connections",
+        plan.workers,
+        plan.pool_size,
+        plan.max_overflow,
+        plan.total_connections,
+        limit,
+    )
+
+
+connection_plan = get_connection_plan()
+replica_connection_plan = get_replica_connection_plan(workers=connection_plan.workers)
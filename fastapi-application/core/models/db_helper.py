@@ -2,9 +2,24 @@
 This module contains a helper class for interacting with the database.
 """
 
-from typing import AsyncGenerator
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+from collections.abc import Sequence
+from itertools import count
+from time import time
+from typing import (
+    Any,
+    AsyncGenerator,
+)
+from uuid import uuid4
+from contextlib import (
+    asynccontextmanager,
+    suppress,
+)
 
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.pool import NullPool
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     create_async_engine,
@@ -13,9 +28,169 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from core.config import settings
+from core.models.connection_budget import (
+    connection_plan,
+    replica_connection_plan,
+)
+from core.models.pool import (
+    TimedQueuePool,
+    instrument_engine,
+)
+from core.models.query_deadline import (
+    DeadlineSession,
+    cancel_on_disconnect,
+    statement_timeout_connect_args,
+    translate_query_cancellations,
+)
+from core.models.query_stats import instrument_queries
+from core.models.unit_of_work import in_unit_of_work
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+# the time of a client's last write travels in a cookie set by ReadYourWritesMiddleware,
+# so whichever worker serves its next read knows to send it to the primary
+LAST_WRITE_STATE = "last_write"
+LAST_WRITE_COOKIE = "last_write"
+# the last replayed transaction gets older while the primary is idle, so a replica
+# that has replayed everything it received is not lagging, whatever its age
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+async def release_connection(session: AsyncSession) -> None:
+    """
+    Ends the current transaction of the session so that its connection
+    goes back to the pool before slow non-database work (bcrypt, SMTP).
+
+    Loaded objects stay usable because sessions are created with
+    expire_on_commit=False; the next query checks out a connection again.
+    Does nothing unless db.release_connections_early is enabled, or inside
+    a unit of work, whose transaction must stay open until it ends.
+    """
+    if settings.db.release_connections_early and session.in_transaction() and not in_unit_of_work(session):
+        await session.commit()
+
+
+def pgbouncer_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def build_engine(
+    url: str,
+    echo: bool,
+    echo_pool: bool,
+    pool_pre_ping: bool,
+    pool_size: int,
+    max_overflow: int,
+    pgbouncer: bool = False,
+    pgbouncer_pool_size: int = 0,
+    statement_timeout_seconds: float = 0.0,
+) -> AsyncEngine:
+    """
+    Creates an asyncpg engine, either with a local connection pool or,
+    in pgbouncer mode, for PgBouncer in transaction pooling mode.
+
+    Under transaction pooling two transactions of one client connection
+    may run on different server connections, so nothing may outlive a
+    transaction: prepared statements get a unique name and are not
+    cached, neither by asyncpg nor by SQLAlchemy, and no session-level
+    settings are sent on connect. PgBouncer does the pooling, so the
+    local pool keeps at most pgbouncer_pool_size idle connections and
+    opens a new one for every checkout if it is 0.
+    Outside pgbouncer mode statement_timeout_seconds becomes the default
+    statement_timeout of every connection.
+
+    Args:
+        url (str): Database URL.
+        pgbouncer (bool): Configure the engine for PgBouncer.
+        pgbouncer_pool_size (int): Local pool size in pgbouncer mode.
+        statement_timeout_seconds (float): Default statement timeout, 0 disables it.
+    Returns:
+            AsyncEngine: The engine.
+    """
+    options: dict[str, Any] = {
+        "url": url,
+        "echo": echo,
+        "echo_pool": echo_pool,
+    }
+    if not pgbouncer:
+        if statement_timeout_seconds > 0:
+            options["connect_args"] = statement_timeout_connect_args(url=url, timeout=statement_timeout_seconds)
+        return create_async_engine(
+            **options,
+            pool_pre_ping=pool_pre_ping,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            poolclass=TimedQueuePool,
+        )
+
+    options["connect_args"] = {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": pgbouncer_statement_name,
+    }
+    if pgbouncer_pool_size <= 0:
+        return create_async_engine(**options, poolclass=NullPool)
+
+    return create_async_engine(
+        **options,
+        pool_pre_ping=pool_pre_ping,
+        pool_size=pgbouncer_pool_size,
+        max_overflow=0,
+        poolclass=TimedQueuePool,
+    )
+
+
+def build_session_factory(
+    engine: AsyncEngine,
+    statement_timeout_seconds: float,
+    pgbouncer: bool = False,
+) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind=engine,
+        sync_session_class=DeadlineSession,
+        autoflush=False,
+        autocommit=False,
+        expire_on_commit=False,
+        info={
+            "statement_timeout": statement_timeout_seconds,
+            # see build_engine, in pgbouncer mode every transaction sets the timeout itself
+            "connection_statement_timeout": 0.0 if pgbouncer else statement_timeout_seconds,
+        },
+    )
+
+
+class Replica:
+    def __init__(self, engine: AsyncEngine, statement_timeout_seconds: float = 0.0, pgbouncer: bool = False) -> None:
+        self.engine = engine
+        self.session_factory: async_sessionmaker[AsyncSession] = build_session_factory(
+            engine=engine,
+            statement_timeout_seconds=statement_timeout_seconds,
+            pgbouncer=pgbouncer,
+        )
+        self.healthy: bool = True
 
 
 class DataBaseHelper:
+    """
+    Manages the primary engine and optional read replica engines.
+
+    Write and auth queries always go to the primary. Read-only handlers
+    can depend on read_session_getter, which picks a healthy replica in
+    round-robin order, or the primary if there is none, or if the client
+    wrote less than read_your_writes_seconds ago (read-your-writes). A write
+    is remembered by the client, in the LAST_WRITE_COOKIE cookie, not by the
+    worker, so the read is routed right whichever worker serves it.
+    Sessions of both getters are bound to the request: their statements
+    get its statement timeout and, with cancel_on_disconnect, are
+    cancelled if its client disconnects.
+    With pgbouncer enabled all engines are configured for PgBouncer in
+    transaction pooling mode, see build_engine.
+    """
 
     def __init__(
         self,
@@ -25,35 +200,169 @@ class DataBaseHelper:
         pool_pre_ping: bool,
         pool_size: int,
         max_overflow: int,
+        replica_urls: Sequence[str] = (),
+        replica_pool_size: int = 20,
+        replica_max_overflow: int = 10,
+        replica_max_lag_seconds: float = 10.0,
+        replica_health_check_interval: float = 10.0,
+        read_your_writes_seconds: float = 5.0,
+        pgbouncer: bool = False,
+        pgbouncer_pool_size: int = 0,
+        statement_timeout_seconds: float = 0.0,
+        cancel_on_disconnect: bool = False,
+        disconnect_poll_interval: float = 0.5,
     ) -> None:
-        self.engine: AsyncEngine = create_async_engine(
+        self.engine: AsyncEngine = build_engine(
             url=url,
             echo=echo,
             echo_pool=echo_pool,
             pool_pre_ping=pool_pre_ping,
             pool_size=pool_size,
             max_overflow=max_overflow,
+            pgbouncer=pgbouncer,
+            pgbouncer_pool_size=pgbouncer_pool_size,
+            statement_timeout_seconds=statement_timeout_seconds,
         )
-        self.session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
-            bind=self.engine,
-            autoflush=False,
-            autocommit=False,
-            expire_on_commit=False,
+        self.session_factory: async_sessionmaker[AsyncSession] = build_session_factory(
+            engine=self.engine,
+            statement_timeout_seconds=statement_timeout_seconds,
+            pgbouncer=pgbouncer,
         )
+        self.replicas: list[Replica] = [
+            Replica(
+                engine=build_engine(
+                    url=replica_url,
+                    echo=echo,
+                    echo_pool=echo_pool,
+                    pool_pre_ping=pool_pre_ping,
+                    pool_size=replica_pool_size,
+                    max_overflow=replica_max_overflow,
+                    pgbouncer=pgbouncer,
+                    pgbouncer_pool_size=pgbouncer_pool_size,
+                    statement_timeout_seconds=statement_timeout_seconds,
+                ),
+                statement_timeout_seconds=statement_timeout_seconds,
+                pgbouncer=pgbouncer,
+            )
+            for replica_url in replica_urls
+        ]
+        instrument_engine(engine=self.engine, name="primary")
+        instrument_queries(engine=self.engine)
+        translate_query_cancellations(engine=self.engine)
+        for number, replica in enumerate(self.replicas):
+            instrument_engine(engine=replica.engine, name=f"replica-{number}")
+            instrument_queries(engine=replica.engine)
+            translate_query_cancellations(engine=replica.engine)
+        self._replica_counter = count()
+        self._replica_max_lag_seconds = replica_max_lag_seconds
+        self._replica_health_check_interval = replica_health_check_interval
+        self._read_your_writes_seconds = read_your_writes_seconds
+        self._health_check_task: asyncio.Task[None] | None = None
+        self._cancel_on_disconnect = cancel_on_disconnect
+        self._disconnect_poll_interval = disconnect_poll_interval
 
     async def dispose(self) -> None:
         """
-        Finalising the asynchronous engine.
+        Finalising the asynchronous engines.
         """
+        if self._health_check_task is not None:
+            self._health_check_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._health_check_task
+            self._health_check_task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
         await self.engine.dispose()
 
-    async def session_getter(self) -> AsyncGenerator[AsyncSession, None]:
+    def _mark_writer(self, request: Request) -> None:
+        if self._read_your_writes_seconds > 0 and request.method not in SAFE_METHODS:
+            setattr(request.state, LAST_WRITE_STATE, time())
+
+    def _wrote_recently(self, request: Request) -> bool:
+        try:
+            last_write = float(request.cookies.get(LAST_WRITE_COOKIE, "nan"))
+        except ValueError:
+            return False
+
+        # the clocks of the workers that wrote and that reads may differ slightly
+        return abs(time() - last_write) < self._read_your_writes_seconds
+
+    def get_read_session_factory(self, request: Request | None = None) -> async_sessionmaker[AsyncSession]:
+        """
+        Picks the session factory for a read-only request.
+        """
+        if request is not None and self._wrote_recently(request=request):
+            return self.session_factory
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return self.session_factory
+
+        return healthy[next(self._replica_counter) % len(healthy)].session_factory
+
+    async def check_replicas(self) -> None:
+        """
+        Marks replicas that are unreachable or lag behind the primary as unhealthy.
+        """
+        for replica in self.replicas:
+            try:
+                async with replica.engine.connect() as connection:
+                    lag = await connection.scalar(REPLICA_LAG_QUERY)
+                healthy = float(lag or 0) <= self._replica_max_lag_seconds
+            except Exception:
+                logger.warning("replica %s is unreachable", replica.engine.url.host, exc_info=True)
+                healthy = False
+            if healthy != replica.healthy:
+                logger.warning("replica %s healthy=%s", replica.engine.url.host, healthy)
+            replica.healthy = healthy
+
+    async def _run_health_checks(self) -> None:
+        while True:
+            await self.check_replicas()
+            await asyncio.sleep(self._replica_health_check_interval)
+
+    def start_health_checks(self) -> None:
+        if self.replicas and self._health_check_task is None:
+            self._health_check_task = asyncio.create_task(
+                self._run_health_checks(),
+                name="replica-health-checks",
+            )
+
+    async def session_getter(self, request: Request) -> AsyncGenerator[AsyncSession, None]:
         """
         Use as a dependency for fastapi to get a session.
         """
-        async with self.session_factory() as session:
+        self._mark_writer(request=request)
+        async with self._request_session(
+            session_factory=self.session_factory,
+            request=request,
+        ) as session:
+            yield session
+
+    async def read_session_getter(self, request: Request) -> AsyncGenerator[AsyncSession, None]:
+        """
+        Use as a dependency for read-only fastapi handlers to get a
+        session bound to a read replica.
+        """
+        async with self._request_session(
+            session_factory=self.get_read_session_factory(request=request),
+            request=request,
+        ) as session:
             yield session
 
+    @asynccontextmanager
+    async def _request_session(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        request: Request,
+    ) -> AsyncGenerator[AsyncSession, None]:
+        async with session_factory() as session:
+            session.info["request"] = request
+            if not self._cancel_on_disconnect:
+                yield session
+                return
+            async with cancel_on_disconnect(request=request, poll_interval=self._disconnect_poll_interval):
+                yield session
+
     @asynccontextmanager
     async def get_ctx_async_session(self) -> AsyncGenerator[AsyncSession, None]:
         """
@@ -69,6 +378,17 @@ db_helper = DataBaseHelper(
     echo=settings.db.echo,
     echo_pool=settings.db.echo_pool,
     pool_pre_ping=settings.db.pool_pre_ping,
-    pool_size=settings.db.pool_size,
-    max_overflow=settings.db.max_overflow,
+    pool_size=connection_plan.pool_size,
+    max_overflow=connection_plan.max_overflow,
+    replica_urls=settings.db.replica_urls,
+    replica_pool_size=replica_connection_plan.pool_size,
+    replica_max_overflow=replica_connection_plan.max_overflow,
+    replica_max_lag_seconds=settings.db.replica_max_lag_seconds,
+    replica_health_check_interval=settings.db.replica_health_check_interval,
+    read_your_writes_seconds=settings.db.read_your_writes_seconds,
+    pgbouncer=settings.db.pgbouncer,
+    pgbouncer_pool_size=settings.db.pgbouncer_pool_size,
+    statement_timeout_seconds=settings.db.statement_timeout_seconds,
+    cancel_on_disconnect=settings.db.cancel_on_disconnect,
+    disconnect_poll_interval=settings.db.disconnect_poll_interval,
 )
@@ -0,0 +1,176 @@
+"""
+This module contains the connection pool used by the database helper,
+which records how long requests wait for a connection, and the pool
+event listeners that feed the pool metrics.
+
+All pool metrics are labelled with the engine name and the pid of the
+gunicorn worker, since every worker has its own pools.
+"""
+
+import os
+from time import (
+    monotonic,
+    perf_counter,
+)
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import (
+    Engine,
+    ExceptionContext,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+)
+
+from utils.metrics import metrics_registry
+
+CONNECTION_AGE_BUCKETS: tuple[float, ...] = (1.0, 10.0, 60.0, 300.0, 900.0, 1800.0, 3600.0, 7200.0, 86400.0)
+
+POOL_CHECKOUT_WAIT = metrics_registry.histogram(
+    name="db_pool_checkout_wait_seconds",
+    description="Time spent waiting for a connection from the pool",
+)
+POOL_SIZE = metrics_registry.gauge(
+    name="db_pool_size",
+    description="Configured number of connections kept by the pool",
+)
+POOL_CHECKED_OUT = metrics_registry.gauge(
+    name="db_pool_checked_out",
+    description="Connections currently checked out of the pool",
+)
+POOL_OVERFLOW = metrics_registry.gauge(
+    name="db_pool_overflow",
+    description="Connections open above pool_size (negative while the pool is not full)",
+)
+POOL_CONNECTIONS_OPENED = metrics_registry.counter(
+    name="db_pool_connections_opened_total",
+    description="New database connections opened by the pool",
+)
+POOL_CONNECTION_AGE = metrics_registry.histogram(
+    name="db_pool_connection_age_seconds",
+    description="Age of a connection when it is checked out",
+    buckets=CONNECTION_AGE_BUCKETS,
+)
+POOL_INVALIDATED = metrics_registry.counter(
+    name="db_pool_invalidated_total",
+    description="Connections invalidated, e.g. after a disconnect",
+)
+POOL_PRE_PING_FAILURES = metrics_registry.counter(
+    name="db_pool_pre_ping_failures_total",
+    description="Pooled connections found dead by pre-ping on checkout",
+)
+
+
+class PoolWaitTracker:
+    """
+    Exponentially weighted moving average of the pool checkout wait,
+    used as a cheap overload signal by the load shedding middleware.
+
+    The average decays towards zero while there are no checkouts, so
+    shedding every request cannot keep the signal high forever.
+    """
+
+    def __init__(self, alpha: float = 0.2, half_life: float = 1.0) -> None:
+        self._alpha = alpha
+        self._half_life = half_life
+        self._average: float = 0.0
+        self._updated_at: float = monotonic()
+
+    @property
+    def average(self) -> float:
+        # float ** float is typed as Any, the base is positive so the result is a float
+        decay: float = 0.5 ** ((monotonic() - self._updated_at) / self._half_life)
+
+        return self._average * decay
+
+    def observe(self, wait: float) -> None:
+        average = self.average
+        self._average = average + self._alpha * (wait - average)
+        self._updated_at = monotonic()
+
+
+pool_wait_tracker = PoolWaitTracker()
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that times every checkout and updates the pool
+    gauges once a connection has left or re-entered the pool; the checkout
+    and checkin events fire too early for that.
+    """
+
+    metrics_name: str = "default"
+
+    def recreate(self) -> "TimedQueuePool":
+        pool = super().recreate()
+        # QueuePool.recreate() builds the new pool from self.__class__
+        if not isinstance(pool, TimedQueuePool):
+            raise TypeError(f"{type(self).__name__}.recreate() returned a {type(pool).__name__}")
+        pool.metrics_name = self.metrics_name
+
+        return pool
+
+    def update_gauges(self) -> None:
+        labels = pool_labels(self.metrics_name)
+        POOL_CHECKED_OUT.set(self.checkedout(), **labels)
+        POOL_OVERFLOW.set(self.overflow(), **labels)
+
+    def _do_get(self):  # type: ignore[no-untyped-def]
+        started_at = perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            wait = perf_counter() - started_at
+            POOL_CHECKOUT_WAIT.observe(wait, **pool_labels(self.metrics_name))
+            pool_wait_tracker.observe(wait)
+            self.update_gauges()
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        super()._do_return_conn(record)
+        self.update_gauges()
+
+
+def pool_labels(name: str) -> dict[str, Any]:
+    return {"engine": name, "worker": os.getpid()}
+
+
+def _track_connection_age(sync_engine: Engine, name: str) -> None:
+    @event.listens_for(sync_engine, "connect")
+    def on_connect(_dbapi_connection: Any, connection_record: ConnectionPoolEntry) -> None:
+        connection_record.info["connected_at"] = monotonic()
+        POOL_CONNECTIONS_OPENED.inc(**pool_labels(name))
+
+    @event.listens_for(sync_engine, "checkout")
+    def on_checkout(_dbapi_connection: Any, connection_record: ConnectionPoolEntry, _connection_proxy: Any) -> None:
+        if (connected_at := connection_record.info.get("connected_at")) is not None:
+            POOL_CONNECTION_AGE.observe(monotonic() - connected_at, **pool_labels(name))
+
+
+def _count_failures(sync_engine: Engine, name: str) -> None:
+    @event.listens_for(sync_engine, "invalidate")
+    def on_invalidate(_dbapi_connection: Any, _connection_record: ConnectionPoolEntry, _exception: Any) -> None:
+        POOL_INVALIDATED.inc(**pool_labels(name))
+
+    @event.listens_for(sync_engine, "handle_error")
+    def on_error(context: ExceptionContext) -> None:
+        if context.is_pre_ping:
+            POOL_PRE_PING_FAILURES.inc(**pool_labels(name))
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """
+    Attaches the pool event listeners that feed the pool metrics.
+
+    Args:
+        engine (AsyncEngine): The engine to instrument.
+        name (str): Value of the engine label, e.g. "primary".
+    """
+    sync_engine = engine.sync_engine
+    if isinstance(sync_engine.pool, TimedQueuePool):
+        sync_engine.pool.metrics_name = name
+        POOL_SIZE.set(sync_engine.pool.size(), **pool_labels(name))
+    _track_connection_age(sync_engine=sync_engine, name=name)
+    _count_failures(sync_engine=sync_engine, name=name)
@@ -0,0 +1,158 @@
+"""
+This module contains the query time budgets of the database sessions:
+a server-side statement_timeout, set once per connection and overridden
+per transaction for the routes that need another one, and cancellation
+of a request's queries when its client disconnects.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncGenerator,
+)
+
+from fastapi import Request
+from sqlalchemy import (
+    event,
+    text,
+)
+from sqlalchemy.engine import (
+    Connection,
+    ExceptionContext,
+    make_url,
+)
+from sqlalchemy.exc import (
+    DBAPIError,
+    OperationalError,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import (
+    Session,
+    SessionTransaction,
+)
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# transaction-scoped, so the default of the connection applies again after the transaction
+SET_STATEMENT_TIMEOUT = text("SELECT set_config('statement_timeout', :timeout, true)")
+QUERY_CANCELED_SQLSTATE = "57014"
+
+
+class StatementTimeoutError(OperationalError):
+    """
+    Raised instead of the DBAPIError of a statement cancelled by the server,
+    e.g. by its statement_timeout.
+    """
+
+
+class DeadlineSession(Session):
+    """
+    Session that limits every statement of its transactions to the
+    statement timeout of the request it serves.
+
+    The timeout comes from, in order: the StatementTimeout dependency of
+    the route, db.route_statement_timeouts for the route name, and the
+    session's default (info["statement_timeout"]). 0 disables it.
+    The default is already set on the connections of the engine, unless
+    info["connection_statement_timeout"] differs from it (pgbouncer mode),
+    so a transaction only costs an extra statement for routes with their
+    own timeout.
+    """
+
+
+def statement_timeout_connect_args(url: str, timeout: float) -> dict[str, Any]:
+    """
+    Returns the connect_args that make statement_timeout the default of
+    every new connection, sent with the startup packet at no extra cost.
+    """
+    milliseconds = str(int(timeout * 1000))
+    if make_url(url).get_driver_name() == "asyncpg":
+        return {"server_settings": {"statement_timeout": milliseconds}}
+
+    return {"options": f"-c statement_timeout={milliseconds}"}
+
+
+def get_statement_timeout(session: Session) -> float:
+    timeout: float = session.info.get("statement_timeout", 0.0)
+    if (request := session.info.get("request")) is None:
+        return timeout
+    if (route := request.scope.get("route")) is not None:
+        timeout = settings.db.route_statement_timeouts.get(route.name, timeout)
+
+    return getattr(request.state, "statement_timeout", timeout)
+
+
+@event.listens_for(DeadlineSession, "after_begin")
+def set_statement_timeout(session: Session, _transaction: SessionTransaction, connection: Connection) -> None:
+    timeout = get_statement_timeout(session)
+    if timeout != session.info.get("connection_statement_timeout", 0.0):
+        connection.execute(SET_STATEMENT_TIMEOUT, {"timeout": f"{int(timeout * 1000)}ms"})
+
+
+class StatementTimeout:
+    """
+    Route dependency that overrides the statement timeout of the sessions
+    used by the route, e.g. dependencies=[Depends(StatementTimeout(30))].
+    """
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+
+    async def __call__(self, request: Request) -> None:
+        request.state.statement_timeout = self.seconds
+
+
+def is_query_canceled(exc: BaseException) -> bool:
+    orig = getattr(exc, "orig", None)
+
+    return QUERY_CANCELED_SQLSTATE in (getattr(orig, "sqlstate", None), getattr(orig, "pgcode", None))
+
+
+def translate_query_cancellations(engine: AsyncEngine) -> None:
+    """
+    Makes the engine raise StatementTimeoutError for cancelled statements,
+    so that they can get their own exception handler.
+    """
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def on_error(context: ExceptionContext) -> StatementTimeoutError | None:
+        exc = context.sqlalchemy_exception
+        if not isinstance(exc, DBAPIError) or not is_query_canceled(exc):
+            return None
+
+        return StatementTimeoutError(
+            statement=exc.statement,
+            params=exc.params,
+            orig=exc.orig,  # type: ignore[arg-type]
+            connection_invalidated=exc.connection_invalidated,
+        )
+
+
+@asynccontextmanager
+async def cancel_on_disconnect(request: Request, poll_interval: float) -> AsyncGenerator[None, None]:
+    """
+    Cancels the current task, and with it the running query, as soon as
+    the client of the request disconnects.
+
+    The task is cancelled wherever it is, possibly during a commit, whose
+    outcome the handler then never learns; hence db.cancel_on_disconnect
+    is off by default.
+    """
+    task = asyncio.current_task()
+
+    async def watch() -> None:
+        while not await request.is_disconnected():
+            await asyncio.sleep(poll_interval)
+        logger.info("client disconnected, cancelling %s %s", request.method, request.url.path)
+        if task is not None:
+            task.cancel()
+
+    watcher = asyncio.create_task(watch(), name="disconnect-watcher")
+    try:
+        yield
+    finally:
+        watcher.cancel()
@@ -0,0 +1,57 @@
+"""
+This module counts the SQL statements of the current request and the
+time spent executing them.
+
+The engine hooks add to the QueryStats of the current context; the
+QueryStatsMiddleware creates one per request.
+"""
+
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import (
+    Connection,
+    ExceptionContext,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    duration: float = 0.0
+
+
+current_query_stats: ContextVar[QueryStats | None] = ContextVar("current_query_stats", default=None)
+
+
+def _finish_query(connection: Connection) -> None:
+    if not (started := connection.info.get("query_started_at")):
+        return
+    duration = perf_counter() - started.pop()
+    if (stats := current_query_stats.get()) is not None:
+        stats.count += 1
+        stats.duration += duration
+
+
+def instrument_queries(engine: AsyncEngine) -> None:
+    """
+    Attaches the cursor execution hooks that feed current_query_stats.
+    """
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(connection: Connection, *_args: Any) -> None:
+        connection.info.setdefault("query_started_at", []).append(perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(connection: Connection, *_args: Any) -> None:
+        _finish_query(connection=connection)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def on_error(context: ExceptionContext) -> None:
+        # a failed statement has an execution context, errors on connect or compile do not
+        if context.connection is not None and context.execution_context is not None:
+            _finish_query(connection=context.connection)
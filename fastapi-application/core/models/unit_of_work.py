@@ -0,0 +1,72 @@
+"""
+This module contains the unit of work that groups several CRUD writes
+into one transaction.
+
+CRUD methods end their writes with commit() instead of session.commit():
+outside a unit of work it commits as before, inside one it only flushes,
+so the changes are sent to the database but committed once, at the end
+of the unit, or rolled back together. Side effects that must only happen
+after the data is committed (cache invalidation, the in-memory token
+denylist) are registered with on_commit().
+"""
+
+from collections.abc import (
+    AsyncIterator,
+    Callable,
+)
+from contextlib import asynccontextmanager
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+UNIT_OF_WORK_DEPTH = "unit_of_work_depth"
+ON_COMMIT_CALLBACKS = "on_commit_callbacks"
+
+
+def in_unit_of_work(session: AsyncSession) -> bool:
+    return session.info.get(UNIT_OF_WORK_DEPTH, 0) > 0
+
+
+async def commit(session: AsyncSession) -> None:
+    """
+    Commits the session, or only flushes it inside a unit of work.
+    """
+    if in_unit_of_work(session):
+        await session.flush()
+    else:
+        await session.commit()
+
+
+def on_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """
+    Runs the callback once the changes are committed: at the end of the
+    current unit of work, or right away outside of one.
+    """
+    if in_unit_of_work(session):
+        session.info.setdefault(ON_COMMIT_CALLBACKS, []).append(callback)
+    else:
+        callback()
+
+
+@asynccontextmanager
+async def unit_of_work(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """
+    Commits every CRUD write made inside the block in one transaction,
+    or rolls them all back if the block raises. Nested units join the
+    outermost one.
+    """
+    depth = session.info.get(UNIT_OF_WORK_DEPTH, 0)
+    session.info[UNIT_OF_WORK_DEPTH] = depth + 1
+    try:
+        yield session
+    except BaseException:
+        if depth == 0:
+            session.info.pop(ON_COMMIT_CALLBACKS, None)
+            await session.rollback()
+        raise
+    else:
+        if depth == 0:
+            await session.commit()
+            for callback in session.info.pop(ON_COMMIT_CALLBACKS, []):
+                callback()
+    finally:
+        session.info[UNIT_OF_WORK_DEPTH] = depth
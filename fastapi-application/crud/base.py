@@ -2,7 +2,10 @@
 This module contains the base interface for CRUD operations.
 """
 
+from functools import cache
+from itertools import batched
 from typing import (
+    Any,
     TypeVar,
     Generic,
     Sequence,
@@ -10,19 +13,45 @@ from typing import (
 import logging
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import (
+    BaseModel,
+    TypeAdapter,
+)
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import (
+    Integer,
+    Select,
+    bindparam,
+    delete,
+    select,
+    update,
+)
 
+from core.config import settings
 from core.models import Base
+from core.models.db_helper import release_connection
+from core.models.unit_of_work import commit
 
 
 ORMModelType = TypeVar("ORMModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
+ReadSchemaType = TypeVar("ReadSchemaType", bound=BaseModel)
 
 logger = logging.getLogger(__name__)
 
+FilterKeys = tuple[str, ...]
+
+
+@cache
+def get_rows_adapter(schema: type[ReadSchemaType]) -> TypeAdapter[list[ReadSchemaType]]:
+    """
+    Returns the pre-built TypeAdapter that validates a list of rows
+    into a list of the given schema.
+    """
+    return TypeAdapter(list[schema])  # type: ignore[valid-type]
+
 
 class CRUDRepository(Generic[ORMModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: type[ORMModelType]) -> None:
@@ -33,6 +62,55 @@ class CRUDRepository(Generic[ORMModelType, CreateSchemaType, UpdateSchemaType]):
         """
         self._model: type[ORMModelType] = model
         self._name: str = model.__name__
+        # hot-path statements, built once per set of filter_by keys and reused with new
+        # parameters, so SQLAlchemy neither rebuilds them nor recomputes their cache key
+        self._statements: dict[tuple[str, FilterKeys], Select[Any]] = {}
+        self._row_statements: dict[tuple[type[BaseModel], FilterKeys], Select[Any]] = {}
+
+    def _get_statement(self, kind: str, keys: FilterKeys) -> Select[Any]:
+        """
+        Returns the cached statement of the given kind filtered by
+        equality on the given attributes, building it on first use.
+        Args:
+            kind (str): "by_id", "one" or "many" (with offset and limit).
+            keys (FilterKeys): Sorted names of the filter_by attributes.
+
+        Returns:
+                The statement with one bound parameter per key.
+        """
+        if (stmt := self._statements.get((kind, keys))) is None:
+            stmt = select(self._model).where(
+                *(getattr(self._model, key) == bindparam(f"filter_{key}") for key in keys)
+            )
+            if kind == "many":
+                stmt = stmt.offset(bindparam("offset_", type_=Integer)).limit(
+                    bindparam("limit_", type_=Integer)
+                )
+            self._statements[(kind, keys)] = stmt
+
+        return stmt
+
+    def _get_rows_statement(self, schema: type[BaseModel], keys: FilterKeys) -> Select[Any]:
+        """
+        Returns the cached Core statement that selects only the table
+        columns the schema has a field for.
+        """
+        if (stmt := self._row_statements.get((schema, keys))) is None:
+            table = self._model.__table__
+            stmt = (
+                select(*(column for column in table.c if column.key in schema.model_fields))
+                .where(*(table.c[key] == bindparam(f"filter_{key}") for key in keys))
+                .offset(bindparam("offset_", type_=Integer))
+                .limit(bindparam("limit_", type_=Integer))
+            )
+            self._row_statements[(schema, keys)] = stmt
+
+        return stmt
+
+    @staticmethod
+    def _can_use_cached_statement(args: tuple[Any, ...], kwargs: dict[str, Any]) -> bool:
+        # filter_by(x=None) renders "x IS NULL", a bound parameter would compare with NULL
+        return not args and None not in kwargs.values()
 
     async def get_one_by_id(
         self,
@@ -50,7 +128,8 @@ class CRUDRepository(Generic[ORMModelType, CreateSchemaType, UpdateSchemaType]):
         """
         logger.debug("getting %s by id=%s", self._name, obj_id)
         result = await session.execute(
-            select(self._model).filter(self._model.id == obj_id)
+            self._get_statement(kind="by_id", keys=("id",)),
+            {"filter_id": obj_id},
         )
 
         return result.scalar_one_or_none()
@@ -81,6 +160,7 @@ class CRUDRepository(Generic[ORMModelType, CreateSchemaType, UpdateSchemaType]):
     ) -> ORMModelType:
         """
         Creates a new ORMModel instance and adds it to the session.
+        Server-generated values are returned by the INSERT itself.
         Args:
             session: The database session.
             obj_in: The input data for creating the ORMModel instance.
@@ -92,8 +172,43 @@ class CRUDRepository(Generic[ORMModelType, CreateSchemaType, UpdateSchemaType]):
         obj_in_data = obj_in.model_dump(exclude_unset=True, exclude_none=True)
         db_obj: ORMModelType = self._model(**obj_in_data)
         session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
+        await commit(session)
+        await release_connection(session)
+
+        return db_obj
+
+    async def create_record_if_absent(
+        self,
+        session: AsyncSession,
+        obj_in: CreateSchemaType,
+        conflict_keys: FilterKeys,
+    ) -> ORMModelType | None:
+        """
+        Creates a new record unless one with the same unique keys exists.
+        The check and the insert are a single atomic
+        INSERT ... ON CONFLICT DO NOTHING RETURNING statement.
+        Args:
+            session: The database session.
+            obj_in: The input data for creating the ORMModel instance.
+            conflict_keys: The columns of the unique constraint or index
+            that identify a duplicate.
+
+        Returns:
+                The newly created ORMModel instance, or None if it already exists.
+        """
+        logger.debug(
+            "creating %s if absent by %s with obj_in=%s", self._name, conflict_keys, obj_in
+        )
+        obj_in_data = obj_in.model_dump(exclude_unset=True, exclude_none=True)
+        result = await session.execute(
+            insert(self._model)
+            .values(**obj_in_data)
+            .on_conflict_do_nothing(index_elements=conflict_keys)
+            .returning(self._model)
+        )
+        db_obj: ORMModelType | None = result.scalars().first()
+        await commit(session)
+        await release_connection(session)
 
         return db_obj
 
@@ -105,6 +220,7 @@ class CRUDRepository(Generic[ORMModelType, CreateSchemaType, UpdateSchemaType]):
     ) -> ORMModelType:
         """
         Updates the given ORMModel object using the provided session and input data.
+        Server-generated values are returned by the UPDATE itself.
         Args:
             session: The database session.
             db_obj: The database object to be updated.
@@ -120,11 +236,103 @@ class CRUDRepository(Generic[ORMModelType, CreateSchemaType, UpdateSchemaType]):
         for field, value in to_update.items():
             setattr(db_obj, field, value)
         session.add(db_obj)
-        await session.commit()
-        await session.refresh(db_obj)
+        await commit(session)
+        await release_connection(session)
 
         return db_obj
 
+    async def create_many(
+        self,
+        session: AsyncSession,
+        objs_in: Sequence[CreateSchemaType],
+        chunk_size: int | None = None,
+    ) -> list[ORMModelType]:
+        """
+        Creates many records with multi-row INSERT ... RETURNING statements
+        of up to chunk_size rows each, committed in a single transaction.
+        Args:
+            session: The database session.
+            objs_in: The input data for creating the ORMModel instances.
+            chunk_size: Rows per statement. Defaults to settings.db.bulk_chunk_size.
+
+        Returns:
+                The newly created ORMModel instances in the order of objs_in.
+        """
+        logger.debug("creating %s %s", len(objs_in), self._name)
+        db_objs: list[ORMModelType] = []
+        for chunk in batched(objs_in, chunk_size or settings.db.bulk_chunk_size):
+            result = await session.scalars(
+                insert(self._model).returning(self._model, sort_by_parameter_order=True),
+                [obj_in.model_dump(exclude_unset=True, exclude_none=True) for obj_in in chunk],
+            )
+            db_objs.extend(result.all())
+        await commit(session)
+        await release_connection(session)
+
+        return db_objs
+
+    async def update_many(
+        self,
+        session: AsyncSession,
+        obj_in: UpdateSchemaType,
+        *args,
+        **kwargs,
+    ) -> Sequence[ORMModelType]:
+        """
+        Applies the same input data to every record matching the filters
+        with one UPDATE ... RETURNING statement.
+        Args:
+            session: The database session.
+            obj_in: The input data for the update.
+            *args: Variable arguments for filtering. For example filter(User.id.in_(ids))
+            **kwargs: Keyword arguments used for filter_by. For example filter_by(name='John')
+
+        Returns:
+                Sequence of the updated records.
+        """
+        logger.debug(
+            "updating %s with args=%s, kwargs=%s, obj_in=%s", self._name, args, kwargs, obj_in
+        )
+        result = await session.scalars(
+            update(self._model)
+            .filter(*args)
+            .filter_by(**kwargs)
+            .values(**obj_in.model_dump(exclude_unset=True, exclude_none=True))
+            .returning(self._model)
+        )
+        db_objs = result.all()
+        await commit(session)
+        await release_connection(session)
+
+        return db_objs
+
+    async def delete_many(
+        self,
+        session: AsyncSession,
+        *args,
+        **kwargs,
+    ) -> Sequence[ORMModelType]:
+        """
+        Deletes every record matching the filters with one
+        DELETE ... RETURNING statement.
+        Args:
+            session: The database session.
+            *args: Variable arguments for filtering. For example filter(User.id.in_(ids))
+            **kwargs: Keyword arguments used for filter_by. For example filter_by(name='John')
+
+        Returns:
+                Sequence of the deleted records.
+        """
+        logger.debug("deleting %s with args=%s, kwargs=%s", self._name, args, kwargs)
+        result = await session.scalars(
+            delete(self._model).filter(*args).filter_by(**kwargs).returning(self._model)
+        )
+        db_objs = result.all()
+        await commit(session)
+        await release_connection(session)
+
+        return db_objs
+
     async def delete_record(
         self,
         session: AsyncSession,
@@ -141,7 +349,7 @@ class CRUDRepository(Generic[ORMModelType, CreateSchemaType, UpdateSchemaType]):
         """
         logger.debug("deleting %s db_object=%s", self._name, db_obj)
         await session.delete(db_obj)
-        await session.commit()
+        await commit(session)
 
         return db_obj
 
@@ -163,9 +371,15 @@ class CRUDRepository(Generic[ORMModelType, CreateSchemaType, UpdateSchemaType]):
                 The retrieved record, or None if not found.
         """
         logger.debug("getting %s with args=%s, kwargs=%s", self._name, args, kwargs)
-        result = await session.execute(
-            select(self._model).filter(*args).filter_by(**kwargs)
-        )
+        if self._can_use_cached_statement(args=args, kwargs=kwargs):
+            result = await session.execute(
+                self._get_statement(kind="one", keys=tuple(sorted(kwargs))),
+                {f"filter_{key}": value for key, value in kwargs.items()},
+            )
+        else:
+            result = await session.execute(
+                select(self._model).filter(*args).filter_by(**kwargs)
+            )
 
         return result.scalars().first()
 
@@ -191,12 +405,57 @@ class CRUDRepository(Generic[ORMModelType, CreateSchemaType, UpdateSchemaType]):
                 Sequence[ORMModelType]: A sequence of ORMModel objects retrieved from the database.
         """
         logger.debug("get all %s with args=%s, kwargs=%s", self._name, args, kwargs)
+        if self._can_use_cached_statement(args=args, kwargs=kwargs):
+            result = await session.execute(
+                self._get_statement(kind="many", keys=tuple(sorted(kwargs))),
+                {
+                    "offset_": offset,
+                    "limit_": limit,
+                    **{f"filter_{key}": value for key, value in kwargs.items()},
+                },
+            )
+        else:
+            result = await session.execute(
+                select(self._model)
+                .filter(*args)
+                .filter_by(**kwargs)
+                .offset(offset)
+                .limit(limit)
+            )
+
+        return result.scalars().all()
+
+    async def read_many(
+        self,
+        session: AsyncSession,
+        schema: type[ReadSchemaType],
+        offset: int = 0,
+        limit: int | None = 100,
+        **kwargs: Any,
+    ) -> list[ReadSchemaType]:
+        """
+        Read-only fast path for list endpoints: selects just the columns
+        of the schema with Core, bypassing the ORM identity map, and
+        validates the rows straight into the schema.
+        Args:
+            session: The database session.
+            schema: The Pydantic schema of the returned items.
+            offset: The number of results to skip. Defaults to 0.
+            limit: The maximum number of results to return. Defaults to 100,
+                None returns every row (LIMIT NULL).
+            **kwargs: Equality filters by column name, not None. For example owner=user_id
+
+        Returns:
+                list[ReadSchemaType]: The rows as schema objects.
+        """
+        logger.debug("reading %s as %s with kwargs=%s", self._name, schema.__name__, kwargs)
         result = await session.execute(
-            select(self._model)
-            .filter(*args)
-            .filter_by(**kwargs)
-            .offset(offset)
-            .limit(limit)
+            self._get_rows_statement(schema=schema, keys=tuple(sorted(kwargs))),
+            {
+                "offset_": offset,
+                "limit_": limit,
+                **{f"filter_{key}": value for key, value in kwargs.items()},
+            },
         )
 
-        return result.scalars().all()
+        return get_rows_adapter(schema).validate_python(result.all(), from_attributes=True)
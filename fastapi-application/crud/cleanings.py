@@ -1,5 +1,7 @@
+from typing import Any
 from uuid import UUID
 
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.api_v1.cleanings.models import Cleaning
@@ -9,6 +11,7 @@ from api.api_v1.cleanings.schemas import (
     CleaningUpdate,
 )
 from crud.base import CRUDRepository
+from utils.pagination.keyset import paginate_by_keys
 
 
 class CleaningCRUD(CRUDRepository):  # type: ignore
@@ -33,6 +36,27 @@ class CleaningCRUD(CRUDRepository):  # type: ignore
 
         return CleaningPublic(**created_cleaning.as_dict())
 
+    async def create_cleanings(
+        self,
+        session: AsyncSession,
+        cleanings: list[CleaningInDB],
+    ) -> list[CleaningPublic]:
+        """
+        Creates many cleanings in the database in one transaction.
+        Args:
+            session: The database session.
+            cleanings: Input data for the creation of the cleaning objects.
+
+        Returns:
+                List of the newly created CleaningPublic objects.
+        """
+        created_cleanings = await self.create_many(
+            session=session,
+            objs_in=cleanings,
+        )
+
+        return [CleaningPublic(**cleaning.as_dict()) for cleaning in created_cleanings]
+
     async def get_one_cleaning_by_id(
         self,
         session: AsyncSession,
@@ -98,22 +122,54 @@ class CleaningCRUD(CRUDRepository):  # type: ignore
         self,
         session: AsyncSession,
         user_id: UUID,
-    ) -> list[Cleaning]:
+    ) -> list[CleaningPublic]:
         """
-        Retrieves all cleaning objects from the database by owner field.
+        Retrieves all cleanings from the database by owner field, without
+        the default limit of read_many.
         Args:
             session: The database session.
             user_id: User identifier.
 
         Returns:
-                List of cleaning objects.
+                List of CleaningPublic objects.
         """
-        cleanings = await self.get_many_records(
+        cleanings = await self.read_many(
             session=session,
+            schema=CleaningPublic,
+            limit=None,
             owner=user_id,
         )
 
         return cleanings
 
+    @staticmethod
+    async def get_cleanings_page(
+        session: AsyncSession,
+        user_id: UUID,
+        max_results: int,
+        cursor: str | None,
+    ) -> dict[str, Any]:
+        """
+        Gets one page of the owner's cleanings ordered by (created_at, id).
+        Args:
+            session: The database session.
+            user_id: User identifier.
+            max_results: The maximum number of results to return.
+            cursor: The cursor of the page, None for the first one.
+
+        Returns:
+                The page in the PaginatedResponse format.
+        """
+        page = await paginate_by_keys(
+            session=session,
+            query=select(Cleaning).filter_by(owner=user_id),
+            schema=CleaningPublic,
+            keys=(Cleaning.created_at, Cleaning.id),
+            max_results=max_results,
+            cursor=cursor,
+        )
+
+        return page
+
 
 cleanings_crud = CleaningCRUD(Cleaning)
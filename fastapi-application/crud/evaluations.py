@@ -1,24 +1,33 @@
 import logging
+from typing import Any
 from uuid import UUID
 
 from sqlalchemy import (
-    Integer,
+    Select,
     and_,
-    cast,
+    delete,
     func,
+    insert,
+    or_,
     select,
+    text,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.api_v1.evaluations.models import CleanerEvaluation
+from api.api_v1.evaluations.models import (
+    CleanerEvaluation,
+    CleanerStats,
+)
 from api.api_v1.evaluations.schemas import (
     CleanerInfo,
     EvaluationAggregate,
     EvaluationInDB,
     EvaluationPublic,
 )
-from api.api_v1.users.models import User
+from api.api_v1.profiles.models import Profile
+from core.models.unit_of_work import commit
 from crud.base import CRUDRepository
+from utils.pagination.keyset import paginate_by_keys
 
 logger = logging.getLogger(__name__)
 
@@ -74,19 +83,14 @@ class EvaluationsCRUD(CRUDRepository):  # type: ignore
             EvaluationPublic (pydantic model object) | None: EvaluationPublic
             object if the evaluation does not exist in the database, otherwise None.
         """
-        if await self.get_evaluation(
-            session=session,
-            owner=evaluation.owner,
-            cleaner_id=evaluation.cleaner_id,
-        ):
-            return None
-
-        to_create = await self.create_record(
+        if to_create := await self.create_record_if_absent(
             session=session,
             obj_in=evaluation,
-        )
+            conflict_keys=("owner", "cleaner_id"),
+        ):
+            return EvaluationPublic(**to_create.as_dict())
 
-        return EvaluationPublic(**to_create.as_dict())
+        return None
 
     @staticmethod
     async def get_cleaner_info(
@@ -102,94 +106,160 @@ class EvaluationsCRUD(CRUDRepository):  # type: ignore
 
         Returns:
             CleanerInfo (pydantic model object) | None: CleanerInfo object
-            if the user exists in the database, otherwise None.
+            if the user has a profile in the database, otherwise None.
         """
-        if res := await session.get(User, user_id):
-            cleaner_info = res.profile[0]
+        if cleaner_info := await session.scalar(select(Profile).filter_by(user_id=user_id)):
             return CleanerInfo(**cleaner_info.as_dict())
 
         return None
 
+    @staticmethod
     async def get_all_cleaner_evaluations(
-        self,
         session: AsyncSession,
         cleaner: CleanerInfo,
-        offset: int,
-        limit: int,
-    ) -> list[EvaluationPublic]:
+        max_results: int,
+        cursor: str | None,
+    ) -> dict[str, Any]:
         """
-        Gets all evaluations for the cleaning specialist.
+        Gets one page of the evaluations for the cleaning specialist
+        ordered by (created_at, id).
         Args:
             session: The database session.
             cleaner: Input data for the identification of the cleaner.
-            offset: Number of records to skip.
-            limit: Maximum number of records to retrieve.
+            max_results: Maximum number of records to retrieve.
+            cursor: The cursor of the page, None for the first one.
 
         Returns:
-                list[EvaluationPublic]: List of EvaluationPublic objects.
+                The page in the PaginatedResponse format.
         """
-        result = await self.get_many_records(
+        page = await paginate_by_keys(
             session=session,
-            cleaner_id=cleaner.user_id,
-            offset=offset,
-            limit=limit,
+            query=select(CleanerEvaluation).filter_by(cleaner_id=cleaner.user_id),
+            schema=EvaluationPublic,
+            keys=(CleanerEvaluation.created_at, CleanerEvaluation.id),
+            max_results=max_results,
+            cursor=cursor,
         )
 
-        return [EvaluationPublic(**res.as_dict()) for res in result]
+        return page
 
     @staticmethod
     async def get_cleaner_aggregates(
         session: AsyncSession,
         cleaner: CleanerInfo,
-    ) -> EvaluationAggregate:
+    ) -> EvaluationAggregate | None:
         """
-        Gets general statistics about the cleaning specialist.
+        Gets general statistics about the cleaning specialist from the
+        running totals in cleaner_stats.
         Args:
             session: The database session.
             cleaner: Input data for the identification of the cleaner.
 
         Returns:
-            EvaluationAggregate (pydantic model object): EvaluationAggregate object.
+            EvaluationAggregate (pydantic model object) | None: EvaluationAggregate
+            object if the cleaner has been evaluated, otherwise None.
         """
-        stmt = (
-            select(
-                CleanerEvaluation.cleaner_id,
-                func.avg(CleanerEvaluation.professionalism).label("avg_professionalism"),
-                func.avg(CleanerEvaluation.completeness).label("avg_completeness"),
-                func.avg(CleanerEvaluation.efficiency).label("avg_efficiency"),
-                func.avg(CleanerEvaluation.overall_rating).label("avg_overall_rating"),
-                func.min(CleanerEvaluation.overall_rating).label("min_overall_rating"),
-                func.max(CleanerEvaluation.overall_rating).label("max_overall_rating"),
-                func.count(CleanerEvaluation.owner).label("total_evaluations"),
-                func.sum(cast(CleanerEvaluation.no_show, Integer)).label("total_no_show"),
-                func.count(CleanerEvaluation.overall_rating)
-                .filter(CleanerEvaluation.overall_rating == 1)
-                .label("one_stars"),
-                func.count(CleanerEvaluation.overall_rating)
-                .filter(CleanerEvaluation.overall_rating == 2)
-                .label("two_stars"),
-                func.count(CleanerEvaluation.overall_rating)
-                .filter(CleanerEvaluation.overall_rating == 3)
-                .label("three_stars"),
-                func.count(CleanerEvaluation.overall_rating)
-                .filter(CleanerEvaluation.overall_rating == 4)
-                .label("four_stars"),
-                func.count(CleanerEvaluation.overall_rating)
-                .filter(CleanerEvaluation.overall_rating == 5)
-                .label("five_stars"),
-            )
-            .where(CleanerEvaluation.cleaner_id == cleaner.user_id)
-            .group_by(CleanerEvaluation.cleaner_id)
-        )
+        stats = await session.scalar(select(CleanerStats).filter_by(cleaner_id=cleaner.user_id))
+        if stats is None:
+            return None
 
-        res = await session.execute(stmt)
-        cleaner_aggregates = res.mappings().one()
         evaluation_aggregate = EvaluationAggregate(
             cleaner=cleaner,
-            **cleaner_aggregates,
+            avg_professionalism=average(stats.sum_professionalism, stats.count_professionalism),
+            avg_completeness=average(stats.sum_completeness, stats.count_completeness),
+            avg_efficiency=average(stats.sum_efficiency, stats.count_efficiency),
+            # the trigger deletes the row of a cleaner whose last evaluation is gone
+            avg_overall_rating=stats.sum_overall_rating / stats.total_evaluations,
+            min_overall_rating=stats.min_overall_rating,
+            max_overall_rating=stats.max_overall_rating,
+            total_evaluations=stats.total_evaluations,
+            total_no_show=stats.total_no_show,
+            one_stars=stats.one_stars,
+            two_stars=stats.two_stars,
+            three_stars=stats.three_stars,
+            four_stars=stats.four_stars,
+            five_stars=stats.five_stars,
         )
 
         return evaluation_aggregate
 
+    @staticmethod
+    async def rebuild_cleaner_stats(session: AsyncSession) -> int:
+        """
+        Recomputes every cleaner_stats row from the raw evaluations.
+        Args:
+            session: The database session.
+
+        Returns:
+                The number of cleaner_stats rows written.
+        """
+        # evaluations written during the rebuild would be counted twice or not at all
+        await session.execute(text("LOCK TABLE cleaner_evaluations IN SHARE MODE"))
+        await session.execute(delete(CleanerStats))
+        stats = stats_from_evaluations()
+        # an ORM INSERT ... SELECT reports no rowcount, count the returned keys instead
+        res = await session.execute(
+            insert(CleanerStats)
+            .from_select(list(stats.selected_columns.keys()), stats)
+            .returning(CleanerStats.cleaner_id)
+        )
+        rows = len(res.all())
+        await commit(session)
+
+        return rows
+
+    @staticmethod
+    async def verify_cleaner_stats(session: AsyncSession) -> list[UUID]:
+        """
+        Compares cleaner_stats with the totals computed from the raw evaluations.
+        Args:
+            session: The database session.
+
+        Returns:
+                Identifiers of the cleaners whose row is wrong or missing.
+        """
+        expected = stats_from_evaluations().subquery()
+        stmt = (
+            select(func.coalesce(expected.c.cleaner_id, CleanerStats.cleaner_id))
+            .select_from(expected.join(CleanerStats, CleanerStats.cleaner_id == expected.c.cleaner_id, full=True))
+            .where(or_(*(column.is_distinct_from(getattr(CleanerStats, column.key)) for column in expected.c)))
+        )
+        res = await session.scalars(stmt)
+
+        return list(res.all())
+
+
+def average(total: int, count: int) -> float | None:
+    return total / count if count else None
+
+
+def stats_from_evaluations() -> Select[Any]:
+    """
+    The cleaner_stats rows computed from scratch over cleaner_evaluations.
+    """
+
+    def stars(rating: int) -> Any:
+        return func.count().filter(CleanerEvaluation.overall_rating == rating)
+
+    return select(
+        CleanerEvaluation.cleaner_id.label("cleaner_id"),
+        func.count().label("total_evaluations"),
+        func.count().filter(CleanerEvaluation.no_show).label("total_no_show"),
+        func.coalesce(func.sum(CleanerEvaluation.professionalism), 0).label("sum_professionalism"),
+        func.count(CleanerEvaluation.professionalism).label("count_professionalism"),
+        func.coalesce(func.sum(CleanerEvaluation.completeness), 0).label("sum_completeness"),
+        func.count(CleanerEvaluation.completeness).label("count_completeness"),
+        func.coalesce(func.sum(CleanerEvaluation.efficiency), 0).label("sum_efficiency"),
+        func.count(CleanerEvaluation.efficiency).label("count_efficiency"),
+        func.sum(CleanerEvaluation.overall_rating).label("sum_overall_rating"),
+        func.min(CleanerEvaluation.overall_rating).label("min_overall_rating"),
+        func.max(CleanerEvaluation.overall_rating).label("max_overall_rating"),
+        stars(1).label("one_stars"),
+        stars(2).label("two_stars"),
+        stars(3).label("three_stars"),
+        stars(4).label("four_stars"),
+        stars(5).label("five_stars"),
+    ).group_by(CleanerEvaluation.cleaner_id)
+
 
 evaluations_crud = EvaluationsCRUD(CleanerEvaluation)
@@ -1,9 +1,9 @@
 import logging
+from typing import Any
 from uuid import UUID
 
 from sqlalchemy import (
     and_,
-    delete,
     select,
     update,
 )
@@ -11,13 +11,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.api_v1.offers.models import UserOffer
 from api.api_v1.offers.schemas import (
+    OfferBatchUpdate,
     OfferInDB,
     OfferPublic,
     OfferUpdate,
     UserInfo,
 )
 from api.api_v1.profiles.models import Profile
+from core.models.unit_of_work import commit
 from crud.base import CRUDRepository
+from utils.pagination.keyset import paginate_by_keys
 
 logger = logging.getLogger(__name__)
 
@@ -72,20 +75,14 @@ class OfferCrud(CRUDRepository):  # type: ignore
             OfferPublic (pydantic model object) | None: User offer object if it
             does not exist in the database, otherwise None.
         """
-        offer_exists = await self.get_user_offer(
-            session=session,
-            user_id=offer_schema.offerer_id,
-            cleaning_id=offer_schema.cleaning_id,
-        )
-        if offer_exists:
-            return None
-
-        offer = await self.create_record(
+        if offer := await self.create_record_if_absent(
             session=session,
             obj_in=OfferInDB(**offer_schema.model_dump()),
-        )
+            conflict_keys=("offerer_id", "cleaning_id"),
+        ):
+            return OfferPublic(**offer.as_dict())
 
-        return OfferPublic(**offer.as_dict())
+        return None
 
     @staticmethod
     async def get_user_info_from_profile(
@@ -110,26 +107,35 @@ class OfferCrud(CRUDRepository):  # type: ignore
 
         return UserInfo(**res.as_dict())
 
+    @staticmethod
     async def get_all_offers_for_offerer(
-        self,
         session: AsyncSession,
         user_id: UUID,
-    ) -> list[UserOffer]:
+        max_results: int,
+        cursor: str | None,
+    ) -> dict[str, Any]:
         """
-        Gets all offers by offerer identifier.
+        Gets one page of the offers by offerer identifier ordered by the
+        primary key (offerer_id, cleaning_id).
         Args:
             session: The database session.
             user_id: User identifier.
+            max_results: The maximum number of results to return.
+            cursor: The cursor of the page, None for the first one.
 
         Returns:
-                List of UserOffer objects.
+                The page in the PaginatedResponse format.
         """
-        res = await self.get_many_records(
+        page = await paginate_by_keys(
             session=session,
-            offerer_id=user_id,
+            query=select(UserOffer).filter_by(offerer_id=user_id),
+            schema=OfferPublic,
+            keys=(UserOffer.offerer_id, UserOffer.cleaning_id),
+            max_results=max_results,
+            cursor=cursor,
         )
 
-        return res
+        return page
 
     async def get_offers_with_status(
         self,
@@ -177,37 +183,41 @@ class OfferCrud(CRUDRepository):  # type: ignore
             user_id,
             status,
         )
-        await session.execute(
-            delete(UserOffer).where(and_(UserOffer.offerer_id == user_id, UserOffer.status == status))
+        await self.delete_many(
+            session,
+            UserOffer.offerer_id == user_id,
+            UserOffer.status == status,
         )
-        await session.commit()
 
+    @staticmethod
     async def get_offers_for_cleaning_owner(
-        self,
         session: AsyncSession,
         cleaning_id: int,
-        offset: int,
-        limit: int,
-    ) -> list[UserOffer]:
+        max_results: int,
+        cursor: str | None,
+    ) -> dict[str, Any]:
         """
-        Gets all offers for cleaner by cleaning ID.
+        Gets one page of the offers for cleaner by cleaning ID ordered by
+        (cleaning_id, offerer_id).
         Args:
             session: The database session.
             cleaning_id: Cleaning identifier.
-            offset: The number of results to skip.
-            limit: The maximum number of results to return.
+            max_results: The maximum number of results to return.
+            cursor: The cursor of the page, None for the first one.
 
         Returns:
-                List of UserOffer objects.
+                The page in the PaginatedResponse format.
         """
-        offers = await self.get_many_records(
+        page = await paginate_by_keys(
             session=session,
-            cleaning_id=cleaning_id,
-            offset=offset,
-            limit=limit,
+            query=select(UserOffer).filter_by(cleaning_id=cleaning_id),
+            schema=OfferPublic,
+            keys=(UserOffer.cleaning_id, UserOffer.offerer_id),
+            max_results=max_results,
+            cursor=cursor,
         )
 
-        return offers
+        return page
 
     async def update_offer_for_cleaning_owner(
         self,
@@ -243,10 +253,38 @@ class OfferCrud(CRUDRepository):  # type: ignore
             .values(status=offer_update.status)
             .returning(UserOffer)
         )
-        await session.flush()
-        await session.commit()
+        await commit(session)
 
         return to_update
 
+    async def update_offers_for_cleaning_owner(
+        self,
+        session: AsyncSession,
+        cleaning_id: int,
+        offer_update: OfferBatchUpdate,
+        from_statuses: tuple[str, ...],
+    ) -> list[OfferPublic]:
+        """
+        Updates the status of many offers for one cleaning in a single statement.
+        Offers that are not in one of from_statuses are left unchanged.
+        Args:
+            session: The database session.
+            cleaning_id: Cleaning identifier.
+            offer_update: The offerers whose offers to update and the new status.
+            from_statuses: The statuses the offers may be changed from.
+
+        Returns:
+            list[OfferPublic] (pydantic model object): List of the updated offers.
+        """
+        updated_offers = await self.update_many(
+            session,
+            OfferUpdate(status=offer_update.status),
+            UserOffer.offerer_id.in_(offer_update.offerer_ids),
+            UserOffer.status.in_(from_statuses),
+            cleaning_id=cleaning_id,
+        )
+
+        return [OfferPublic(**offer.as_dict()) for offer in updated_offers]
+
 
 offers_crud = OfferCrud(UserOffer)
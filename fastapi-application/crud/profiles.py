@@ -11,7 +11,15 @@ from api.api_v1.profiles.schemas import (
     ProfileUpdate,
 )
 from api.api_v1.users.models import User
+from auth.revocation import revocation_list
+from auth.user_cache import invalidate_cached_user
+from core.models.unit_of_work import (
+    commit,
+    on_commit,
+    unit_of_work,
+)
 from crud.base import CRUDRepository
+from crud.revocations import revoked_tokens_crud
 
 
 class ProfileCRUD(CRUDRepository):  # type: ignore
@@ -51,7 +59,10 @@ class ProfileCRUD(CRUDRepository):  # type: ignore
             values: Values for updating user model fields.
         """
         await session.execute(update(User).where(User.id == user_id).values(values))
-        await session.commit()
+        revoked = revoked_tokens_crud.revoke_user_tokens(session=session, user_id=user_id)
+        await commit(session)
+        on_commit(session, lambda: invalidate_cached_user(user_id=user_id))
+        on_commit(session, lambda: revocation_list.add(entry=revoked))
 
     async def create_profile(
         self,
@@ -62,7 +73,8 @@ class ProfileCRUD(CRUDRepository):  # type: ignore
         Creates a user profile in the database.
 
         When creating a profile, the user registers as a customer or a cleaner.
-        Change the user role from authorised to customer or cleaner.
+        Change the user role from authorised to customer or cleaner, in the
+        same transaction as the profile.
         Args:
             session: The database session.
             profile_schema: Input data for creating a user profile.
@@ -71,30 +83,24 @@ class ProfileCRUD(CRUDRepository):  # type: ignore
             ProfilePublic (pydantic model object) | None: Profile object if it
             does not exist in the database, otherwise None.
         """
-
-        if (
-            registered_profile := await self.get_profile_by_user_id(  # noqa: F841
-                session=session,
-                user_id=profile_schema.user_id,
-            )
-            is None
-        ):
-            dict_values: dict[str, Any] = {"profile_exists": True}
-            if profile_schema.register_as == "customer":
-                dict_values.update(role_id=4)
-            else:
-                dict_values.update(role_id=5)
-            profile = await self.create_record(
+        async with unit_of_work(session):
+            if profile := await self.create_record_if_absent(
                 session=session,
                 obj_in=profile_schema,
-            )
-            await self.update_user_role_id(
-                session=session,
-                user_id=profile_schema.user_id,
-                values=dict_values,
-            )
-
-            return ProfilePublic(**profile.as_dict())
+                conflict_keys=("user_id",),
+            ):
+                dict_values: dict[str, Any] = {"profile_exists": True}
+                if profile_schema.register_as == "customer":
+                    dict_values.update(role_id=4)
+                else:
+                    dict_values.update(role_id=5)
+                await self.update_user_role_id(
+                    session=session,
+                    user_id=profile_schema.user_id,
+                    values=dict_values,
+                )
+
+                return ProfilePublic(**profile.as_dict())
 
         return None
 
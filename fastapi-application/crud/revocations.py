@@ -0,0 +1,51 @@
+from datetime import (
+    datetime,
+    timedelta,
+    timezone,
+)
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.api_v1.users.models import RevokedToken
+from core.config import settings
+from crud.base import CRUDRepository
+
+
+class RevokedTokenCRUD(CRUDRepository):  # type: ignore
+
+    @staticmethod
+    def revoke_user_tokens(
+        session: AsyncSession,
+        user_id: UUID,
+    ) -> RevokedToken | None:
+        """
+        Adds a denylist entry covering every access token of the user issued
+        so far. The entry is committed together with the caller's changes.
+
+        Only used in the stateless authentication mode, where access token
+        claims are trusted without reading the user from the database.
+        The cutoff and the token iat claim both have sub-second precision,
+        so every token issued before the change is covered, including the
+        one that made it, and tokens issued right after it stay valid.
+        Args:
+            session: The database session.
+            user_id: User identifier.
+
+        Returns:
+                The pending entry, or None if the stateless mode is off.
+        """
+        if not settings.auth_jwt.stateless:
+            return None
+        time_now = datetime.now(timezone.utc)
+        entry = RevokedToken(
+            user_id=user_id,
+            issued_before=time_now,
+            expires_at=time_now + timedelta(minutes=settings.auth_jwt.access_token_expire_minutes),
+        )
+        session.add(entry)
+
+        return entry
+
+
+revoked_tokens_crud = RevokedTokenCRUD(RevokedToken)
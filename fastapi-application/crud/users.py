@@ -1,10 +1,15 @@
 from uuid import UUID
 
 from sqlalchemy import (
+    select,
     text,
     update,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import (
+    raiseload,
+    selectinload,
+)
 
 from api.api_v1.users.models import User
 from api.api_v1.users.schemas import (
@@ -12,12 +17,21 @@ from api.api_v1.users.schemas import (
     UserInDB,
     UserPublic,
 )
+from auth.permissions import permission_table
+from auth.revocation import revocation_list
 from auth.schemas import (
     UserAuthProfile,
     UserAuthSchema,
 )
-from auth.utils.auth_utils import hash_password
+from auth.user_cache import invalidate_cached_user
+from auth.utils.password_hasher import password_hasher
+from core.models.unit_of_work import (
+    commit,
+    on_commit,
+    unit_of_work,
+)
 from crud.base import CRUDRepository
+from crud.revocations import revoked_tokens_crud
 
 
 class UserCRUD(CRUDRepository):  # type: ignore
@@ -55,17 +69,20 @@ class UserCRUD(CRUDRepository):  # type: ignore
             UserPublic (pydantic model object) | None: User object or None
             if the mail is not unique.
         """
-        unique_email = await self.get_user_by_email(
-            session=session,
-            email=user_schema.email,
-        )
-        if unique_email is None:
-            user_pwd_to_bytes: bytes = hash_password(plaintext_password=user_schema.password)
-            user_from_schema = user_schema.model_dump()
-            user_from_schema.update(password=user_pwd_to_bytes)
-            user_in_db = UserInDB(**user_from_schema)
-            user: User = await self.create_record(session=session, obj_in=user_in_db)
+        # a taken email is answered by the index, not after a bcrypt hash and a hasher slot;
+        # the insert below only settles two signups racing for the same email
+        if await self.get_user_by_email(session=session, email=user_schema.email) is not None:
+            return None
 
+        user_pwd_to_bytes: bytes = await password_hasher.hash(plaintext_password=user_schema.password)
+        user_from_schema = user_schema.model_dump()
+        user_from_schema.update(password=user_pwd_to_bytes)
+        user_in_db = UserInDB(**user_from_schema)
+        if user := await self.create_record_if_absent(
+            session=session,
+            obj_in=user_in_db,
+            conflict_keys=("email",),
+        ):
             return UserPublic(**user.as_dict())
 
         return None
@@ -77,6 +94,9 @@ class UserCRUD(CRUDRepository):  # type: ignore
     ) -> UserAuthSchema | None:
         """
         Gets the user by ID.
+
+        Relationships are not loaded, permissions are resolved from the
+        in-process permission snapshot.
         Args:
             session: The database session.
             user_id(UUID): User identifier.
@@ -85,19 +105,42 @@ class UserCRUD(CRUDRepository):  # type: ignore
             UserAuthSchema (pydantic model object) | None: User object if found,
             otherwise None.
         """
-        user: User | None = await self.get_one_by_id(session=session, obj_id=user_id)
+        user: User | None = await session.scalar(
+            select(User).where(User.id == user_id).options(raiseload("*")),
+        )
         if user is not None:
-            return UserAuthSchema(
-                id=user.id,
-                email=user.email,
-                email_verified=user.email_verified,
-                is_active=user.is_active,
-                profile_exists=user.profile_exists,
-                permissions=[perm.name for perm in user.role.permissions],
-            )
+            return await self.to_auth_schema(session=session, user=user)
 
         return None
 
+    @staticmethod
+    async def to_auth_schema(
+        session: AsyncSession,
+        user: User,
+    ) -> UserAuthSchema:
+        """
+        Builds the authentication schema of the user with the permissions
+        of the user role taken from the permission snapshot.
+        Args:
+            session: The database session, used only if the snapshot must be (re)loaded.
+            user: The user object.
+
+        Returns:
+            UserAuthSchema (pydantic model object): The user object.
+        """
+        snapshot = await permission_table.get(session=session, role_id=user.role_id)
+        permission_mask = snapshot.role_masks.get(user.role_id, 0)
+
+        return UserAuthSchema(
+            id=user.id,
+            email=user.email,
+            email_verified=user.email_verified,
+            is_active=user.is_active,
+            profile_exists=user.profile_exists,
+            permissions=snapshot.names_of(permission_mask),
+            permission_mask=permission_mask,
+        )
+
     @staticmethod
     async def get_user_profile(
         session: AsyncSession,
@@ -116,7 +159,15 @@ class UserCRUD(CRUDRepository):  # type: ignore
         Returns:
             UserAuthProfile(pydantic model object): Profile object.
         """
-        user = await session.get(User, user_id)
+        # crud.users is imported while the profiles package is initialised, so the
+        # profile is reached through the relationship rather than the Profile model;
+        # populate_existing loads it into a user already in the identity map
+        user = await session.scalar(
+            select(User)
+            .filter_by(id=user_id)
+            .options(selectinload(User.profile))
+            .execution_options(populate_existing=True)
+        )
 
         return UserAuthProfile(**user.profile[0].as_dict())
 
@@ -139,8 +190,10 @@ class UserCRUD(CRUDRepository):  # type: ignore
         to_update = await session.scalar(
             update(User).filter_by(id=user_id).returning(User).values(password=new_pwd),
         )
-        await session.flush()
-        await session.commit()
+        revoked = revoked_tokens_crud.revoke_user_tokens(session=session, user_id=user_id)
+        await commit(session)
+        on_commit(session, lambda: invalidate_cached_user(user_id=user_id))
+        on_commit(session, lambda: revocation_list.add(entry=revoked))
 
         return to_update
 
@@ -162,17 +215,19 @@ class UserCRUD(CRUDRepository):  # type: ignore
         Returns:
                 The user object or None if email is not unique.
         """
-        unique_email = await self.get_user_by_email(session=session, email=new_email)
-        if unique_email is None:
-            user = await session.scalar(
-                update(User).filter_by(id=user_in.id).returning(User).values(email=new_email),
-            )
-            if user_in.profile_exists:
-                stmt = text("UPDATE profiles SET email = :new_email WHERE user_id = :id")
-                await session.execute(stmt, {"new_email": new_email, "id": user_in.id})
-            await session.flush()
-            await session.commit()
-            return user
+        async with unit_of_work(session):
+            unique_email = await self.get_user_by_email(session=session, email=new_email)
+            if unique_email is None:
+                user = await session.scalar(
+                    update(User).filter_by(id=user_in.id).returning(User).values(email=new_email),
+                )
+                if user_in.profile_exists:
+                    stmt = text("UPDATE profiles SET email = :new_email WHERE user_id = :id")
+                    await session.execute(stmt, {"new_email": new_email, "id": user_in.id})
+                revoked = revoked_tokens_crud.revoke_user_tokens(session=session, user_id=user_in.id)
+                on_commit(session, lambda: invalidate_cached_user(user_id=user_in.id))
+                on_commit(session, lambda: revocation_list.add(entry=revoked))
+                return user
 
         return None
 
@@ -193,8 +248,10 @@ class UserCRUD(CRUDRepository):  # type: ignore
         to_update = await session.scalar(
             update(User).filter_by(id=user_id).returning(User).values(email_verified=True),
         )
-        await session.flush()
-        await session.commit()
+        revoked = revoked_tokens_crud.revoke_user_tokens(session=session, user_id=user_id)
+        await commit(session)
+        on_commit(session, lambda: invalidate_cached_user(user_id=user_id))
+        on_commit(session, lambda: revocation_list.add(entry=revoked))
 
         return to_update
 
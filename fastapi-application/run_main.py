@@ -1,15 +1,30 @@
 __all__ = ("main",)
 
+import asyncio
+
 from core.gunicorn import (
     StandaloneApplication,
     get_app_options,
     get_number_of_workers,
 )
+from core.models.connection_budget import (
+    ConnectionBudgetError,
+    check_connection_plan,
+    connection_plan,
+    replica_connection_plan,
+)
 from main import app
 from core.config import settings
 
 
 def main():
+    if settings.db.check_connection_limits and not settings.db.pgbouncer:
+        try:
+            asyncio.run(check_connection_plan(plan=connection_plan, url=settings.db.postgres_connection_string))
+            for replica_url in settings.db.replica_urls:
+                asyncio.run(check_connection_plan(plan=replica_connection_plan, url=replica_url))
+        except ConnectionBudgetError as exc:
+            raise SystemExit(f"Refusing to start: {exc}")
     StandaloneApplication(
         application=app,
         options=get_app_options(
@@ -0,0 +1,47 @@
+"""
+Rebuilding and verifying the cleaner_stats running totals
+against the raw cleaner_evaluations rows.
+"""
+
+import typer
+
+from core.models import db_helper
+from crud.evaluations import evaluations_crud
+
+async_session = db_helper.get_ctx_async_session
+
+
+async def verify_cleaner_stats() -> bool:
+    async with async_session() as session:
+        wrong_cleaner_ids = await evaluations_crud.verify_cleaner_stats(session=session)
+    if wrong_cleaner_ids:
+        for cleaner_id in wrong_cleaner_ids:
+            typer.echo(message=f"cleaner_stats differ from the evaluations of cleaner {cleaner_id}")
+        error_msg = typer.style(
+            f"cleaner_stats is wrong for {len(wrong_cleaner_ids)} cleaning specialist(s)",
+            fg=typer.colors.RED,
+            bold=True,
+        )
+        typer.echo(message=error_msg, color=True)
+        return False
+
+    success_msg = typer.style(
+        "cleaner_stats matches the evaluations",
+        fg=typer.colors.GREEN,
+        bold=True,
+    )
+    typer.echo(message=success_msg, color=True)
+    return True
+
+
+async def rebuild_cleaner_stats() -> bool:
+    async with async_session() as session:
+        rows = await evaluations_crud.rebuild_cleaner_stats(session=session)
+    success_msg = typer.style(
+        f"cleaner_stats rebuilt for {rows} cleaning specialist(s)",
+        fg=typer.colors.GREEN,
+        bold=True,
+    )
+    typer.echo(message=success_msg, color=True)
+
+    return await verify_cleaner_stats()
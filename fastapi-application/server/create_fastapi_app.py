@@ -9,35 +9,66 @@ from fastapi.openapi.docs import (
     get_swagger_ui_oauth2_redirect_html,
 )
 from fastapi.responses import ORJSONResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from starlette.responses import HTMLResponse
 
+from auth.utils.password_hasher import password_hasher
 from core.config import settings
 from core.models import db_helper
+from core.models.query_deadline import StatementTimeoutError
+from server.utils.exception_handlers import (
+    pool_timeout_handler,
+    statement_timeout_handler,
+)
+from server.utils.load_shedding import LoadSheddingMiddleware
 from server.utils.middlewares import PaginationMiddleware
+from server.utils.query_stats import QueryStatsMiddleware
+from server.utils.read_your_writes import ReadYourWritesMiddleware
 from utils.custom_logger.middlewares import LoggingMiddleware
 from utils.custom_logger.setup import setup_logging
 
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
+    # both import the user models, which can only be imported after core.models
+    from auth.revocation import revocation_list
+    from auth.utils.password_rehash import password_rehash_queue
+
     setup_logging()
     queue_handler = logging.getHandlerByName("queue_handler")
     queue_handler.listener.start()
+    password_rehash_queue.start()
+    db_helper.start_health_checks()
+    if settings.auth_jwt.stateless:
+        revocation_list.start()
 
     yield
+    await revocation_list.stop()
+    await password_rehash_queue.stop()
+    password_hasher.shutdown()
     await db_helper.dispose()
     queue_handler.listener.stop()
 
 
 def _init_router(_app: FastAPI) -> None:
     from api import router
+    from server.internal import router as internal_router
 
     _app.include_router(router)
+    _app.include_router(internal_router)
 
 
 def _init_middleware(_app: FastAPI) -> None:
     _app.add_middleware(PaginationMiddleware)
+    _app.add_middleware(QueryStatsMiddleware, config=settings.db)
+    _app.add_middleware(ReadYourWritesMiddleware, config=settings.db)
     _app.middleware("http")(LoggingMiddleware())
+    _app.add_middleware(LoadSheddingMiddleware, config=settings.load_shedding)
+
+
+def _init_exception_handlers(_app: FastAPI) -> None:
+    _app.add_exception_handler(StatementTimeoutError, statement_timeout_handler)  # type: ignore[arg-type]
+    _app.add_exception_handler(PoolTimeoutError, pool_timeout_handler)  # type: ignore[arg-type]
 
 
 def _register_static_docs_routes(_app: FastAPI) -> None:
@@ -77,6 +108,7 @@ def create_app(
     )
     _init_router(_app)
     _init_middleware(_app)
+    _init_exception_handlers(_app)
     if create_custom_static_urls:
         _register_static_docs_routes(_app=_app)
 
@@ -0,0 +1,60 @@
+"""
+This module contains internal service endpoints that are not part of the public API.
+
+They require the api.internal.token bearer token and are not served at
+all while no token is configured.
+"""
+
+from secrets import compare_digest
+from typing import (
+    Annotated,
+    Any,
+)
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    status,
+)
+from fastapi.security import (
+    HTTPAuthorizationCredentials,
+    HTTPBearer,
+)
+
+from core.config import settings
+from utils.metrics import metrics_registry
+
+internal_bearer = HTTPBearer(auto_error=False)
+
+
+async def verify_internal_token(
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(internal_bearer)],
+) -> None:
+    if (token := settings.api.internal.token) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if credentials is None or not compare_digest(credentials.credentials.encode(), token.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid internal token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+router = APIRouter(
+    prefix=settings.api.internal.prefix,
+    tags=["Internal"],
+    include_in_schema=False,
+    dependencies=[Depends(verify_internal_token)],
+)
+
+
+@router.get(
+    settings.api.internal.metrics,
+    name="internal:metrics",
+)
+async def get_metrics() -> dict[str, Any]:
+    """
+    Returns a snapshot of the metrics collected by the current worker.
+    """
+    return metrics_registry.snapshot()
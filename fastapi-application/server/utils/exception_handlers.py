@@ -0,0 +1,57 @@
+"""
+This module contains the exception handlers that turn exhausted query
+time budgets into clean 503/504 responses instead of 500s.
+"""
+
+import logging
+
+from fastapi import (
+    Request,
+    status,
+)
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from core.config import settings
+from core.models.query_deadline import StatementTimeoutError
+from utils.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+QUERY_TIMEOUTS = metrics_registry.counter(
+    name="db_query_timeouts_total",
+    description="Requests that failed because a query ran out of time or no connection was free",
+)
+
+
+def _route_name(request: Request) -> str:
+    route = request.scope.get("route")
+
+    return getattr(route, "name", request.url.path)
+
+
+async def statement_timeout_handler(request: Request, exc: StatementTimeoutError) -> ORJSONResponse:
+    """
+    Answers 504 if a statement was cancelled by its statement_timeout.
+    """
+    QUERY_TIMEOUTS.inc(route=_route_name(request), reason="statement_timeout")
+    logger.warning("statement timeout in %s %s", request.method, request.url.path)
+
+    return ORJSONResponse(
+        content={"detail": "The request took too long to process"},
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+    )
+
+
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError) -> ORJSONResponse:
+    """
+    Answers 503 with Retry-After if no database connection became free in time.
+    """
+    QUERY_TIMEOUTS.inc(route=_route_name(request), reason="pool_timeout")
+    logger.warning("no database connection for %s %s: %s", request.method, request.url.path, exc)
+
+    return ORJSONResponse(
+        content={"detail": "Service is temporarily overloaded, try again later"},
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(settings.load_shedding.retry_after)},
+    )
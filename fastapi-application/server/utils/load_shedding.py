@@ -0,0 +1,194 @@
+"""
+This module contains the adaptive concurrency limiter and the ASGI
+middleware that sheds load when a worker is overloaded.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from time import (
+    monotonic,
+    perf_counter,
+)
+
+from fastapi.responses import ORJSONResponse
+from starlette.types import (
+    ASGIApp,
+    Receive,
+    Scope,
+    Send,
+)
+
+from core.config import (
+    LoadSheddingConfig,
+    RouteGroupLimitConfig,
+)
+from core.models.pool import pool_wait_tracker
+from utils.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+REQUESTS_ADMITTED = metrics_registry.counter(
+    name="http_requests_admitted_total",
+    description="Requests admitted by the concurrency limiter",
+)
+REQUESTS_SHED = metrics_registry.counter(
+    name="http_requests_shed_total",
+    description="Requests rejected with 503 by the concurrency limiter",
+)
+CONCURRENCY_LIMIT = metrics_registry.gauge(
+    name="http_concurrency_limit",
+    description="Current adaptive concurrency limit",
+)
+REQUESTS_IN_FLIGHT = metrics_registry.gauge(
+    name="http_requests_in_flight",
+    description="Requests currently being processed",
+)
+
+
+class Overloaded(Exception):
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AIMDLimiter:
+    """
+    Additive-increase/multiplicative-decrease concurrency limiter.
+
+    A request slower than the target latency shrinks the limit by
+    `backoff`, at most once per target latency interval. A fast request
+    grows it by 1/limit, i.e. about one slot per limit-many fast requests.
+    Requests above the limit wait in a FIFO queue, unless the expected
+    wait exceeds max_queue_wait.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        config: RouteGroupLimitConfig,
+        backoff: float = 0.9,
+    ) -> None:
+        self.name = name
+        self._config = config
+        self._backoff = backoff
+        self.limit: float = config.initial_limit
+        self.in_flight: int = 0
+        self._avg_latency: float = config.target_latency / 2
+        self._last_decrease: float = 0.0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        CONCURRENCY_LIMIT.set(self.limit, group=self.name)
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def expected_wait(self) -> float:
+        return self._avg_latency * (len(self._waiters) + 1) / max(self.limit, 1.0)
+
+    async def acquire(self) -> None:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+        if self.expected_wait() > self._config.max_queue_wait:
+            raise Overloaded("concurrency")
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=self._config.max_queue_wait)
+        except BaseException as exc:
+            if waiter.done() and not waiter.cancelled():
+                # the slot was handed over just as the wait ended, pass it on
+                self.release(latency=None)
+            else:
+                waiter.cancel()
+            if isinstance(exc, TimeoutError):
+                raise Overloaded("queue_timeout")
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self, latency: float | None) -> None:
+        if latency is not None:
+            self._update_limit(latency=latency)
+        while self._waiters and self.in_flight <= int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # the slot is handed over, in_flight stays the same
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def _update_limit(self, latency: float) -> None:
+        self._avg_latency += 0.2 * (latency - self._avg_latency)
+        if latency > self._config.target_latency:
+            now = monotonic()
+            if now - self._last_decrease >= self._config.target_latency:
+                self.limit = max(float(self._config.min_limit), self.limit * self._backoff)
+                self._last_decrease = now
+        elif self.in_flight >= self.limit / 2:
+            self.limit = min(float(self._config.max_limit), self.limit + 1 / self.limit)
+        CONCURRENCY_LIMIT.set(self.limit, group=self.name)
+
+
+class LoadSheddingMiddleware:
+    """
+    Limits the number of concurrent requests per route group and answers
+    503 with Retry-After instead of letting requests queue until the
+    gunicorn timeout.
+    """
+
+    def __init__(self, app: ASGIApp, config: LoadSheddingConfig) -> None:
+        self.app = app
+        self._config = config
+        self._exempt_paths = tuple(config.exempt_paths)
+        self._limiters = {name: AIMDLimiter(name=name, config=group) for name, group in config.groups.items()}
+
+    def _get_limiter(self, path: str, method: str) -> AIMDLimiter | None:
+        for name, group in self._config.groups.items():
+            if path.startswith(group.path_prefix) and (group.methods is None or method in group.methods):
+                return self._limiters[name]
+
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._config.enabled or scope["path"].startswith(self._exempt_paths):
+            await self.app(scope, receive, send)
+            return
+        if (limiter := self._get_limiter(path=scope["path"], method=scope["method"])) is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            if pool_wait_tracker.average > self._config.db_pool_wait_budget:
+                raise Overloaded("db_pool_wait")
+            await limiter.acquire()
+        except Overloaded as exc:
+            REQUESTS_SHED.inc(group=limiter.name, reason=exc.reason)
+            logger.warning(
+                "shedding request %s %s: group=%s reason=%s in_flight=%s limit=%.1f",
+                scope["method"],
+                scope["path"],
+                limiter.name,
+                exc.reason,
+                limiter.in_flight,
+                limiter.limit,
+            )
+            response = ORJSONResponse(
+                content={"detail": "Service is temporarily overloaded, try again later"},
+                status_code=503,
+                headers={"Retry-After": str(self._config.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        REQUESTS_ADMITTED.inc(group=limiter.name)
+        REQUESTS_IN_FLIGHT.inc(group=limiter.name)
+        started_at = perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            REQUESTS_IN_FLIGHT.dec(group=limiter.name)
+            limiter.release(latency=perf_counter() - started_at)
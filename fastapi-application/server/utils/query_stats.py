@@ -0,0 +1,94 @@
+"""
+This module contains the ASGI middleware that accounts the SQL
+statements of every request: it reports them in a Server-Timing header,
+in metrics and in the request log, and warns about routes that issue
+more queries than their budget (usually an N+1 regression).
+"""
+
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import (
+    ASGIApp,
+    Message,
+    Receive,
+    Scope,
+    Send,
+)
+
+from core.config import DataBaseConfig
+from core.models.query_stats import (
+    QueryStats,
+    current_query_stats,
+)
+from utils.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+QUERIES_PER_REQUEST = metrics_registry.histogram(
+    name="db_queries_per_request",
+    description="SQL statements executed per request",
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+DB_TIME_PER_REQUEST = metrics_registry.histogram(
+    name="db_time_per_request_seconds",
+    description="Time spent executing SQL statements per request",
+)
+QUERY_BUDGET_EXCEEDED = metrics_registry.counter(
+    name="db_query_budget_exceeded_total",
+    description="Requests that executed more SQL statements than their route's budget",
+)
+
+
+def _route_name(scope: Scope) -> str:
+    route = scope.get("route")
+
+    return getattr(route, "name", None) or "unmatched"
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app: ASGIApp, config: DataBaseConfig) -> None:
+        self.app = app
+        self._config = config
+
+    def _budget(self, route_name: str) -> int | None:
+        return self._config.route_query_budgets.get(route_name, self._config.query_budget)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        scope.setdefault("state", {})["query_stats"] = stats
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries"',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            self._report(scope=scope, stats=stats)
+
+    def _report(self, scope: Scope, stats: QueryStats) -> None:
+        route_name = _route_name(scope)
+        QUERIES_PER_REQUEST.observe(stats.count, route=route_name)
+        DB_TIME_PER_REQUEST.observe(stats.duration, route=route_name)
+        if (budget := self._budget(route_name)) is not None and stats.count > budget:
+            QUERY_BUDGET_EXCEEDED.inc(route=route_name)
+            logger.warning(
+                "%s %s executed %s SQL statements, the budget of %s is %s",
+                scope["method"],
+                scope["path"],
+                stats.count,
+                route_name,
+                budget,
+            )
@@ -0,0 +1,62 @@
+"""
+This module contains the ASGI middleware that hands the time of a
+request's database write back to its client in a short-lived cookie.
+The client sends it with its next requests, so the worker that serves
+a read, whichever it is, routes it to the primary (see DataBaseHelper).
+"""
+
+from http.cookies import SimpleCookie
+from math import ceil
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import (
+    ASGIApp,
+    Message,
+    Receive,
+    Scope,
+    Send,
+)
+
+from core.config import DataBaseConfig
+from core.models.db_helper import (
+    LAST_WRITE_COOKIE,
+    LAST_WRITE_STATE,
+)
+
+
+def last_write_cookie(last_write: float, max_age_seconds: float) -> str:
+    cookie: SimpleCookie = SimpleCookie()
+    cookie[LAST_WRITE_COOKIE] = f"{last_write:.3f}"
+    cookie[LAST_WRITE_COOKIE]["max-age"] = ceil(max_age_seconds)
+    cookie[LAST_WRITE_COOKIE]["path"] = "/"
+    cookie[LAST_WRITE_COOKIE]["httponly"] = True
+    cookie[LAST_WRITE_COOKIE]["samesite"] = "lax"
+
+    return cookie.output(header="").strip()
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app: ASGIApp, config: DataBaseConfig) -> None:
+        self.app = app
+        self._config = config
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._config.read_your_writes_seconds <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_last_write(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                last_write = scope.get("state", {}).get(LAST_WRITE_STATE)
+                if last_write is not None:
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Set-Cookie",
+                        last_write_cookie(
+                            last_write=last_write,
+                            max_age_seconds=self._config.read_your_writes_seconds,
+                        ),
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_with_last_write)
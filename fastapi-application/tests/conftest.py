@@ -98,3 +98,4 @@ async def session_override(app: FastAPI, connection_test: None) -> None:
             yield session
 
     app.dependency_overrides[db_helper.session_getter] = get_db_override
+    app.dependency_overrides[db_helper.read_session_getter] = get_db_override
@@ -46,12 +46,10 @@ class DatabaseSessionManager:
     async def connect(self) -> AsyncIterator[AsyncConnection]:
         if self._async_engine is None:
             raise Exception("DatabaseSessionManager is not initialized")
-        async with self._async_engine.begin() as connection:
-            try:
-                yield connection
-            except Exception:
-                await connection.rollback()
-                raise
+        # no outer transaction: the migrations begin and commit their own,
+        # which CREATE INDEX CONCURRENTLY needs
+        async with self._async_engine.connect() as connection:
+            yield connection
 
     @asynccontextmanager
     async def session(self) -> AsyncIterator[AsyncSession]:
@@ -7,7 +7,10 @@ import pytest
 import pytest_asyncio
 from httpx import AsyncClient
 from pydantic import HttpUrl
-from sqlalchemy import and_, update
+from pytest_mock import MockFixture
+from sqlalchemy import and_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from api.api_v1.cleanings.models import Cleaning
 from api.api_v1.cleanings.schemas import (
@@ -46,6 +49,12 @@ from core.config import settings
 from tests.database import session_manager
 
 
+async def get_role_permissions(session: AsyncSession, role_id: int) -> list[str]:
+    role = await session.scalar(select(Role).filter_by(id=role_id).options(selectinload(Role.permissions)))
+
+    return [perm.name for perm in role.permissions]
+
+
 @pytest_asyncio.fixture(scope="function")
 async def create_fake_role_and_permission(connection_test: None) -> None:
     user_role = Role(id=1, name="UserAuth")
@@ -91,7 +100,7 @@ async def create_fake_user(
             email_verified=user.email_verified,
             is_active=user.is_active,
             profile_exists=user.profile_exists,
-            permissions=[perm.name for perm in user.role.permissions],
+            permissions=await get_role_permissions(session=session, role_id=user.role_id),
         )
 
 
@@ -117,7 +126,7 @@ def create_specific_user(
             session.add(user)
             await session.commit()
             await session.refresh(user)
-            permissions = [perm.name for perm in user.role.permissions]
+            permissions = await get_role_permissions(session=session, role_id=user.role_id)
             return UserAuthSchema(permissions=permissions, **user.as_dict())
 
     return _create_user
@@ -138,6 +147,20 @@ def authorized_client(
     return client
 
 
+@pytest.fixture(scope="function")
+def internal_client(
+    client: AsyncClient,
+    mocker: MockFixture,
+) -> AsyncClient:
+    mocker.patch.object(settings.api.internal, "token", "internal-token")
+    client.headers = {
+        **client.headers,
+        "Authorization": "Bearer internal-token",
+    }
+
+    return client
+
+
 @pytest.fixture
 def create_fake_profile() -> Callable[[str, UserAuthSchema], ProfileInDB]:
     def _create_profile(member_type: str, user_in: UserAuthSchema) -> ProfileInDB:
@@ -188,8 +211,7 @@ async def create_fake_customer_profile(
         )
         await session.flush()
         await session.commit()
-
-    permissions = [perm.name for perm in user_auth_customer.role.permissions]
+        permissions = await get_role_permissions(session=session, role_id=user_auth_customer.role_id)
 
     return UserAuthSchema(
         permissions=permissions,
@@ -214,8 +236,7 @@ async def create_fake_cleaner_profile(
         )
         await session.flush()
         await session.commit()
-
-    permissions = [perm.name for perm in user_auth_cleaner.role.permissions]
+        permissions = await get_role_permissions(session=session, role_id=user_auth_cleaner.role_id)
 
     return UserAuthSchema(
         permissions=permissions,
@@ -240,7 +261,7 @@ async def create_fake_inactive_user(
             email_verified=user.email_verified,
             is_active=user.is_active,
             profile_exists=user.profile_exists,
-            permissions=[perm.name for perm in user.role.permissions],
+            permissions=await get_role_permissions(session=session, role_id=user.role_id),
         )
 
 
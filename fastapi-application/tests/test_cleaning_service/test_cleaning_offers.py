@@ -249,7 +249,7 @@ class TestShowOffersForCleaningOwners:
                 cleaning_id=create_fake_cleaning.id,
             )
         )
-        resp_offer_public_list = [OfferPublic(**of) for of in response.json()]
+        resp_offer_public_list = [OfferPublic(**of) for of in response.json()["items"]]
         assert len(resp_offer_public_list) == 1
         resp_offer_public = resp_offer_public_list[0]
         assert resp_offer_public.offerer_id == create_offer_in_db.offerer_id
@@ -269,7 +269,7 @@ class TestShowOffersForCleaningOwners:
                 cleaning_id=create_fake_cleaning.id,
             )
         )
-        assert len(response.json()) == 0
+        assert response.json()["items"] == []
         assert response.status_code == status.HTTP_200_OK
 
     async def test_show_offers_by_cleaning_id_perm_denied(
@@ -541,3 +541,59 @@ class TestCleaningOwnerRejectOffer:
             )
         )
         assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestCleaningOwnerUpdateManyOffers:
+
+    async def test_cleaning_owner_accept_many_offers(
+        self,
+        app: FastAPI,
+        authorized_client_cleaner: AsyncClient,
+        create_fake_cleaning: CleaningPublic,
+        create_offer_in_db: OfferPublic,
+    ) -> None:
+        response = await authorized_client_cleaner.put(
+            app.url_path_for(
+                "offers-cleanings:cleaning-owner-update-many-offers",
+                cleaning_id=create_fake_cleaning.id,
+            ),
+            json={"status": "accepted", "offerer_ids": [str(create_offer_in_db.offerer_id), str(uuid4())]},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        offers = [OfferPublic(**offer) for offer in response.json()]
+        assert [(offer.offerer_id, offer.status) for offer in offers] == [(create_offer_in_db.offerer_id, "accepted")]
+
+    async def test_cleaning_owner_update_many_offers_skips_invalid_status(
+        self,
+        app: FastAPI,
+        authorized_client_cleaner: AsyncClient,
+        create_fake_cleaning: CleaningPublic,
+        change_offer_status: Callable[[str], Awaitable[OfferPublic]],
+    ) -> None:
+        set_status = await change_offer_status("rejected")
+        response = await authorized_client_cleaner.put(
+            app.url_path_for(
+                "offers-cleanings:cleaning-owner-update-many-offers",
+                cleaning_id=create_fake_cleaning.id,
+            ),
+            json={"status": "accepted", "offerer_ids": [str(set_status.offerer_id)]},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == []
+
+    async def test_cleaning_owner_update_many_offers_invalid_target_status(
+        self,
+        app: FastAPI,
+        authorized_client_cleaner: AsyncClient,
+        create_fake_cleaning: CleaningPublic,
+        create_offer_in_db: OfferPublic,
+    ) -> None:
+        response = await authorized_client_cleaner.put(
+            app.url_path_for(
+                "offers-cleanings:cleaning-owner-update-many-offers",
+                cleaning_id=create_fake_cleaning.id,
+            ),
+            json={"status": "completed", "offerer_ids": [str(create_offer_in_db.offerer_id)]},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json().get("detail") == "Offers can only be accepted or rejected"
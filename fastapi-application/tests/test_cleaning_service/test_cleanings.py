@@ -18,6 +18,7 @@ from api.api_v1.cleanings.schemas import (
 )
 from api.api_v1.users.schemas import UserPublic
 from auth.schemas import UserAuthSchema
+from crud.cleanings import cleanings_crud
 from tests.database import session_manager
 
 pytestmark = pytest.mark.asyncio
@@ -309,6 +310,35 @@ class TestCleaningsCreate:
         )
         assert response.status_code == status_code
 
+    async def test_create_many_cleanings(
+        self,
+        app: FastAPI,
+        authorized_client_cleaner: AsyncClient,
+    ) -> None:
+        payload = [
+            {"name": f"cleaning {i}", "price": 10.0 + i, "description": None, "cleaning_type": "dust up"}
+            for i in range(3)
+        ]
+        response = await authorized_client_cleaner.post(
+            app.url_path_for("cleanings:create-many-cleanings"),
+            json=payload,
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert [cleaning["name"] for cleaning in response.json()] == [item["name"] for item in payload]
+        response = await authorized_client_cleaner.get(app.url_path_for("cleanings:get-all-cleanings"))
+        assert response.json()["count"] == 3
+
+    async def test_create_many_cleanings_empty_list(
+        self,
+        app: FastAPI,
+        authorized_client_cleaner: AsyncClient,
+    ) -> None:
+        response = await authorized_client_cleaner.post(
+            app.url_path_for("cleanings:create-many-cleanings"),
+            json=[],
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
 
 class TestCleaningsGetByID:
 
@@ -429,18 +459,81 @@ class TestCleaningsGetAllCleanings:
     ) -> None:
         response = await authorized_client_cleaner.get(app.url_path_for("cleanings:get-all-cleanings"))
         cleaning_schemas = [CleaningPublic(**cl.as_dict()) for cl in create_fake_multiple_cleanings]
-        cleaning_resp = [CleaningPublic(**rs) for rs in response.json()]
+        cleaning_resp = [CleaningPublic(**rs) for rs in response.json()["items"]]
         assert cleaning_resp == cleaning_schemas
-        assert len(response.json()) == len(create_fake_multiple_cleanings)
+        assert response.json()["count"] == len(create_fake_multiple_cleanings)
+        assert response.json()["next_cursor"] is None
         assert response.status_code == status.HTTP_200_OK
 
+    async def test_get_user_all_cleanings_pages(
+        self,
+        app: FastAPI,
+        authorized_client_cleaner: AsyncClient,
+        create_fake_multiple_cleanings: list[Cleaning],
+    ) -> None:
+        url = app.url_path_for("cleanings:get-all-cleanings")
+        cleaning_ids = [cl.id for cl in create_fake_multiple_cleanings]
+        first_page = (await authorized_client_cleaner.get(url, params={"max_results": 1})).json()
+        assert [cl["id"] for cl in first_page["items"]] == cleaning_ids[:1]
+        assert first_page["previous_cursor"] is None
+        second_page = (
+            await authorized_client_cleaner.get(url, params={"max_results": 1, "cursor": first_page["next_cursor"]})
+        ).json()
+        assert [cl["id"] for cl in second_page["items"]] == cleaning_ids[1:2]
+        assert second_page["next_cursor"] is None
+        previous_page = (
+            await authorized_client_cleaner.get(
+                url, params={"max_results": 1, "cursor": second_page["previous_cursor"]}
+            )
+        ).json()
+        assert previous_page["items"] == first_page["items"]
+        assert previous_page["previous_cursor"] is None
+
+    async def test_get_user_all_cleanings_invalid_cursor(
+        self,
+        app: FastAPI,
+        authorized_client_cleaner: AsyncClient,
+    ) -> None:
+        response = await authorized_client_cleaner.get(
+            app.url_path_for("cleanings:get-all-cleanings"),
+            params={"cursor": "not-a-cursor"},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json().get("detail") == "Invalid cursor"
+
+    async def test_read_path_matches_orm_path(
+        self,
+        create_fake_multiple_cleanings: list[Cleaning],
+    ) -> None:
+        owner = create_fake_multiple_cleanings[0].owner
+        async with session_manager.session() as session:
+            cleanings = await cleanings_crud.read_many(session=session, schema=CleaningPublic, owner=owner)
+            assert len(session.identity_map) == 0
+            entities = await cleanings_crud.get_many_records(session=session, owner=owner)
+        assert cleanings == [CleaningPublic(**cl.as_dict()) for cl in entities]
+        statement = cleanings_crud._get_rows_statement(schema=CleaningPublic, keys=("owner",))
+        assert "created_at" not in statement.selected_columns
+
+    async def test_get_all_cleanings_is_not_capped(
+        self,
+        create_fake_cleaner_profile: UserAuthSchema,
+        create_cleaning: CleaningCreate,
+    ) -> None:
+        owner = create_fake_cleaner_profile.id
+        cleaning = CleaningInDB(owner=owner, **create_cleaning.model_dump()).model_dump()
+        async with session_manager.session() as session:
+            await session.execute(insert(Cleaning), [cleaning] * 101)
+            await session.commit()
+            cleanings = await cleanings_crud.get_all_cleanings(session=session, user_id=owner)
+        assert len(cleanings) == 101
+
     async def test_get_user_all_cleanings_empty_list(
         self,
         app: FastAPI,
         authorized_client_cleaner: AsyncClient,
     ) -> None:
         response = await authorized_client_cleaner.get(app.url_path_for("cleanings:get-all-cleanings"))
-        assert len(response.json()) == 0
+        assert response.json()["items"] == []
         assert response.status_code == status.HTTP_200_OK
 
 
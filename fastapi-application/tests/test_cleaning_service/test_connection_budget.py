@@ -0,0 +1,56 @@
+import pytest
+from pytest_mock import MockFixture
+
+from core.config import settings
+from core.models.connection_budget import (
+    ConnectionBudgetError,
+    ConnectionPlan,
+    check_connection_plan,
+    get_connection_limit,
+    get_replica_connection_plan,
+    plan_connections,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+def make_url(test_db) -> str:
+    return f"postgresql+psycopg://{test_db.user}:{test_db.password}" f"@{test_db.host}:{test_db.port}/{test_db.dbname}"
+
+
+class TestConnectionBudget:
+
+    async def test_budget_caps_workers_and_pool(self) -> None:
+        plan = plan_connections(budget=90, max_workers=33, pool_size=50, max_overflow=10)
+        assert plan == ConnectionPlan(workers=22, pool_size=4, max_overflow=0)
+        assert plan.total_connections <= 90
+
+        plan = plan_connections(budget=90, max_workers=5, pool_size=50, max_overflow=10)
+        assert plan == ConnectionPlan(workers=5, pool_size=15, max_overflow=3)
+        assert plan.total_connections == 90
+
+    async def test_without_budget_pool_settings_are_kept(self) -> None:
+        plan = plan_connections(budget=None, max_workers=33, pool_size=50, max_overflow=10)
+        assert plan.total_connections == 33 * 60
+
+    async def test_budget_covers_replica_pools(self, mocker: MockFixture) -> None:
+        mocker.patch.object(settings.db, "connection_budget", 90)
+        plan = get_replica_connection_plan(workers=5)
+        assert plan == ConnectionPlan(workers=5, pool_size=15, max_overflow=3)
+
+        mocker.patch.object(settings.db, "connection_budget", None)
+        plan = get_replica_connection_plan(workers=5)
+        assert (plan.pool_size, plan.max_overflow) == (settings.db.replica_pool_size, settings.db.replica_max_overflow)
+
+    async def test_budget_below_one_worker_is_refused(self) -> None:
+        with pytest.raises(ConnectionBudgetError):
+            plan_connections(budget=3, max_workers=4, pool_size=50, max_overflow=10, min_connections_per_worker=4)
+
+    async def test_plan_above_database_limit_is_refused(self, test_db, connection_test: None) -> None:
+        url = make_url(test_db)
+        limit = await get_connection_limit(url=url)
+        assert limit > 0
+
+        await check_connection_plan(plan=ConnectionPlan(workers=1, pool_size=limit, max_overflow=0), url=url)
+        with pytest.raises(ConnectionBudgetError):
+            await check_connection_plan(plan=ConnectionPlan(workers=33, pool_size=50, max_overflow=limit), url=url)
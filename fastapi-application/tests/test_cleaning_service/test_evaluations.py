@@ -11,11 +11,19 @@ from fastapi import (
     status,
 )
 from httpx import AsyncClient
-from sqlalchemy import insert
+from sqlalchemy import (
+    delete,
+    insert,
+    select,
+    update,
+)
 
 from api.api_v1.cleanings.models import Cleaning
 from api.api_v1.cleanings.schemas import CleaningPublic
-from api.api_v1.evaluations.models import CleanerEvaluation
+from api.api_v1.evaluations.models import (
+    CleanerEvaluation,
+    CleanerStats,
+)
 from api.api_v1.evaluations.schemas import (
     EvaluationAggregate,
     EvaluationCreate,
@@ -27,6 +35,7 @@ from api.api_v1.offers.schemas import (
     OfferPublic,
 )
 from auth.schemas import UserAuthSchema
+from crud.evaluations import evaluations_crud
 from tests.database import session_manager
 
 pytestmark = pytest.mark.asyncio
@@ -277,7 +286,7 @@ class TestShowAllEvalsForSpecificCleaner:
                 cleaner_id=create_eval_in_db.cleaner_id,
             )
         )
-        list_evals_public = [EvaluationPublic(**ev) for ev in response.json()]
+        list_evals_public = [EvaluationPublic(**ev) for ev in response.json()["items"]]
         eval_public = list_evals_public[0]
         assert len(list_evals_public) == 1
         assert eval_public.cleaner_id == create_fake_cleaner_profile.id
@@ -328,3 +337,77 @@ class TestShowStatsAboutCleaningSpecialist:
             )
         )
         assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_show_stats_cleaner_without_evaluations(
+        self,
+        app: FastAPI,
+        authorized_client: AsyncClient,
+        create_fake_cleaner_profile: UserAuthSchema,
+    ) -> None:
+        response = await authorized_client.get(
+            app.url_path_for(
+                "evaluations:show-stats-about-cleaner",
+                cleaner_id=create_fake_cleaner_profile.id,
+            )
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestCleanerStats:
+
+    async def test_stats_follow_evaluation_writes(
+        self,
+        create_fake_cleaner_profile: UserAuthSchema,
+        create_evaluation: EvaluationCreate,
+    ) -> None:
+        cleaner_id = create_fake_cleaner_profile.id
+        evaluations = [
+            {**create_evaluation.model_dump(), "overall_rating": rating, "no_show": rating == 1}
+            for rating in (1, 5, 3)
+        ]
+        evaluations[2]["professionalism"] = None
+        async with session_manager.session() as session:
+            ids = await session.scalars(
+                insert(CleanerEvaluation)
+                .returning(CleanerEvaluation.id)
+                .values([{**evaluation, "owner": uuid4(), "cleaner_id": cleaner_id} for evaluation in evaluations])
+            )
+            first, second, _ = ids.all()
+            await session.commit()
+
+        async with session_manager.session() as session:
+            stats = await session.scalar(select(CleanerStats).filter_by(cleaner_id=cleaner_id))
+            assert (stats.total_evaluations, stats.total_no_show, stats.sum_overall_rating) == (3, 1, 9)
+            assert (stats.min_overall_rating, stats.max_overall_rating) == (1, 5)
+            assert (stats.one_stars, stats.three_stars, stats.five_stars) == (1, 1, 1)
+            assert stats.count_professionalism == 2
+            assert await evaluations_crud.verify_cleaner_stats(session=session) == []
+
+            await session.execute(update(CleanerEvaluation).filter_by(id=second).values(overall_rating=2))
+            await session.execute(delete(CleanerEvaluation).filter_by(id=first))
+            await session.commit()
+
+        async with session_manager.session() as session:
+            stats = await session.scalar(select(CleanerStats).filter_by(cleaner_id=cleaner_id))
+            assert (stats.total_evaluations, stats.total_no_show, stats.sum_overall_rating) == (2, 0, 5)
+            assert (stats.min_overall_rating, stats.max_overall_rating) == (2, 3)
+            assert (stats.one_stars, stats.two_stars, stats.five_stars) == (0, 1, 0)
+            assert await evaluations_crud.verify_cleaner_stats(session=session) == []
+
+            await session.execute(delete(CleanerEvaluation).filter_by(cleaner_id=cleaner_id))
+            await session.commit()
+
+        async with session_manager.session() as session:
+            assert await session.scalar(select(CleanerStats).filter_by(cleaner_id=cleaner_id)) is None
+
+    async def test_rebuild_repairs_drifted_stats(
+        self,
+        create_eval_in_db: EvaluationPublic,
+    ) -> None:
+        async with session_manager.session() as session:
+            await session.execute(update(CleanerStats).values(total_evaluations=42))
+            await session.commit()
+            assert await evaluations_crud.verify_cleaner_stats(session=session) == [create_eval_in_db.cleaner_id]
+
+            assert await evaluations_crud.rebuild_cleaner_stats(session=session) == 1
+            assert await evaluations_crud.verify_cleaner_stats(session=session) == []
@@ -0,0 +1,72 @@
+import asyncio
+from time import monotonic
+
+import pytest
+from fastapi import (
+    FastAPI,
+    status,
+)
+from httpx import AsyncClient
+from pytest_mock import MockFixture
+
+from core.config import RouteGroupLimitConfig
+from core.models.pool import pool_wait_tracker
+from server.utils.load_shedding import (
+    REQUESTS_SHED,
+    AIMDLimiter,
+    Overloaded,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestLoadShedding:
+
+    async def test_limit_shrinks_on_slow_and_grows_on_fast_requests(self) -> None:
+        limiter = AIMDLimiter(
+            name="test",
+            config=RouteGroupLimitConfig(initial_limit=10, min_limit=2, max_limit=20, target_latency=0.1),
+        )
+        await limiter.acquire()
+        limiter.release(latency=1.0)
+        assert limiter.limit == pytest.approx(9.0)
+        for _ in range(5):
+            await limiter.acquire()
+        limiter.release(latency=0.01)
+        assert limiter.limit > 9.0
+        assert limiter.in_flight == 4
+
+    async def test_request_above_limit_waits_for_a_slot_or_is_shed(self) -> None:
+        limiter = AIMDLimiter(
+            name="test",
+            config=RouteGroupLimitConfig(
+                initial_limit=1,
+                min_limit=1,
+                max_limit=1,
+                target_latency=0.01,
+                max_queue_wait=0.05,
+            ),
+        )
+        await limiter.acquire()
+        with pytest.raises(Overloaded):
+            await limiter.acquire()
+        waiting = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        limiter.release(latency=0.01)
+        await waiting
+        assert limiter.in_flight == 1
+        assert limiter.queued == 0
+
+    async def test_shed_when_db_pool_wait_exceeds_budget(
+        self,
+        app: FastAPI,
+        client: AsyncClient,
+        mocker: MockFixture,
+    ) -> None:
+        mocker.patch.object(pool_wait_tracker, "_average", 10.0)
+        mocker.patch.object(pool_wait_tracker, "_updated_at", monotonic())
+        shed_before = REQUESTS_SHED.value(group="read", reason="db_pool_wait")
+        response = await client.get(app.url_path_for("cleanings:get-all-cleanings"))
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers["Retry-After"] == "1"
+        assert REQUESTS_SHED.value(group="read", reason="db_pool_wait") == shed_before + 1
@@ -512,7 +512,7 @@ class TestShowSelfOffers:
         create_offer_in_db: OfferPublic,
     ) -> None:
         response = await authorized_client_customer.get(app.url_path_for("offers:show-all-self-offers"))
-        offers_list = [OfferPublic(**of) for of in response.json()]
+        offers_list = [OfferPublic(**of) for of in response.json()["items"]]
         assert len(offers_list) == 1
         assert response.status_code == status.HTTP_200_OK
 
@@ -522,7 +522,7 @@ class TestShowSelfOffers:
         authorized_client_customer: AsyncClient,
     ) -> None:
         response = await authorized_client_customer.get(app.url_path_for("offers:show-all-self-offers"))
-        offers_list = [OfferPublic(**of) for of in response.json()]
+        offers_list = [OfferPublic(**of) for of in response.json()["items"]]
         assert len(offers_list) == 0
         assert response.status_code == status.HTTP_200_OK
 
@@ -0,0 +1,113 @@
+import pytest
+from fastapi import (
+    FastAPI,
+    status,
+)
+from httpx import AsyncClient
+from pytest_mock import MockFixture
+
+from api.api_v1.users.models import User
+from auth.schemas import UserAuthSchema
+from auth.utils.auth_utils import (
+    get_hash_rounds,
+    hash_password,
+)
+from auth.utils.password_hasher import (
+    HASH_DURATION,
+    HASH_REJECTED,
+    calibrate_rounds,
+    password_hasher,
+)
+from auth.utils.password_rehash import password_rehash_queue
+from tests.database import session_manager
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestPasswordHasher:
+
+    async def test_hash_and_verify(self) -> None:
+        hashed = await password_hasher.hash(plaintext_password="secretpasswordD1@")
+        assert await password_hasher.verify(
+            plaintext_password="secretpasswordD1@",
+            hashed_password=hashed,
+        )
+        assert not await password_hasher.verify(
+            plaintext_password="wrongpasswordD1@",
+            hashed_password=hashed,
+        )
+        assert password_hasher.pending == 0
+
+    async def test_signin_records_hash_duration(
+        self,
+        app: FastAPI,
+        client: AsyncClient,
+        create_fake_user: UserAuthSchema,
+    ) -> None:
+        verified_before = HASH_DURATION.count(operation="verify")
+        response = await client.post(
+            app.url_path_for("auth:auth-user-issue-jwt"),
+            data={"username": "fakeuser@gmail.com", "password": "secretpasswordD1@"},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert HASH_DURATION.count(operation="verify") == verified_before + 1
+
+    async def test_signin_rejected_when_saturated(
+        self,
+        app: FastAPI,
+        client: AsyncClient,
+        create_fake_user: UserAuthSchema,
+        mocker: MockFixture,
+    ) -> None:
+        mocker.patch.object(password_hasher, "_max_pending", 0)
+        rejected_before = HASH_REJECTED.value(operation="verify")
+        response = await client.post(
+            app.url_path_for("auth:auth-user-issue-jwt"),
+            data={"username": "fakeuser@gmail.com", "password": "secretpasswordD1@"},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers["Retry-After"] == "1"
+        assert HASH_REJECTED.value(operation="verify") == rejected_before + 1
+
+    async def test_internal_metrics_exposes_hashing(
+        self,
+        app: FastAPI,
+        internal_client: AsyncClient,
+    ) -> None:
+        await password_hasher.hash(plaintext_password="secretpasswordD1@")
+        response = await internal_client.get(app.url_path_for("internal:metrics"))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["password_hashing_duration_seconds"]["type"] == "histogram"
+
+    async def test_calibrated_rounds_stay_within_bounds(self) -> None:
+        assert calibrate_rounds(target_seconds=0.0, min_rounds=4, max_rounds=6) == 4
+        assert 4 <= calibrate_rounds(target_seconds=60.0, min_rounds=4, max_rounds=6) <= 6
+        assert get_hash_rounds(hash_password(plaintext_password="secret", rounds=5)) == 5
+
+    async def test_signin_rehashes_outdated_hash(
+        self,
+        app: FastAPI,
+        client: AsyncClient,
+        create_fake_user: UserAuthSchema,
+        mocker: MockFixture,
+    ) -> None:
+        async with session_manager.session() as session:
+            user = await session.get(User, create_fake_user.id)
+            user.password = hash_password(plaintext_password="secretpasswordD1@", rounds=4)
+            await session.commit()
+        mocker.patch.object(password_hasher, "rounds", 5)
+        response = await client.post(
+            app.url_path_for("auth:auth-user-issue-jwt"),
+            data={"username": "fakeuser@gmail.com", "password": "secretpasswordD1@"},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert len(password_rehash_queue) == 1
+        async with session_manager.session() as session:
+            assert await password_rehash_queue.flush(session=session) == 1
+            user = await session.get(User, create_fake_user.id)
+        assert get_hash_rounds(user.password) == 5
+        assert not password_hasher.needs_rehash(user.password)
+        assert not password_hasher.needs_rehash(hash_password(plaintext_password="secret", rounds=6))
@@ -0,0 +1,85 @@
+from typing import AsyncGenerator
+
+import asyncpg
+import pytest
+import pytest_asyncio
+from pytest_mock import MockFixture
+from sqlalchemy import text
+
+from core.models.db_helper import DataBaseHelper
+from tests.transaction_pooler import TransactionPooler
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+COUNT_USERS = text("SELECT count(*) FROM users WHERE email LIKE :pattern")
+
+
+@pytest_asyncio.fixture(scope="function")
+async def pooler(test_db, connection_test: None) -> AsyncGenerator[TransactionPooler, None]:
+    _pooler = TransactionPooler(backend_host=test_db.host, backend_port=test_db.port)
+    await _pooler.start()
+
+    yield _pooler
+    await _pooler.stop()
+
+
+def make_workers(test_db, pooler: TransactionPooler, pgbouncer: bool, count: int = 2) -> list[DataBaseHelper]:
+    """
+    One database helper per simulated gunicorn worker, all connected
+    through the pooler.
+    """
+    url = f"postgresql+asyncpg://{test_db.user}:{test_db.password}" f"@127.0.0.1:{pooler.port}/{test_db.dbname}"
+
+    return [
+        DataBaseHelper(
+            url=url,
+            echo=False,
+            echo_pool=False,
+            pool_pre_ping=False,
+            pool_size=2,
+            max_overflow=0,
+            pgbouncer=pgbouncer,
+        )
+        for _ in range(count)
+    ]
+
+
+class TestPgBouncerMode:
+
+    async def test_workers_share_one_server_connection(
+        self,
+        test_db,
+        pooler: TransactionPooler,
+    ) -> None:
+        workers = make_workers(test_db=test_db, pooler=pooler, pgbouncer=True)
+        try:
+            for _ in range(3):
+                for worker in workers:
+                    async with worker.get_ctx_async_session() as session:
+                        assert await session.scalar(COUNT_USERS, {"pattern": "%@example.com"}) == 0
+                        assert await session.scalar(text("SELECT CAST(:value AS integer)"), {"value": 42}) == 42
+                        await session.commit()
+        finally:
+            for worker in workers:
+                await worker.dispose()
+
+        assert pooler.backend_connections == 1
+        assert pooler.client_connections >= len(workers) * 3
+
+    async def test_named_statements_collide_without_pgbouncer_mode(
+        self,
+        mocker: MockFixture,
+        test_db,
+        pooler: TransactionPooler,
+    ) -> None:
+        workers = make_workers(test_db=test_db, pooler=pooler, pgbouncer=False)
+        try:
+            with pytest.raises(Exception, match="already exists"):
+                for worker in workers:
+                    # asyncpg numbers statement names per process, every gunicorn worker starts from zero
+                    mocker.patch.object(asyncpg.connection, "_uid", 0)
+                    async with worker.get_ctx_async_session() as session:
+                        await session.scalar(COUNT_USERS, {"pattern": "%@example.com"})
+        finally:
+            for worker in workers:
+                await worker.dispose()
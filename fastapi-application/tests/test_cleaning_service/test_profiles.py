@@ -1,3 +1,5 @@
+import asyncio
+from collections.abc import Callable
 from typing import Any
 
 import pytest
@@ -13,10 +15,12 @@ from api.api_v1.profiles.models import Profile
 from api.api_v1.profiles.schemas import (
     MemberType,
     ProfileCreate,
+    ProfileInDB,
     ProfilePublic,
     ProfileUpdate,
 )
 from auth.schemas import UserAuthSchema
+from crud.profiles import profiles_crud
 from tests.database import session_manager
 
 pytestmark = pytest.mark.asyncio
@@ -317,6 +321,24 @@ class TestProfilesCreate:
         )
         assert resp.status_code == status.HTTP_409_CONFLICT
 
+    async def test_concurrent_create_profile_creates_one(
+        self,
+        create_fake_user: UserAuthSchema,
+        create_fake_profile: Callable[[str, UserAuthSchema], ProfileInDB],
+    ) -> None:
+        async def create() -> ProfilePublic | None:
+            async with session_manager.session() as session:
+                return await profiles_crud.create_profile(
+                    session=session,
+                    profile_schema=create_fake_profile("customer", create_fake_user),
+                )
+
+        created = await asyncio.gather(create(), create())
+        assert sum(profile is not None for profile in created) == 1
+        async with session_manager.session() as session:
+            profiles = await session.scalars(select(Profile).filter_by(user_id=create_fake_user.id))
+            assert len(profiles.all()) == 1
+
 
 class TestGetSelfProfile:
     async def test_get_user_auth_self_customer_profile(
@@ -0,0 +1,102 @@
+import asyncio
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from fastapi import (
+    Request,
+    status,
+)
+from sqlalchemy import text
+
+from core.models.db_helper import DataBaseHelper
+from core.models.query_deadline import (
+    StatementTimeoutError,
+    cancel_on_disconnect,
+    is_query_canceled,
+)
+from core.models.query_stats import (
+    QueryStats,
+    current_query_stats,
+)
+from server.utils.exception_handlers import statement_timeout_handler
+
+pytestmark = pytest.mark.asyncio
+
+
+def make_request(receive=None) -> Request:
+    scope = {"type": "http", "method": "GET", "path": "/stats", "headers": []}
+    if receive is None:
+        return Request(scope=scope)
+
+    return Request(scope=scope, receive=receive)
+
+
+@pytest_asyncio.fixture(scope="function")
+async def deadline_db_helper(test_db, connection_test: None) -> AsyncGenerator[DataBaseHelper, None]:
+    helper = DataBaseHelper(
+        url=(
+            f"postgresql+psycopg://{test_db.user}:{test_db.password}"
+            f"@{test_db.host}:{test_db.port}/{test_db.dbname}"
+        ),
+        echo=False,
+        echo_pool=False,
+        pool_pre_ping=False,
+        pool_size=2,
+        max_overflow=0,
+        statement_timeout_seconds=0.2,
+    )
+
+    yield helper
+    await helper.dispose()
+
+
+class TestQueryDeadline:
+
+    async def test_slow_statement_is_cancelled_and_answered_with_504(
+        self,
+        deadline_db_helper: DataBaseHelper,
+    ) -> None:
+        async with deadline_db_helper.session_factory() as session:
+            with pytest.raises(StatementTimeoutError) as exc_info:
+                await session.execute(text("SELECT pg_sleep(2)"))
+        assert is_query_canceled(exc_info.value)
+
+        response = await statement_timeout_handler(make_request(), exc_info.value)
+        assert response.status_code == status.HTTP_504_GATEWAY_TIMEOUT
+
+    async def test_default_timeout_is_set_once_per_connection(
+        self,
+        deadline_db_helper: DataBaseHelper,
+    ) -> None:
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        try:
+            async with deadline_db_helper.session_factory() as session:
+                session.info["request"] = make_request()
+                assert await session.scalar(text("SHOW statement_timeout")) == "200ms"
+        finally:
+            current_query_stats.reset(token)
+        assert stats.count == 1
+
+    async def test_route_overrides_the_default_timeout(
+        self,
+        deadline_db_helper: DataBaseHelper,
+    ) -> None:
+        request = make_request()
+        request.state.statement_timeout = 5.0
+        async with deadline_db_helper.session_factory() as session:
+            session.info["request"] = request
+            assert await session.scalar(text("SHOW statement_timeout")) == "5s"
+            await session.execute(text("SELECT pg_sleep(0.3)"))
+
+    async def test_client_disconnect_cancels_the_handler(self) -> None:
+        async def receive() -> dict[str, str]:
+            return {"type": "http.disconnect"}
+
+        async def handler() -> None:
+            async with cancel_on_disconnect(request=make_request(receive=receive), poll_interval=0.01):
+                await asyncio.sleep(5)
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(asyncio.create_task(handler()), timeout=1)
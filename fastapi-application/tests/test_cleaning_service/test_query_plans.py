@@ -0,0 +1,188 @@
+import json
+from collections.abc import (
+    Awaitable,
+    Callable,
+    Iterator,
+)
+from contextlib import contextmanager
+from typing import Any
+
+import pytest
+from sqlalchemy import (
+    event,
+    text,
+)
+from starlette.requests import Request
+
+from api.api_v1.cleanings.schemas import (
+    CleaningInDB,
+    CleaningPublic,
+    CleaningType,
+)
+from api.api_v1.evaluations.schemas import EvaluationInDB
+from api.api_v1.offers.schemas import (
+    OfferPublic,
+    OfferStatus,
+)
+from auth.schemas import UserAuthSchema
+from crud.cleanings import cleanings_crud
+from crud.evaluations import evaluations_crud
+from crud.offers import offers_crud
+from crud.profiles import profiles_crud
+from crud.users import users_crud
+from server.utils.middlewares import request_object
+from tests.database import session_manager
+
+pytestmark = pytest.mark.asyncio
+
+SEEDED_CLEANINGS = 200
+
+
+@contextmanager
+def capture_statements() -> Iterator[list[tuple[str, Any]]]:
+    statements: list[tuple[str, Any]] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            statements.append((statement, parameters))
+
+    engine = session_manager._async_engine.sync_engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def scanned_relations(plan: dict[str, Any]) -> Iterator[tuple[str, str | None]]:
+    yield plan["Node Type"], plan.get("Relation Name")
+    for child in plan.get("Plans", []):
+        yield from scanned_relations(child)
+
+
+class TestHotQueryPlans:
+    """
+    Runs EXPLAIN on the statements of the hot CRUD queries and fails when
+    one of them can only be answered with a sequential scan. The tables
+    are small, so sequential scans are made as expensive as the planner
+    allows and an index is used wherever one matches.
+    """
+
+    @pytest.fixture(autouse=True)
+    def fake_request(self) -> Iterator[None]:
+        token = request_object.set(
+            Request({"type": "http", "scheme": "http", "server": ("test", 80), "path": "/", "headers": []})
+        )
+        yield
+        request_object.reset(token)
+
+    async def seed(self, cleaner: UserAuthSchema, customer: UserAuthSchema) -> None:
+        async with session_manager.session() as session:
+            await cleanings_crud.create_cleanings(
+                session=session,
+                cleanings=[
+                    CleaningInDB(
+                        name=f"cleaning {i}",
+                        price=20.0,
+                        description=None,
+                        cleaning_type=CleaningType.spot_clean,
+                        owner=cleaner.id,
+                    )
+                    for i in range(SEEDED_CLEANINGS)
+                ],
+            )
+            await evaluations_crud.create_evaluation(
+                session=session,
+                evaluation=EvaluationInDB(
+                    owner=customer.id,
+                    cleaner_id=cleaner.id,
+                    headline=None,
+                    comment=None,
+                    professionalism=5,
+                    completeness=5,
+                    efficiency=5,
+                    overall_rating=5,
+                ),
+            )
+            await session.execute(text("ANALYZE"))
+
+    async def assert_no_seq_scan(self, run: Callable[[Any], Awaitable[Any]]) -> None:
+        async with session_manager.session() as session:
+            with capture_statements() as statements:
+                await run(session)
+            assert statements
+
+            await session.execute(text("SET enable_seqscan = off"))
+            connection = await session.connection()
+            for statement, parameters in statements:
+                res = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                plan = res.scalar_one()
+                plan = json.loads(plan) if isinstance(plan, str) else plan
+                seq_scans = [
+                    relation for node_type, relation in scanned_relations(plan[0]["Plan"]) if node_type == "Seq Scan"
+                ]
+                assert seq_scans == [], f"sequential scan on {seq_scans} for:\n{statement}"
+
+    async def test_hot_queries_use_indexes(
+        self,
+        create_fake_cleaner_profile: UserAuthSchema,
+        create_fake_customer_profile: UserAuthSchema,
+        create_fake_cleaning: CleaningPublic,
+        create_offer_in_db: OfferPublic,
+    ) -> None:
+        cleaner, customer = create_fake_cleaner_profile, create_fake_customer_profile
+        await self.seed(cleaner=cleaner, customer=customer)
+
+        async def cleanings_pages(session: Any) -> None:
+            page = await cleanings_crud.get_cleanings_page(
+                session=session,
+                user_id=cleaner.id,
+                max_results=10,
+                cursor=None,
+            )
+            await cleanings_crud.get_cleanings_page(
+                session=session,
+                user_id=cleaner.id,
+                max_results=10,
+                cursor=page["next_cursor"],
+            )
+
+        async def cleaner_evaluations(session: Any) -> None:
+            cleaner_info = await evaluations_crud.get_cleaner_info(session=session, user_id=cleaner.id)
+            await evaluations_crud.get_all_cleaner_evaluations(
+                session=session,
+                cleaner=cleaner_info,
+                max_results=10,
+                cursor=None,
+            )
+            await evaluations_crud.get_cleaner_aggregates(session=session, cleaner=cleaner_info)
+
+        hot_queries: list[Callable[[Any], Awaitable[Any]]] = [
+            lambda session: profiles_crud.get_profile_by_user_id(session=session, user_id=cleaner.id),
+            lambda session: users_crud.get_user_by_email(session=session, email=customer.email),
+            lambda session: cleanings_crud.get_one_cleaning_by_id(
+                session=session,
+                cleaning_id=create_fake_cleaning.id,
+            ),
+            cleanings_pages,
+            lambda session: offers_crud.get_offers_with_status(
+                session=session,
+                user_id=customer.id,
+                status=OfferStatus.pending,
+            ),
+            lambda session: offers_crud.get_all_offers_for_offerer(
+                session=session,
+                user_id=customer.id,
+                max_results=10,
+                cursor=None,
+            ),
+            lambda session: offers_crud.get_offers_for_cleaning_owner(
+                session=session,
+                cleaning_id=create_fake_cleaning.id,
+                max_results=10,
+                cursor=None,
+            ),
+            cleaner_evaluations,
+        ]
+        for run in hot_queries:
+            await self.assert_no_seq_scan(run)
@@ -0,0 +1,227 @@
+from collections.abc import Callable
+from contextlib import contextmanager
+from typing import (
+    AsyncGenerator,
+    Iterator,
+)
+
+import pytest
+import pytest_asyncio
+from fastapi import (
+    FastAPI,
+    status,
+)
+from httpx import AsyncClient
+from pytest_mock import MockFixture
+from sqlalchemy import text
+
+from api.api_v1.cleanings.schemas import (
+    CleaningInDB,
+    CleaningPublic,
+    CleaningType,
+    CleaningUpdate,
+)
+from api.api_v1.evaluations.schemas import EvaluationInDB
+from api.api_v1.offers.schemas import OfferInDB
+from api.api_v1.profiles.schemas import (
+    ProfileInDB,
+    ProfileUpdate,
+)
+from api.api_v1.users.schemas import UserInDB
+from auth.schemas import UserAuthSchema
+from core.config import settings
+from core.models.db_helper import DataBaseHelper
+from core.models.query_stats import (
+    QueryStats,
+    current_query_stats,
+)
+from crud.cleanings import cleanings_crud
+from crud.evaluations import evaluations_crud
+from crud.offers import offers_crud
+from crud.profiles import profiles_crud
+from crud.users import users_crud
+from server.utils.query_stats import QUERY_BUDGET_EXCEEDED
+from utils.metrics.registry import MetricsRegistry
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture(scope="function")
+async def counted_db_helper(test_db, connection_test: None) -> AsyncGenerator[DataBaseHelper, None]:
+    # the settings of the application's helper, so that per-transaction statements are counted too
+    helper = DataBaseHelper(
+        url=(
+            f"postgresql+psycopg://{test_db.user}:{test_db.password}"
+            f"@{test_db.host}:{test_db.port}/{test_db.dbname}"
+        ),
+        echo=False,
+        echo_pool=False,
+        pool_pre_ping=settings.db.pool_pre_ping,
+        pool_size=2,
+        max_overflow=0,
+        statement_timeout_seconds=settings.db.statement_timeout_seconds,
+    )
+
+    yield helper
+    await helper.dispose()
+
+
+@contextmanager
+def count_statements() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_query_stats.reset(token)
+
+
+class TestQueryStats:
+
+    async def test_statements_of_the_current_request_are_counted(
+        self,
+        counted_db_helper: DataBaseHelper,
+    ) -> None:
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        try:
+            async with counted_db_helper.session_factory() as session:
+                await session.execute(text("SELECT 1"))
+                await session.execute(text("SELECT pg_sleep(0.01)"))
+        finally:
+            current_query_stats.reset(token)
+        assert stats.count == 2
+        assert stats.duration >= 0.01
+
+    async def test_response_has_server_timing_and_budget_is_checked(
+        self,
+        app: FastAPI,
+        internal_client: AsyncClient,
+        mocker: MockFixture,
+    ) -> None:
+        mocker.patch.object(settings.db, "route_query_budgets", {"internal:metrics": -1})
+        exceeded_before = QUERY_BUDGET_EXCEEDED.value(route="internal:metrics")
+        response = await internal_client.get(app.url_path_for("internal:metrics"))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["Server-Timing"].startswith("db;dur=")
+        assert QUERY_BUDGET_EXCEEDED.value(route="internal:metrics") == exceeded_before + 1
+
+
+class TestInternalEndpoints:
+
+    async def test_metrics_are_not_served_without_a_token(
+        self,
+        app: FastAPI,
+        client: AsyncClient,
+    ) -> None:
+        response = await client.get(app.url_path_for("internal:metrics"))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_metrics_require_the_token(
+        self,
+        app: FastAPI,
+        client: AsyncClient,
+        mocker: MockFixture,
+    ) -> None:
+        mocker.patch.object(settings.api.internal, "token", "internal-token")
+        response = await client.get(
+            app.url_path_for("internal:metrics"),
+            headers={"Authorization": "Bearer wrong-token"},
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_a_metric_name_keeps_its_type(self) -> None:
+        registry = MetricsRegistry()
+        registry.gauge(name="connections", description="")
+        with pytest.raises(ValueError):
+            registry.counter(name="connections", description="")
+
+
+class TestWriteRoundTrips:
+
+    async def test_create_and_update_cost_one_statement(
+        self,
+        counted_db_helper: DataBaseHelper,
+        create_fake_user: UserAuthSchema,
+        create_fake_cleaning: CleaningPublic,
+        create_fake_profile: Callable[[str, UserAuthSchema], ProfileInDB],
+    ) -> None:
+        async with counted_db_helper.session_factory() as session:
+            with count_statements() as stats:
+                user = await users_crud.create_record(
+                    session=session,
+                    obj_in=UserInDB(email="roundtrip@gmail.com", password=b"secret"),
+                )
+                assert user.as_dict()["created_at"] is not None
+            assert stats.count == 1
+
+            with count_statements() as stats:
+                profile = await profiles_crud.create_record(
+                    session=session,
+                    obj_in=create_fake_profile("customer", create_fake_user),
+                )
+                profile.as_dict()
+            assert stats.count == 1
+
+            with count_statements() as stats:
+                profile = await profiles_crud.update_record(
+                    session=session,
+                    db_obj=profile,
+                    obj_in=ProfileUpdate(first_name="Anna", last_name=None, phone_number=None, avatar=None),
+                )
+                assert profile.as_dict()["updated_at"] >= profile.as_dict()["created_at"]
+            assert stats.count == 1
+
+            with count_statements() as stats:
+                cleaning = await cleanings_crud.create_record(
+                    session=session,
+                    obj_in=CleaningInDB(
+                        name="carpet cleaning",
+                        price=30.0,
+                        description=None,
+                        cleaning_type=CleaningType.full_clean,
+                        owner=create_fake_user.id,
+                    ),
+                )
+                assert cleaning.as_dict()["id"] is not None
+            assert stats.count == 1
+
+            with count_statements() as stats:
+                cleaning = await cleanings_crud.update_record(
+                    session=session,
+                    db_obj=cleaning,
+                    obj_in=CleaningUpdate(name=None, price=35.0, description=None, cleaning_type=CleaningType.dust_up),
+                )
+                assert cleaning.as_dict()["price"] == 35.0
+            assert stats.count == 1
+
+            with count_statements() as stats:
+                offer = await offers_crud.create_record(
+                    session=session,
+                    obj_in=OfferInDB(
+                        offerer_id=create_fake_user.id,
+                        cleaning_id=create_fake_cleaning.id,
+                        status="pending",
+                        requested_date="2025-02-04",
+                        requested_time="14:00",
+                    ),
+                )
+                offer.as_dict()
+            assert stats.count == 1
+
+            with count_statements() as stats:
+                evaluation = await evaluations_crud.create_record(
+                    session=session,
+                    obj_in=EvaluationInDB(
+                        owner=create_fake_user.id,
+                        cleaner_id=create_fake_cleaning.owner,
+                        headline=None,
+                        comment=None,
+                        professionalism=None,
+                        completeness=None,
+                        efficiency=None,
+                        overall_rating=5,
+                    ),
+                )
+                assert evaluation.as_dict()["id"] is not None
+            assert stats.count == 1
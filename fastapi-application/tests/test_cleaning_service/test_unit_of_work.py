@@ -0,0 +1,92 @@
+from collections.abc import Callable
+
+import pytest
+from pytest_mock import MockFixture
+from sqlalchemy import select
+
+from api.api_v1.cleanings.models import Cleaning
+from api.api_v1.cleanings.schemas import (
+    CleaningInDB,
+    CleaningType,
+)
+from api.api_v1.profiles.schemas import ProfileInDB
+from api.api_v1.users.models import User
+from auth.schemas import UserAuthSchema
+from core.models.unit_of_work import (
+    on_commit,
+    unit_of_work,
+)
+from crud.cleanings import cleanings_crud
+from crud.profiles import profiles_crud
+from tests.database import session_manager
+
+pytestmark = pytest.mark.asyncio
+
+
+def cleaning_in_db(owner: UserAuthSchema, name: str) -> CleaningInDB:
+    return CleaningInDB(
+        name=name,
+        price=20.0,
+        description=None,
+        cleaning_type=CleaningType.spot_clean,
+        owner=owner.id,
+    )
+
+
+class TestUnitOfWork:
+
+    async def test_writes_are_committed_together(
+        self,
+        create_fake_user: UserAuthSchema,
+    ) -> None:
+        callbacks: list[str] = []
+        async with session_manager.session() as session:
+            async with unit_of_work(session):
+                await cleanings_crud.create_record(session=session, obj_in=cleaning_in_db(create_fake_user, "first"))
+                await cleanings_crud.create_record(session=session, obj_in=cleaning_in_db(create_fake_user, "second"))
+                on_commit(session, lambda: callbacks.append("committed"))
+                assert callbacks == []
+            assert callbacks == ["committed"]
+
+        async with session_manager.session() as session:
+            names = await session.scalars(select(Cleaning.name).order_by(Cleaning.name))
+            assert names.all() == ["first", "second"]
+
+    async def test_writes_are_rolled_back_together(
+        self,
+        create_fake_user: UserAuthSchema,
+    ) -> None:
+        callbacks: list[str] = []
+        async with session_manager.session() as session:
+            with pytest.raises(RuntimeError):
+                async with unit_of_work(session):
+                    await cleanings_crud.create_record(
+                        session=session,
+                        obj_in=cleaning_in_db(create_fake_user, "first"),
+                    )
+                    on_commit(session, lambda: callbacks.append("committed"))
+                    raise RuntimeError("second step failed")
+        assert callbacks == []
+
+        async with session_manager.session() as session:
+            assert (await session.scalars(select(Cleaning))).all() == []
+
+    async def test_create_profile_commits_once(
+        self,
+        mocker: MockFixture,
+        create_fake_user: UserAuthSchema,
+        create_fake_profile: Callable[[str, UserAuthSchema], ProfileInDB],
+    ) -> None:
+        async with session_manager.session() as session:
+            commit = mocker.spy(session, "commit")
+            profile = await profiles_crud.create_profile(
+                session=session,
+                profile_schema=create_fake_profile("cleaner", create_fake_user),
+            )
+            assert profile is not None
+            assert commit.call_count == 1
+
+        async with session_manager.session() as session:
+            user = await session.scalar(select(User).filter_by(id=create_fake_user.id))
+            assert user.profile_exists
+            assert user.role_id == 5
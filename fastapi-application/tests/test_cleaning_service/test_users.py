@@ -11,6 +11,7 @@ from fastapi import (
 )
 from httpx import AsyncClient
 from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
 
 from api.api_v1.profiles.models import Profile
 from api.api_v1.users.schemas import UserPublic
@@ -18,6 +19,7 @@ from auth.schemas import (
     UserAuthProfile,
     UserAuthSchema,
 )
+from crud.users import users_crud
 from tests.database import session_manager
 
 pytestmark = pytest.mark.asyncio
@@ -135,3 +137,37 @@ class TestUpdateUserEmail:
             json={"email": "teddy@example.com"},
         )
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+class TestCachedStatements:
+
+    async def test_hot_statements_are_built_once(
+        self,
+        create_fake_user: UserAuthSchema,
+    ) -> None:
+        async with session_manager.session() as session:
+            user = await users_crud.get_user_by_email(session=session, email="fakeuser@gmail.com")
+            statement = users_crud._statements[("one", ("email",))]
+            assert await users_crud.get_user_by_email(session=session, email="nobody@gmail.com") is None
+            assert users_crud._statements[("one", ("email",))] is statement
+            assert (await users_crud.get_one_by_id(session=session, obj_id=user.id)).email == user.email
+            users = await users_crud.get_many_records(session=session, email=user.email, offset=0, limit=1)
+            assert [found.id for found in users] == [user.id]
+            # None filters fall back to filter_by, which renders IS NULL
+            assert await users_crud.get_one_record(session=session, email=None) is None
+
+
+class TestRelationshipLoading:
+
+    async def test_relationships_are_not_loaded_implicitly(
+        self,
+        create_fake_customer_profile: UserAuthSchema,
+    ) -> None:
+        async with session_manager.session() as session:
+            user = await users_crud.get_user_by_email(session=session, email=create_fake_customer_profile.email)
+            with pytest.raises(InvalidRequestError):
+                user.role  # noqa: B018
+            with pytest.raises(InvalidRequestError):
+                user.profile  # noqa: B018
+            profile = await users_crud.get_user_profile(session=session, user_id=user.id)
+            assert profile.user_id == user.id
@@ -3,26 +3,64 @@ from secrets import (
     token_hex,
     token_urlsafe,
 )
+from time import time
 from unittest.mock import AsyncMock
+from uuid import UUID
 
+import jwt
 import pytest
 import pytest_asyncio
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
 from fastapi import (
     FastAPI,
     status,
 )
 from httpx import AsyncClient
 from pytest_mock import MockFixture
+from sqlalchemy import (
+    delete,
+    select,
+)
 
-from api.api_v1.users.jwt_helpers import create_refresh_token
+from api.api_v1.users.jwt_helpers import (
+    create_access_token,
+    create_refresh_token,
+)
+from api.api_v1.users.models import (
+    Permission,
+    role_permission,
+)
 from api.api_v1.users.schemas import UserCreate
+from auth.dependencies import get_user_from_token_claims
+from auth.http_pwd_bearer import verified_token_cache
+from auth.permissions import (
+    PermissionSnapshot,
+    PermissionTable,
+    permission_table,
+)
+from auth.revocation import revocation_list
 from auth.schemas import (
+    TokenData,
     UserAuthInfo,
     UserAuthProfile,
     UserAuthSchema,
 )
+from auth.user_cache import authenticated_user_cache
+from auth.utils.auth_utils import (
+    decode_jwt,
+    encode_jwt,
+)
+from auth.utils.key_ring import (
+    VerificationKey,
+    key_id,
+    key_ring,
+)
+from auth.utils.password_hasher import password_hasher
+from core.config import settings
+from tests.database import session_manager
 from utils.mailing.helpers import create_url_safe_token
 from utils.mailing.messages import send_verify_email
+from utils.ttl_cache import TTLCache
 
 pytestmark = pytest.mark.asyncio
 
@@ -219,7 +257,9 @@ class TestUserRegistration:
         app: FastAPI,
         client: AsyncClient,
         create_fake_user: UserAuthSchema,
+        mocker: MockFixture,
     ) -> None:
+        hash_password = mocker.spy(password_hasher, "hash")
         user_schema = UserCreate(
             email="fakeuser@gmail.com",
             password="mypasswordL1@",
@@ -230,6 +270,7 @@ class TestUserRegistration:
             json=user_schema.model_dump(),
         )
         assert response.status_code == status.HTTP_409_CONFLICT
+        hash_password.assert_not_called()
 
 
 class TestUserAuthLogin:
@@ -448,3 +489,235 @@ class TestVerifyEmail:
         new_link = replace_link_token(msg=message, token=token_urlsafe())
         response = await authorized_client.get(new_link)
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+class TestVerifiedTokenCache:
+
+    async def test_repeated_token_is_served_from_cache(
+        self,
+        app: FastAPI,
+        authorized_client: AsyncClient,
+    ) -> None:
+        verified_token_cache.clear()
+        hits_before = verified_token_cache.hits
+        for _ in range(3):
+            response = await authorized_client.get(app.url_path_for("auth:user-auth-check-self-info"))
+            assert response.status_code == status.HTTP_200_OK
+        assert verified_token_cache.hits == hits_before + 2
+        assert len(verified_token_cache) == 1
+
+    async def test_cache_is_bounded_and_skips_expired_entries(self) -> None:
+        cache: TTLCache[str, int] = TTLCache(name="test", max_size=2)
+        cache.set("a", 1, expires_at=time() + 60)
+        cache.set("b", 2, expires_at=time() + 60)
+        cache.get("a")
+        cache.set("c", 3, expires_at=time() + 60)
+        cache.set("expired", 4, expires_at=time() - 1)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.get("expired") is None
+
+
+class TestJWTKeyRing:
+
+    async def test_issued_token_carries_signing_kid(
+        self,
+        create_fake_user: UserAuthSchema,
+    ) -> None:
+        token = create_access_token(user=create_fake_user)
+        assert jwt.get_unverified_header(token)["kid"] == key_ring.signing_kid
+        assert decode_jwt(token=token)["sub"] == str(create_fake_user.id)
+
+    async def test_token_signed_with_rotated_out_key_is_accepted(
+        self,
+        mocker: MockFixture,
+    ) -> None:
+        old_key = Ed25519PrivateKey.generate()
+        old_kid = key_id(old_key.public_key())
+        # loads the ring first, loading replaces the dict patched below
+        assert key_ring.get_verification_key(kid=None) is not None
+        mocker.patch.dict(
+            key_ring._verification_keys,
+            {old_kid: VerificationKey(kid=old_kid, algorithm="EdDSA", key=old_key.public_key())},
+        )
+        token = jwt.encode({"sub": "old"}, key=old_key, algorithm="EdDSA", headers={"kid": old_kid})
+        assert decode_jwt(token=token)["sub"] == "old"
+
+    async def test_token_with_unknown_kid_is_rejected(
+        self,
+        app: FastAPI,
+        client: AsyncClient,
+        create_fake_user: UserAuthSchema,
+    ) -> None:
+        token = encode_jwt(
+            payload={"type": "access", "sub": str(create_fake_user.id), "email": create_fake_user.email},
+            private_key=Ed25519PrivateKey.generate(),
+            algorithm="EdDSA",
+        )
+        response = await client.get(
+            app.url_path_for("auth:user-auth-check-self-info"),
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+class TestAuthenticatedUserCache:
+
+    async def test_repeated_requests_reuse_cached_user(
+        self,
+        app: FastAPI,
+        authorized_client: AsyncClient,
+        create_fake_user: UserAuthSchema,
+    ) -> None:
+        authenticated_user_cache.clear()
+        hits_before = authenticated_user_cache.hits
+        for _ in range(3):
+            response = await authorized_client.get(app.url_path_for("auth:user-auth-check-self-info"))
+            assert response.status_code == status.HTTP_200_OK
+        assert authenticated_user_cache.hits == hits_before + 2
+        assert authenticated_user_cache.get(create_fake_user.id).logged_in_at is None
+
+    async def test_email_update_invalidates_cached_user(
+        self,
+        app: FastAPI,
+        authorized_client: AsyncClient,
+    ) -> None:
+        authenticated_user_cache.clear()
+        response = await authorized_client.patch(
+            app.url_path_for("users:update-self-email"),
+            json={"email": "teddy@example.com"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert len(authenticated_user_cache) == 0
+        response = await authorized_client.get(app.url_path_for("auth:user-auth-check-self-info"))
+        assert response.json()["email"] == "teddy@example.com"
+
+
+class TestPermissionSnapshot:
+
+    async def test_masks_cover_required_permissions(self) -> None:
+        snapshot = PermissionSnapshot(
+            bits={"read": 1, "modify": 2, "cleaner": 4},
+            role_masks={1: 3, 5: 7},
+        )
+        assert snapshot.names_of(snapshot.role_masks[5]) == ["read", "modify", "cleaner"]
+        assert snapshot.covers(granted=snapshot.role_masks[5], required=["read", "cleaner"])
+        assert not snapshot.covers(granted=snapshot.role_masks[1], required=["cleaner"])
+        assert not snapshot.covers(granted=snapshot.role_masks[5], required=["delete"])
+
+    async def test_user_permissions_resolved_from_snapshot(
+        self,
+        app: FastAPI,
+        authorized_client_cleaner: AsyncClient,
+        create_fake_cleaner_profile: UserAuthSchema,
+    ) -> None:
+        authenticated_user_cache.clear()
+        permission_table.invalidate()
+        response = await authorized_client_cleaner.get(app.url_path_for("auth:user-auth-check-self-info"))
+        assert response.status_code == status.HTTP_200_OK
+        cached_user = authenticated_user_cache.get(create_fake_cleaner_profile.id)
+        assert sorted(cached_user.permissions) == sorted(create_fake_cleaner_profile.permissions)
+        assert permission_table.snapshot.covers(granted=cached_user.permission_mask, required=["cleaner"])
+
+    async def test_issued_masks_keep_their_permissions_after_delete(
+        self,
+        create_fake_role_and_permission: None,
+    ) -> None:
+        table = PermissionTable(ttl_seconds=60)
+        async with session_manager.session() as session:
+            before = await table.load(session=session)
+            deleted = min(before.bits, key=before.bits.__getitem__)
+            issued = before.mask_of(name for name in before.bits if name != deleted)
+            permission_id = select(Permission.id).filter_by(name=deleted).scalar_subquery()
+            await session.execute(delete(role_permission).where(role_permission.c.permission_id == permission_id))
+            await session.execute(delete(Permission).filter_by(name=deleted))
+            after = await table.load(session=session)
+            await session.rollback()
+
+        assert deleted not in after.bits
+        assert after.names_of(issued) == before.names_of(issued)
+
+
+class TestStatelessAuth:
+
+    async def test_read_request_is_authorised_from_claims(
+        self,
+        app: FastAPI,
+        authorized_client: AsyncClient,
+        mocker: MockFixture,
+    ) -> None:
+        mocker.patch.object(settings.auth_jwt, "stateless", True)
+        get_user = mocker.patch("auth.dependencies.get_user_by_token_sub")
+        response = await authorized_client.get(app.url_path_for("auth:user-auth-check-self-info"))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["email"] == "fakeuser@gmail.com"
+        get_user.assert_not_called()
+
+    async def test_positional_permission_mask_is_not_trusted(
+        self,
+        authorized_client: AsyncClient,
+    ) -> None:
+        payload = decode_jwt(token=authorized_client.headers["Authorization"].split()[1])
+        assert get_user_from_token_claims(token_data=TokenData(**payload)) is not None
+        # a token issued before permission bits were keyed by id carries them as perms
+        payload["perms"] = payload.pop("perm_mask")
+        assert get_user_from_token_claims(token_data=TokenData(**payload)) is None
+
+    async def test_revoked_token_is_rejected(
+        self,
+        app: FastAPI,
+        authorized_client: AsyncClient,
+        mocker: MockFixture,
+    ) -> None:
+        mocker.patch.object(settings.auth_jwt, "stateless", True)
+        payload = decode_jwt(token=authorized_client.headers["Authorization"].split()[1])
+        mocker.patch.dict(revocation_list._jtis, {payload["jti"]: payload["exp"]})
+        response = await authorized_client.get(app.url_path_for("auth:user-auth-check-self-info"))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    async def test_verify_email_revokes_issued_tokens(
+        self,
+        app: FastAPI,
+        mock_send_email: AsyncMock,
+        authorized_client: AsyncClient,
+        mocker: MockFixture,
+    ) -> None:
+        mocker.patch.object(settings.auth_jwt, "stateless", True)
+        mocker.patch.dict(revocation_list._users)
+        payload = decode_jwt(token=authorized_client.headers["Authorization"].split()[1])
+        link = re.search('(?<=href=")(.*?)(?=")', mock_send_email.message)
+        response = await authorized_client.get(link.group())
+        assert response.status_code == status.HTTP_200_OK
+        assert UUID(payload["sub"]) in revocation_list._users
+        # issued a moment before the cutoff, most likely within the same second
+        response = await authorized_client.get(app.url_path_for("auth:user-auth-check-self-info"))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+class TestConnectionRelease:
+
+    async def test_signup_holds_no_connection_while_sending_email(
+        self,
+        app: FastAPI,
+        client: AsyncClient,
+        create_fake_role_and_permission: None,
+        mocker: MockFixture,
+    ) -> None:
+        mocker.patch.object(settings.db, "release_connections_early", True)
+        checked_out_during_email: list[int] = []
+
+        async def slow_send_verify_email(email: str) -> None:
+            checked_out_during_email.append(session_manager._async_engine.pool.checkedout())
+
+        mocker.patch("api.api_v1.users.views.auth.send_verify_email", slow_send_verify_email)
+        response = await client.post(
+            app.url_path_for("auth:register-new-user"),
+            json={
+                "email": "elena@gmail.com",
+                "password": "secretpasswordD1$",
+                "confirm_password": "secretpasswordD1$",
+            },
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert checked_out_during_email == [0]
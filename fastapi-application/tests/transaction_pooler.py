@@ -0,0 +1,171 @@
+"""
+A minimal PgBouncer-like transaction pooler for tests.
+
+All client connections share ONE server connection, which is handed to
+a client for the duration of a transaction and given back as soon as
+the server reports it idle. This is the worst case of PgBouncer's
+pool_mode=transaction: whatever a client leaves on the server connection
+(prepared statements, session settings) is seen by the next client.
+
+The first client authenticates against Postgres through the pooler,
+later clients are accepted without a password and get the parameters
+reported to the first one. Database and user of later clients are ignored.
+"""
+
+import asyncio
+import struct
+from contextlib import suppress
+
+SSL_REQUEST_CODE = 80877103
+GSSENC_REQUEST_CODE = 80877104
+CANCEL_REQUEST_CODE = 80877102
+# authentication requests that the client has to answer
+AUTH_CHALLENGES = frozenset((3, 5, 10, 11))
+
+
+def message(kind: bytes, body: bytes = b"") -> bytes:
+    return kind + struct.pack("!I", len(body) + 4) + body
+
+
+async def read_message(reader: asyncio.StreamReader) -> tuple[bytes, bytes] | None:
+    try:
+        header = await reader.readexactly(5)
+        body = await reader.readexactly(struct.unpack("!I", header[1:])[0] - 4)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+
+    return header[:1], body
+
+
+class TransactionPooler:
+    def __init__(self, backend_host: str, backend_port: int) -> None:
+        self._backend_host = backend_host
+        self._backend_port = backend_port
+        self._server: asyncio.Server | None = None
+        self._backend: tuple[asyncio.StreamReader, asyncio.StreamWriter] | None = None
+        self._backend_task: asyncio.Task[None] | None = None
+        self._startup_messages: list[bytes] = []
+        self._lock = asyncio.Lock()
+        self._owner: asyncio.StreamWriter | None = None
+        self._clients: set[asyncio.StreamWriter] = set()
+        self._pending_syncs = 0
+        self.port: int = 0
+        self.client_connections: int = 0
+        self.backend_connections: int = 0
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._serve_client, host="127.0.0.1", port=0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            # wait_closed() waits for the client handlers, which only end when their connection does
+            for client in self._clients:
+                client.close()
+            await self._server.wait_closed()
+        if self._backend_task is not None:
+            self._backend_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._backend_task
+        if self._backend is not None:
+            self._backend[1].close()
+
+    async def _read_startup(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bytes | None:
+        while True:
+            length = struct.unpack("!I", await reader.readexactly(4))[0]
+            body = await reader.readexactly(length - 4)
+            code = struct.unpack("!I", body[:4])[0]
+            if code in (SSL_REQUEST_CODE, GSSENC_REQUEST_CODE):
+                writer.write(b"N")
+                await writer.drain()
+                continue
+            if code == CANCEL_REQUEST_CODE:
+                return None
+
+            return struct.pack("!I", length) + body
+
+    async def _connect_backend(
+        self,
+        startup: bytes,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        backend_reader, backend_writer = await asyncio.open_connection(self._backend_host, self._backend_port)
+        self.backend_connections += 1
+        backend_writer.write(startup)
+        await backend_writer.drain()
+        while (backend_message := await read_message(backend_reader)) is not None:
+            kind, body = backend_message
+            writer.write(message(kind, body))
+            await writer.drain()
+            if kind in (b"S", b"K"):
+                self._startup_messages.append(message(kind, body))
+            elif kind == b"R" and struct.unpack("!I", body[:4])[0] in AUTH_CHALLENGES:
+                if (client_message := await read_message(reader)) is None:
+                    raise ConnectionError("client went away during authentication")
+                backend_writer.write(message(*client_message))
+                await backend_writer.drain()
+            elif kind == b"E":
+                raise ConnectionError("backend rejected the connection")
+            elif kind == b"Z":
+                break
+        self._backend = backend_reader, backend_writer
+        self._backend_task = asyncio.create_task(self._relay_backend())
+
+    async def _relay_backend(self) -> None:
+        assert self._backend is not None
+        while (backend_message := await read_message(self._backend[0])) is not None:
+            kind, body = backend_message
+            if self._owner is not None:
+                with suppress(ConnectionError):
+                    self._owner.write(message(kind, body))
+            if kind == b"Z":
+                self._pending_syncs -= 1
+                if body == b"I" and self._pending_syncs == 0:
+                    self._owner = None
+                    self._lock.release()
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._clients.add(writer)
+        try:
+            if (startup := await self._read_startup(reader, writer)) is None:
+                return
+            self.client_connections += 1
+            async with self._lock:
+                if self._backend is None:
+                    await self._connect_backend(startup, reader, writer)
+                else:
+                    writer.write(message(b"R", struct.pack("!I", 0)))
+                    writer.write(b"".join(self._startup_messages))
+                    writer.write(message(b"Z", b"I"))
+                    await writer.drain()
+            await self._forward_client(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+    async def _forward_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        assert self._backend is not None
+        backend_writer = self._backend[1]
+        try:
+            while (client_message := await read_message(reader)) is not None:
+                kind, body = client_message
+                if kind == b"X":
+                    break
+                if self._owner is not writer:
+                    await self._lock.acquire()
+                    self._owner = writer
+                if kind in (b"S", b"Q"):
+                    self._pending_syncs += 1
+                backend_writer.write(message(kind, body))
+                await backend_writer.drain()
+        finally:
+            if self._owner is writer:
+                # the client left inside a transaction, roll it back before the next client gets the connection
+                self._owner = None
+                self._pending_syncs += 1
+                backend_writer.write(message(b"Q", b"ROLLBACK\x00"))
+                await backend_writer.drain()
@@ -10,6 +10,7 @@ from fastapi import (
 from starlette.background import BackgroundTask
 from starlette.middleware.base import RequestResponseEndpoint
 
+from core.models.query_stats import QueryStats
 from utils.custom_logger.helpers import RequestInfo
 from utils.custom_logger.schemas import (
     RequestLog,
@@ -81,6 +82,7 @@ class LoggingMiddleware:
         start_time: float,
     ) -> None:
         request_info = RequestInfo(request)
+        query_stats = getattr(request.state, "query_stats", None) or QueryStats()
         request_log = RequestLog(
             request=RequestSide(
                 req_id=request.state.req_id,
@@ -97,17 +99,21 @@ class LoggingMiddleware:
                 response_size=int(response.headers.get("content-length", 0)),
                 response_headers=dict(response.headers.items()),
                 response_body=response_body,
+                db_queries=query_stats.count,
+                db_time_ms=round(query_stats.duration * 1000, 1),
             ),
         )
         duration: int = ceil((time() - start_time) * 1000)
         logger.log(
             level=20 if exception_ibj is None else 40,
-            msg="status code=%s method=%s requested url=%s duration ms=%s"
+            msg="status code=%s method=%s requested url=%s duration ms=%s db queries=%s db ms=%.1f"
             % (
                 response.status_code,
                 request.method,
                 request.url,
                 duration,
+                query_stats.count,
+                query_stats.duration * 1000,
             ),
             extra={**request_log.model_dump()},
             exc_info=exception_ibj,
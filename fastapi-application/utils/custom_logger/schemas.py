@@ -35,6 +35,8 @@ class ResponseSide(BaseModel):
     response_size: int
     response_headers: dict
     response_body: str
+    db_queries: int = 0
+    db_time_ms: float = 0.0
 
     @field_validator("response_body", mode="before")
     @classmethod
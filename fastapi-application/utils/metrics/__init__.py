@@ -0,0 +1,13 @@
+__all__ = (
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "metrics_registry",
+)
+
+from utils.metrics.registry import (
+    Counter,
+    Gauge,
+    Histogram,
+    metrics_registry,
+)
@@ -0,0 +1,207 @@
+"""
+This module contains a lightweight in-process metrics registry.
+
+Metrics are kept per worker process and can be read as a plain
+dictionary snapshot, e.g. by the internal metrics endpoint.
+"""
+
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from bisect import bisect_left
+from collections import defaultdict
+from threading import Lock
+from typing import (
+    Any,
+    TypeVar,
+)
+
+LabelsKey = tuple[tuple[str, str], ...]
+MetricT = TypeVar("MetricT", bound="_Metric")
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _labels_key(labels: dict[str, Any]) -> LabelsKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class _Metric(ABC):
+    kind: str = ""
+
+    def __init__(self, name: str, description: str) -> None:
+        self.name = name
+        self.description = description
+        self._lock = Lock()
+
+    @abstractmethod
+    def collect(self) -> list[dict[str, Any]]:
+        """
+        Returns one sample per set of labels.
+        """
+
+
+class _ValueMetric(_Metric):
+    """
+    A single value per set of labels.
+    """
+
+    def __init__(self, name: str, description: str) -> None:
+        super().__init__(name=name, description=description)
+        self._values: defaultdict[LabelsKey, float] = defaultdict(float)
+
+    def _add(self, amount: float, labels: dict[str, Any]) -> None:
+        key = _labels_key(labels)
+        with self._lock:
+            self._values[key] += amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(_labels_key(labels), 0.0)
+
+    def collect(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [{"labels": dict(key), "value": value} for key, value in self._values.items()]
+
+
+class Counter(_ValueMetric):
+    """
+    A monotonically increasing value.
+    """
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        self._add(amount, labels)
+
+
+class Gauge(_ValueMetric):
+    """
+    A value that can go up and down.
+    """
+
+    kind = "gauge"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        self._add(amount, labels)
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self._add(-amount, labels)
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = _labels_key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values (e.g. durations in seconds).
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name=name, description=description)
+        self._buckets = tuple(sorted(buckets))
+        self._counts: dict[LabelsKey, list[int]] = {}
+        self._sums: defaultdict[LabelsKey, float] = defaultdict(float)
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = _labels_key(labels)
+        idx = bisect_left(self._buckets, value)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self._buckets) + 1))
+            counts[idx] += 1
+            self._sums[key] += value
+
+    def count(self, **labels: Any) -> int:
+        return sum(self._counts.get(_labels_key(labels), ()))
+
+    def collect(self) -> list[dict[str, Any]]:
+        samples = []
+        with self._lock:
+            for key, counts in self._counts.items():
+                cumulative, buckets = 0, {}
+                for bound, count in zip((*self._buckets, float("inf")), counts):
+                    cumulative += count
+                    buckets[str(bound)] = cumulative
+                samples.append(
+                    {
+                        "labels": dict(key),
+                        "count": cumulative,
+                        "sum": self._sums[key],
+                        "buckets": buckets,
+                    }
+                )
+
+        return samples
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = Lock()
+
+    def _get_or_create(self, metric_cls: type[MetricT], name: str, **kwargs: Any) -> MetricT:
+        with self._lock:
+            if (registered := self._metrics.get(name)) is None:
+                metric = metric_cls(name=name, **kwargs)
+                self._metrics[name] = metric
+            elif type(registered) is metric_cls and isinstance(registered, metric_cls):
+                metric = registered
+            else:
+                raise ValueError(f"Metric {name!r} is already registered as a {registered.kind}")
+
+        return metric
+
+    def counter(self, name: str, description: str) -> Counter:
+        return self._get_or_create(Counter, name=name, description=description)
+
+    def gauge(self, name: str, description: str) -> Gauge:
+        return self._get_or_create(Gauge, name=name, description=description)
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name=name, description=description, buckets=buckets)
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Returns all registered metrics as a serialisable dictionary.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        return {
+            metric.name: {
+                "type": metric.kind,
+                "description": metric.description,
+                "samples": metric.collect(),
+            }
+            for metric in metrics
+        }
+
+
+metrics_registry = MetricsRegistry()
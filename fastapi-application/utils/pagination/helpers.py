@@ -1,4 +1,8 @@
+import json
+from typing import Any
+
 from cryptography.fernet import Fernet
+from pydantic_core import to_jsonable_python
 
 from core.config import settings
 
@@ -18,3 +22,15 @@ def decode_id(token: str) -> int:
     decoded_identifier = f.decrypt(token=token)
 
     return int(decoded_identifier.decode())
+
+
+def encode_cursor(payload: dict[str, Any]) -> str:
+    encoded_cursor = f.encrypt(data=json.dumps(to_jsonable_python(payload)).encode())
+
+    return encoded_cursor.decode()
+
+
+def decode_cursor(token: str) -> dict[str, Any]:
+    decoded_cursor = f.decrypt(token=token)
+
+    return json.loads(decoded_cursor)
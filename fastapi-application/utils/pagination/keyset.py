@@ -0,0 +1,155 @@
+"""
+Keyset pagination.
+
+A page is read with WHERE (k1, k2) > (:last_k1, :last_k2) ORDER BY k1, k2
+LIMIT n + 1 over an index on the keys, so a deep page costs the same as
+the first one. The cursors are the encrypted keys of the first or last
+item of a page and the direction to read in. Only the columns the schema
+has a field for are read, and the rows are validated with the cached
+TypeAdapter of the schema, as in CRUDRepository.read_many.
+"""
+
+from typing import (
+    Any,
+    Generic,
+    Sequence,
+    TypeVar,
+)
+
+from cryptography.fernet import InvalidToken
+from fastapi import (
+    HTTPException,
+    status,
+)
+from pydantic import (
+    BaseModel,
+    TypeAdapter,
+    ValidationError,
+)
+from sqlalchemy import (
+    Row,
+    Select,
+    literal,
+    tuple_,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from crud.base import get_rows_adapter
+from server.utils.middlewares import request_object
+from utils.pagination.helpers import (
+    decode_cursor,
+    encode_cursor,
+)
+
+SchemaType = TypeVar("SchemaType", bound=BaseModel)
+
+NEXT = "next"
+PREVIOUS = "previous"
+
+
+class KeysetPaginator(Generic[SchemaType]):
+    def __init__(
+        self,
+        session: AsyncSession,
+        query: Select[Any],
+        schema: type[SchemaType],
+        keys: Sequence[InstrumentedAttribute[Any]],
+        max_results: int,
+        cursor: str | None,
+    ) -> None:
+        self.session = session
+        key_names = {key.key for key in keys}
+        self.query = query.with_only_columns(
+            *(
+                column
+                for column in query.selected_columns
+                if column.key in schema.model_fields or column.key in key_names
+            ),
+            maintain_column_froms=True,
+        )
+        self.schema = schema
+        self.keys = keys
+        self.max_results = max_results
+        self.cursor = cursor
+        self.request = request_object.get()
+
+    def _decode_cursor(self, cursor: str) -> tuple[str, list[Any]]:
+        try:
+            payload = decode_cursor(token=cursor)
+            direction, values = payload["direction"], payload["keys"]
+            if direction not in (NEXT, PREVIOUS) or len(values) != len(self.keys):
+                raise ValueError(payload)
+            return direction, [
+                TypeAdapter(key.type.python_type).validate_python(value) for key, value in zip(self.keys, values)
+            ]
+        except (InvalidToken, KeyError, TypeError, ValueError, ValidationError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            ) from None
+
+    def _encode_cursor(self, item: Row[Any], direction: str) -> str:
+        return encode_cursor({"direction": direction, "keys": [getattr(item, key.key) for key in self.keys]})
+
+    def _get_page_query(self, direction: str, values: list[Any] | None) -> Select[Any]:
+        if values is None:
+            query = self.query.order_by(*self.keys)
+        elif direction == NEXT:
+            last = tuple_(*(literal(value, type_=key.type) for key, value in zip(self.keys, values)))
+            query = self.query.where(tuple_(*self.keys) > last).order_by(*self.keys)
+        else:
+            first = tuple_(*(literal(value, type_=key.type) for key, value in zip(self.keys, values)))
+            query = self.query.where(tuple_(*self.keys) < first).order_by(*(key.desc() for key in self.keys))
+
+        return query.limit(self.max_results + 1)
+
+    async def get_response(self) -> dict[str, Any]:
+        direction, values = self._decode_cursor(cursor=self.cursor) if self.cursor is not None else (NEXT, None)
+        res = await self.session.execute(self._get_page_query(direction=direction, values=values))
+        rows = list(res.all())
+        has_more = len(rows) > self.max_results
+        rows = rows[: self.max_results]
+        if direction == PREVIOUS:
+            rows.reverse()
+        # a page read backwards always has items after it, a page read forwards from a cursor has items before it
+        has_next = has_more if direction == NEXT else True
+        has_previous = values is not None if direction == NEXT else has_more
+
+        next_cursor = self._encode_cursor(rows[-1], NEXT) if rows and has_next else None
+        previous_cursor = self._encode_cursor(rows[0], PREVIOUS) if rows and has_previous else None
+
+        return {
+            "count": len(rows),
+            "previous_page": self._get_url(cursor=previous_cursor),
+            "next_page": self._get_url(cursor=next_cursor),
+            "previous_cursor": previous_cursor,
+            "next_cursor": next_cursor,
+            "items": get_rows_adapter(self.schema).validate_python(rows, from_attributes=True),
+        }
+
+    def _get_url(self, cursor: str | None) -> str | None:
+        if cursor is None:
+            return None
+
+        return str(self.request.url.include_query_params(max_results=self.max_results, cursor=cursor))
+
+
+async def paginate_by_keys(
+    session: AsyncSession,
+    query: Select[Any],
+    schema: type[BaseModel],
+    keys: Sequence[InstrumentedAttribute[Any]],
+    max_results: int,
+    cursor: str | None,
+) -> dict[str, Any]:
+    paginator: KeysetPaginator[Any] = KeysetPaginator(
+        session=session,
+        query=query,
+        schema=schema,
+        keys=keys,
+        max_results=max_results,
+        cursor=cursor,
+    )
+
+    return await paginator.get_response()
@@ -0,0 +1,82 @@
+"""
+This module contains a bounded in-process LRU cache with per-entry expiry.
+"""
+
+from collections import OrderedDict
+from time import time
+from typing import (
+    Generic,
+    Hashable,
+    TypeVar,
+)
+
+from utils.metrics import metrics_registry
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+CACHE_HITS = metrics_registry.counter(
+    name="cache_hits_total",
+    description="Lookups answered from an in-process cache",
+)
+CACHE_MISSES = metrics_registry.counter(
+    name="cache_misses_total",
+    description="Lookups not found (or expired) in an in-process cache",
+)
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Least recently used cache where every entry carries its own expiry time.
+
+    The cache lives in a single worker process and is not shared between
+    gunicorn workers. Expiry times are unix timestamps.
+    """
+
+    def __init__(self, name: str, max_size: int) -> None:
+        self.name = name
+        self._max_size = max_size
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def hits(self) -> int:
+        return int(CACHE_HITS.value(cache=self.name))
+
+    @property
+    def misses(self) -> int:
+        return int(CACHE_MISSES.value(cache=self.name))
+
+    def get(self, key: K) -> V | None:
+        """
+        Returns the cached value or None if it is missing or expired.
+        """
+        if (entry := self._data.get(key)) is not None:
+            expires_at, value = entry
+            if expires_at > time():
+                self._data.move_to_end(key)
+                CACHE_HITS.inc(cache=self.name)
+                return value
+            del self._data[key]
+        CACHE_MISSES.inc(cache=self.name)
+
+        return None
+
+    def set(self, key: K, value: V, expires_at: float) -> None:
+        if self._max_size <= 0 or expires_at <= time():
+            return
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._max_size:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> V | None:
+        if (entry := self._data.pop(key, None)) is not None:
+            return entry[1]
+
+        return None
+
+    def clear(self) -> None:
+        self._data.clear()